@@ -0,0 +1,87 @@
+"""trigger-maintained tsvector columns for full-text search
+
+Revision ID: 5d8a1c3e9b27
+Revises: 0b6e2f8d4a71
+Create Date: 2026-10-19 16:42:05.318842
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d8a1c3e9b27"
+down_revision = "0b6e2f8d4a71"
+branch_labels = None
+depends_on = None
+
+# Must match app.services.search.SEARCH_CONFIG
+CONFIG = "english"
+
+# table → ((column, weight), ...) folded into search_vector
+SEARCH_COLUMNS = {
+    "tasks": (("title", "A"), ("description", "B")),
+    "projects": (("name", "A"), ("description", "B")),
+    "roadmaps": (("title", "A"),),
+    "concepts": (("title", "A"), ("tags", "B")),
+}
+# Concept tags are comma-separated; without this, "sql,db" is one token
+SOURCE_EXPRESSIONS = {("concepts", "tags"): "replace({}, ',', ' ')"}
+
+
+def _vector(table: str, row: str = "") -> str:
+    parts = []
+    for column, weight in SEARCH_COLUMNS[table]:
+        source = SOURCE_EXPRESSIONS.get((table, column), "{}").format(row + column)
+        parts.append(
+            f"setweight(to_tsvector('{CONFIG}', coalesce({source}, '')), '{weight}')"
+        )
+    return " || ".join(parts)
+
+
+def _watched(table: str) -> str:
+    return ", ".join(column for column, _ in SEARCH_COLUMNS[table])
+
+
+def upgrade():
+    for table in SEARCH_COLUMNS:
+        op.add_column(
+            table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True)
+        )
+        op.execute(
+            f"""
+            CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_vector(table, "NEW.")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_vector
+            BEFORE INSERT OR UPDATE OF {_watched(table)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+            """
+        )
+        op.execute(f"UPDATE {table} SET search_vector = {_vector(table)}")
+        op.create_index(
+            f"ix_{table}_search_vector",
+            table,
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+        )
+
+
+def downgrade():
+    for table in SEARCH_COLUMNS:
+        op.drop_index(
+            f"ix_{table}_search_vector", table_name=table, postgresql_using="gin"
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, "search_vector")
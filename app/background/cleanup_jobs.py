@@ -0,0 +1,16 @@
+import logging
+
+from app.core.database import SessionLocal
+from app.services.ai_jobs import cleanup_expired_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def cleanup_ai_jobs():
+    """Remove AI job records older than AI_JOB_TTL."""
+    try:
+        with SessionLocal() as db:
+            deleted = cleanup_expired_jobs(db)
+        logger.info(f"🧹 Removed {deleted} expired AI jobs")
+    except Exception as e:
+        logger.error(f"❌ AI job cleanup failed: {e}")
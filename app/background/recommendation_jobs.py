@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, union
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis_async import close_async_redis
+from app.models import AIRecommendation, StudySession, UserProgress
+from app.services.ai_budget import ai_max_wait
+from app.services.ai_recommendation import (
+    RECOMMENDATION_TYPE,
+    generate_recommendations,
+    has_learning_data,
+    load_recommendation_inputs,
+    store_recommendations,
+)
+from app.services.ai_service import close_http_client
+
+logger = logging.getLogger(__name__)
+
+
+def load_stale_user_chunk(db, after_id=None, limit: int = None) -> list:
+    """
+    Next chunk (keyset on user id) of users active within
+    AI_RECOMMEND_ACTIVE_DAYS whose stored recommendation is missing or stale.
+    """
+    now = datetime.now(timezone.utc)
+    active_since = now - timedelta(days=settings.AI_RECOMMEND_ACTIVE_DAYS)
+    fresh_since = now - timedelta(seconds=settings.AI_RECOMMEND_MAX_AGE)
+
+    active = union(
+        select(StudySession.user_id).where(StudySession.created_at >= active_since),
+        select(UserProgress.user_id).where(UserProgress.last_updated >= active_since),
+    ).subquery()
+    fresh = select(AIRecommendation.user_id).where(
+        AIRecommendation.user_id.is_not(None),  # NOT IN + NULL matches nothing
+        AIRecommendation.suggestion_type == RECOMMENDATION_TYPE,
+        AIRecommendation.created_at >= fresh_since,
+    )
+    query = select(active.c.user_id).where(
+        active.c.user_id.is_not(None), active.c.user_id.not_in(fresh)
+    )
+    if after_id is not None:
+        query = query.where(active.c.user_id > after_id)
+    query = query.order_by(active.c.user_id).limit(
+        limit or settings.AI_RECOMMEND_BATCH_SIZE
+    )
+    return list(db.execute(query).scalars())
+
+
+async def _recommend_one(user_id, gate: asyncio.Semaphore) -> str:
+    def _inputs():
+        with SessionLocal() as db:
+            return load_recommendation_inputs(db, user_id)
+
+    def _store(suggestions, confidence):
+        with SessionLocal() as db:
+            store_recommendations(db, user_id, suggestions, confidence)
+
+    async with gate:
+        try:
+            context, candidates = await run_in_threadpool(_inputs)
+            if not has_learning_data(context) and not candidates:
+                return "skipped"
+            suggestions, confidence = await generate_recommendations(
+                user_id, context, candidates
+            )
+            await run_in_threadpool(_store, suggestions, confidence)
+            return "stored"
+        except Exception as e:
+            logger.warning(f"⚠️ Recommendation batch failed for {user_id}: {e}")
+            return "failed"
+
+
+async def precompute_recommendations(concurrency: int = None) -> dict:
+    """Walk stale active users chunk by chunk, a bounded number at a time."""
+    gate = asyncio.Semaphore(concurrency or settings.AI_RECOMMEND_CONCURRENCY)
+    # Batch work is not latency sensitive: queue for budget rather than fail
+    ai_max_wait.set(settings.AI_READ_TIMEOUT)
+    stats = {"stored": 0, "skipped": 0, "failed": 0}
+    after_id = None
+
+    def _chunk(after):
+        with SessionLocal() as db:
+            return load_stale_user_chunk(db, after)
+
+    while True:
+        user_ids = await run_in_threadpool(_chunk, after_id)
+        if not user_ids:
+            break
+        outcomes = await asyncio.gather(
+            *(_recommend_one(user_id, gate) for user_id in user_ids)
+        )
+        for outcome in outcomes:
+            stats[outcome] += 1
+        after_id = user_ids[-1]
+    return stats
+
+
+def run_recommendation_batch() -> dict:
+    """Sync entrypoint for Celery beat."""
+
+    async def _run():
+        try:
+            return await precompute_recommendations()
+        finally:
+            await close_http_client()
+            await close_async_redis()
+
+    stats = asyncio.run(_run())
+    logger.info(f"🤖 Recommendation batch finished: {stats}")
+    return stats
@@ -12,6 +12,7 @@ celery_app = Celery(
     "skillstack",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
+    include=["app.tasks.background_tasks", "app.tasks.ai_tasks"],
 )
 
 celery_app.conf.update(
@@ -26,6 +27,18 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_prefetch_multiplier=1,
     task_time_limit=600,
+    # LLM calls get their own queue so slow providers never starve other jobs
+    task_routes={
+        "run_ai_job": {"queue": "ai"},
+        "precompute_recommendations": {"queue": "ai"},
+    },
+    beat_schedule={
+        "cleanup-ai-jobs": {"task": "cleanup_ai_jobs", "schedule": 3600.0},
+        "precompute-recommendations": {
+            "task": "precompute_recommendations",
+            "schedule": float(settings.AI_RECOMMEND_INTERVAL),
+        },
+    },
 )
 
 # 👇 Automatically adjust for Windows
@@ -72,6 +72,45 @@ class Settings:
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
     AI_MAX_TOKENS: int = int(os.getenv("AI_MAX_TOKENS", "1024"))
     AI_RATE_LIMIT_PER_MIN: int = int(os.getenv("AI_RATE_LIMIT_PER_MIN", "10"))
+    AI_GLOBAL_RATE_LIMIT_PER_MIN: int = int(
+        os.getenv("AI_GLOBAL_RATE_LIMIT_PER_MIN", "120")
+    )
+    AI_USER_MAX_CONCURRENCY: int = int(os.getenv("AI_USER_MAX_CONCURRENCY", "2"))
+    AI_BUDGET_MAX_WAIT: float = float(os.getenv("AI_BUDGET_MAX_WAIT", "10"))
+    AI_CONNECT_TIMEOUT: float = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))
+    AI_READ_TIMEOUT: float = float(os.getenv("AI_READ_TIMEOUT", "60"))
+    AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "3"))
+    AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+    LEARNING_AI_TIMEOUT: float = float(os.getenv("LEARNING_AI_TIMEOUT", "15"))
+    AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "true").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+    AI_CACHE_TTL: int = int(os.getenv("AI_CACHE_TTL", "86400"))
+    AI_CACHE_MAX_ENTRIES: int = int(os.getenv("AI_CACHE_MAX_ENTRIES", "10000"))
+    AI_CONTEXT_TOKEN_BUDGET: int = int(os.getenv("AI_CONTEXT_TOKEN_BUDGET", "600"))
+    AI_CONTEXT_CACHE_TTL: int = int(os.getenv("AI_CONTEXT_CACHE_TTL", "3600"))
+    AI_RECOMMEND_MAX_AGE: int = int(os.getenv("AI_RECOMMEND_MAX_AGE", "86400"))
+    AI_RECOMMEND_INTERVAL: int = int(os.getenv("AI_RECOMMEND_INTERVAL", "3600"))
+    AI_RECOMMEND_ACTIVE_DAYS: int = int(os.getenv("AI_RECOMMEND_ACTIVE_DAYS", "7"))
+    AI_RECOMMEND_BATCH_SIZE: int = int(os.getenv("AI_RECOMMEND_BATCH_SIZE", "50"))
+    AI_RECOMMEND_CONCURRENCY: int = int(os.getenv("AI_RECOMMEND_CONCURRENCY", "4"))
+    AI_JOB_TTL: int = int(os.getenv("AI_JOB_TTL", "86400"))
+    AI_JOB_MAX_WAIT: int = int(os.getenv("AI_JOB_MAX_WAIT", "30"))
+
+    # -------------------------------------------------------------------
+    # 📥 Task Import
+    # -------------------------------------------------------------------
+    # Uploads are spooled here; web and workers must share this directory
+    TASK_IMPORT_DIR: str = os.getenv(
+        "TASK_IMPORT_DIR", str(BASE_DIR / "uploads" / "imports")
+    )
+    TASK_IMPORT_MAX_BYTES: int = int(
+        os.getenv("TASK_IMPORT_MAX_BYTES", str(200 * 1024 * 1024))
+    )
+    TASK_IMPORT_CHUNK_SIZE: int = int(os.getenv("TASK_IMPORT_CHUNK_SIZE", "1000"))
+    TASK_IMPORT_JOB_TTL: int = int(os.getenv("TASK_IMPORT_JOB_TTL", "86400"))
 
     # -------------------------------------------------------------------
     # ⚙️ Redis & Celery
@@ -0,0 +1,104 @@
+# app/core/events.py
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.redis_async import get_async_redis
+from app.utils.websocket_manager import manager
+
+logger = get_logger("Events")
+
+# Single Redis channel shared by every API worker and Celery worker.
+# Sync write paths publish here; each web process relays to its own sockets.
+EVENTS_CHANNEL = "skillstack:events"
+
+
+# -------------------------------------------------------------------
+# 📤 Publishing (sync route handlers / async code)
+# -------------------------------------------------------------------
+def _event_message(topic: str, event_type: str, payload: Dict[str, Any]) -> str:
+    return json.dumps(
+        {
+            "type": event_type,
+            "topic": topic,
+            "payload": jsonable_encoder(payload),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }
+    )
+
+
+def publish_event(topic: str, event_type: str, payload: Dict[str, Any]):
+    """
+    Publish a delta event for a topic (e.g. "project:<id>").
+    Call only after the surrounding transaction has been committed.
+    """
+    try:
+        # Imported lazily: app.core.cache connects to Redis at import time.
+        from app.core.cache import get_redis
+
+        get_redis().publish(EVENTS_CHANNEL, _event_message(topic, event_type, payload))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not publish event {event_type} on {topic}: {e}")
+
+
+async def publish_event_async(topic: str, event_type: str, payload: Dict[str, Any]):
+    """publish_event for `async def` code: doesn't block the event loop."""
+    try:
+        await get_async_redis().publish(
+            EVENTS_CHANNEL, _event_message(topic, event_type, payload)
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Could not publish event {event_type} on {topic}: {e}")
+
+
+def project_topic(project_id) -> str:
+    return f"project:{project_id}"
+
+
+def roadmap_topic(roadmap_id) -> str:
+    return f"roadmap:{roadmap_id}"
+
+
+def user_topic(user_id) -> str:
+    return f"user:{user_id}"
+
+
+# -------------------------------------------------------------------
+# 📥 Relay (runs inside the FastAPI event loop)
+# -------------------------------------------------------------------
+async def relay_events(retry_delay: float = 2.0):
+    """
+    Subscribe to the events channel and forward every message to the
+    local WebSocket subscribers of its topic. Reconnects on Redis errors.
+    """
+    while True:
+        client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(EVENTS_CHANNEL)
+            logger.info(f"📡 Relaying realtime events from '{EVENTS_CHANNEL}'")
+            async for raw in pubsub.listen():
+                if raw.get("type") != "message":
+                    continue
+                try:
+                    message = json.loads(raw["data"])
+                except (TypeError, ValueError):
+                    continue
+                await manager.send_to_topic(message.get("topic", ""), message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Event relay interrupted, retrying: {e}")
+            await asyncio.sleep(retry_delay)
+        finally:
+            try:
+                await pubsub.aclose()
+                await client.aclose()
+            except Exception:
+                pass
@@ -0,0 +1,37 @@
+# app/core/redis_async.py
+import asyncio
+import weakref
+
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+# -------------------------------------------------------------------
+# ⚡ Async Redis (one pooled client per event loop)
+# -------------------------------------------------------------------
+# Redis calls made from `async def` code must not block the loop. asyncio
+# connections are bound to the loop that opened them, so worker threads
+# running their own loop (background AI jobs) get their own client.
+_loop_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Return this event loop's asyncio Redis client (created lazily)."""
+    loop = asyncio.get_running_loop()
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=5,
+            health_check_interval=30,
+        )
+        _loop_clients[loop] = client
+    return client
+
+
+async def close_async_redis():
+    """Close this loop's client (application shutdown / end of a job)."""
+    client = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -25,6 +25,19 @@ def init_database():
         db.close()
 
 
+def warm_autocomplete_index():
+    """Load the concept autocomplete index before the first keystroke."""
+    from app.services.concept_autocomplete import autocomplete_index
+
+    db = SessionLocal()
+    try:
+        autocomplete_index.load(db)
+    except SQLAlchemyError as e:
+        logger.error(f"❌ Autocomplete index not loaded (will retry lazily): {e}")
+    finally:
+        db.close()
+
+
 def on_startup():
     """
     Called by FastAPI on startup.
@@ -32,4 +45,5 @@ def on_startup():
     """
     logger.info("🚀 Starting SkillStack 2.0 API...")
     init_database()
+    warm_autocomplete_index()
     logger.info("✅ Application initialized successfully (no bootstrap admin).")
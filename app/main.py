@@ -1,16 +1,20 @@
 # app/main.py
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
 from app.core.config import settings
+from app.core.events import relay_events
 from app.core.logging_config import setup_logging
 from app.core.rate_limiter import init_rate_limiter  # ✅ import limiter early
+from app.core.redis_async import close_async_redis
 from app.core.startup import on_startup
 
 # Routers
 from app.routers import (
     ai,
+    ai_jobs,
     ai_routes,
     analytics,
     auth,
@@ -26,20 +30,12 @@ from app.routers import (
     projects,
     roadmap_steps,
     roadmaps,
+    search,
+    tags,
     tasks,
+    websocket,
 )
-
-# -----------------------------------------------------------
-# ⚙️ Initialize FastAPI first
-# -----------------------------------------------------------
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    description=settings.DESCRIPTION,
-)
-
-# ✅ Attach rate limiter middleware BEFORE startup
-init_rate_limiter(app)
+from app.services.ai_service import close_http_client
 
 
 # -----------------------------------------------------------
@@ -54,9 +50,31 @@ async def lifespan(app: FastAPI):
     # Initialize any core services or bootstrap data
     on_startup()
 
+    # Relay realtime events (published via Redis) to local WebSocket clients
+    relay_task = asyncio.create_task(relay_events())
+
     yield  # 🔥 App is running
 
     print("🧹 SkillStack shutting down gracefully...")
+    relay_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await relay_task
+    await close_http_client()
+    await close_async_redis()
+
+
+# -----------------------------------------------------------
+# ⚙️ Initialize FastAPI
+# -----------------------------------------------------------
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    version=settings.VERSION,
+    description=settings.DESCRIPTION,
+    lifespan=lifespan,
+)
+
+# ✅ Attach rate limiter middleware BEFORE startup
+init_rate_limiter(app)
 
 
 # -----------------------------------------------------------
@@ -70,6 +88,7 @@ app.include_router(notifications.router)
 app.include_router(members.router)
 app.include_router(invites.router)
 app.include_router(ai.router)
+app.include_router(ai_jobs.router)
 app.include_router(ai_routes.router)
 app.include_router(progress_routes.router)
 app.include_router(learning_routes.router)
@@ -79,6 +98,9 @@ app.include_router(health.router)
 app.include_router(roadmaps.router)
 app.include_router(roadmap_steps.router)
 app.include_router(concepts.router)
+app.include_router(search.router)
+app.include_router(tags.router)
+app.include_router(websocket.router)
 
 
 # -----------------------------------------------------------
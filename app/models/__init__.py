@@ -13,8 +13,10 @@ from app.models.roadmap import Roadmap
 from app.models.roadmap_step import RoadmapStep
 from app.models.roadmap_template import RoadmapTemplate
 from app.models.study_session import StudySession
-from app.models.task import Task
+from app.models.tag import Tag, concept_tags, project_tags
+from app.models.task import Task, TaskDuplicate
 from app.models.user_progress import UserProgress
+from app.models.user_stats import UserStats
 from app.models.users import User
 
 __all__ = [
@@ -23,6 +25,7 @@ __all__ = [
     "ProjectMember",
     "Notification",
     "Task",
+    "TaskDuplicate",
     "Comment",
     "RefreshToken",
     "Roadmap",
@@ -30,6 +33,10 @@ __all__ = [
     "RoadmapTemplate",  # ✅ Added to __all__
     "StudySession",
     "UserProgress",
+    "UserStats",
+    "Tag",
+    "project_tags",
+    "concept_tags",
     "LearningConcept",
     "Concept",
     "AIRecommendation",
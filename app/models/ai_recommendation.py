@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import JSON, TIMESTAMP, Column, Float, ForeignKey, String, func
+from sqlalchemy import JSON, TIMESTAMP, Column, Float, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -19,3 +19,13 @@ class AIRecommendation(Base):
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
 
     concept = relationship("LearningConcept", back_populates="ai_recommendations")
+
+    # Latest recommendation / job lookups per user and type
+    __table_args__ = (
+        Index(
+            "ix_ai_recommendations_user_type_created",
+            "user_id",
+            "suggestion_type",
+            "created_at",
+        ),
+    )
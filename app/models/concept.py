@@ -1,23 +1,29 @@
 import uuid
 
-from sqlalchemy import TIMESTAMP, Boolean, Column, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import TIMESTAMP, Boolean, Column, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
 
 
 class Concept(Base):
     __tablename__ = "concepts"
+    __table_args__ = (
+        Index("ix_concepts_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(100), unique=True, nullable=False)
     description = Column(Text, nullable=True)
     difficulty = Column(Integer, nullable=True)  # 1–5 scale
-    tags = Column(String(200), nullable=True)  # comma-separated tags
+    # Comma-separated copy of normalized_tags (display + search_vector)
+    tags = Column(String(200), nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
+    # title (A) + tags (B); maintained by the concepts_search_vector trigger
+    search_vector = deferred(Column(TSVECTOR))
 
     roadmap_steps = relationship(
         "RoadmapStep",
@@ -33,5 +39,8 @@ class Concept(Base):
         lazy="selectin",
     )
 
+    # Loaded on demand; the `tags` column already serves reads
+    normalized_tags = relationship("Tag", secondary="concept_tags")
+
     def __repr__(self):
         return f"<Concept(title={self.title}, difficulty={self.difficulty})>"
@@ -1,15 +1,30 @@
 # app/models/project.py
 import uuid
 
-from sqlalchemy import TIMESTAMP, Boolean, Column, Enum, ForeignKey, String, Text, func
+from sqlalchemy import (
+    TIMESTAMP,
+    Boolean,
+    Column,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
@@ -23,10 +38,15 @@ class Project(Base):
         Enum("active", "archived", "completed", name="project_status"), default="active"
     )
     visibility = Column(String(20), default="private")
-    tags = Column(Text, nullable=True)  # keep as JSON/text if needed, adjust later
+    # Comma-separated copy of normalized_tags (display + search_vector)
+    tags = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Last task number handed out; bumped atomically, never reused after deletes
+    task_seq = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
+    # name (A) + description (B); maintained by the projects_search_vector trigger
+    search_vector = deferred(Column(TSVECTOR))
 
     # relationships
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
@@ -34,6 +54,8 @@ class Project(Base):
         "ProjectMember", back_populates="project", cascade="all, delete-orphan"
     )
     owner = relationship("User", backref="owned_projects")
+    # Loaded on demand; the `tags` column already serves reads
+    normalized_tags = relationship("Tag", secondary="project_tags")
 
     def __repr__(self):
         return f"<Project(name='{self.name}', owner='{self.owner_id}')>"
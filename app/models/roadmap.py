@@ -5,19 +5,24 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     func,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
 
 
 class Roadmap(Base):
     __tablename__ = "roadmaps"
+    __table_args__ = (
+        Index("ix_roadmaps_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(150), nullable=False)
@@ -39,6 +44,8 @@ class Roadmap(Base):
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
     )
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
+    # title (A); maintained by the roadmaps_search_vector trigger
+    search_vector = deferred(Column(TSVECTOR))
 
     # Relationships
     owner = relationship("User", back_populates="roadmaps")
@@ -1,6 +1,15 @@
 import uuid
 
-from sqlalchemy import TIMESTAMP, Column, Float, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 
@@ -9,6 +18,10 @@ from app.core.database import Base
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
+    __table_args__ = (
+        # Offline clients replay sessions; their id makes the replay idempotent
+        UniqueConstraint("user_id", "client_id", name="uq_study_sessions_user_client"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(
@@ -24,6 +37,7 @@ class StudySession(Base):
     duration_minutes = Column(Integer, default=0)
     understanding_score = Column(Float, default=0.0)
     reflection_notes = Column(String(500), nullable=True)
+    client_id = Column(String(64), nullable=True)
     created_at = Column(
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
     )
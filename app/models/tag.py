@@ -0,0 +1,59 @@
+import uuid
+
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index, String, Table, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.core.database import Base
+
+TAG_MAX_LENGTH = 50
+
+
+class Tag(Base):
+    """One row per distinct (lowercased) tag shared by projects and concepts."""
+
+    __tablename__ = "tags"
+
+    id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(TAG_MAX_LENGTH), unique=True, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<Tag(name='{self.name}')>"
+
+
+# The primary keys serve "tags of X"; the reverse indexes serve tag filters
+project_tags = Table(
+    "project_tags",
+    Base.metadata,
+    Column(
+        "project_id",
+        PG_UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id",
+        PG_UUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_project_tags_tag_project", "tag_id", "project_id"),
+)
+
+concept_tags = Table(
+    "concept_tags",
+    Base.metadata,
+    Column(
+        "concept_id",
+        PG_UUID(as_uuid=True),
+        ForeignKey("concepts.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id",
+        PG_UUID(as_uuid=True),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_concept_tags_tag_concept", "tag_id", "concept_id"),
+)
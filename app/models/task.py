@@ -1,14 +1,48 @@
 import uuid
 
-from sqlalchemy import TIMESTAMP, Column, Enum, ForeignKey, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.database import Base
 
+BOARD_FIELDS = ["task_key", "title", "status", "priority", "assignee_id"]
+
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Trigram index for fuzzy duplicate detection; only created by the
+        # migration where pg_trgm is available (see crud_helpers fallback)
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        # Keyset pagination of a project's tasks, newest first; the board
+        # view's columns are included so its pages are index-only scans
+        Index(
+            "ix_tasks_project_created_id",
+            "project_id",
+            "created_at",
+            "id",
+            postgresql_include=BOARD_FIELDS,
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
@@ -29,6 +63,8 @@ class Task(Base):
     completed_at = Column(TIMESTAMP(timezone=True))
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
+    # title (A) + description (B); maintained by the tasks_search_vector trigger
+    search_vector = deferred(Column(TSVECTOR))
 
     project = relationship("Project", back_populates="tasks")
     comments = relationship(
@@ -38,6 +74,17 @@ class Task(Base):
 
 class TaskDuplicate(Base):
     __tablename__ = "task_duplicates"
+    __table_args__ = (
+        UniqueConstraint("original_id", "duplicate_id", name="uq_task_duplicates_pair"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    original_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"))
-    duplicate_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"))
+    original_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"))
+    duplicate_id = Column(
+        UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), index=True
+    )
+    # "suggested" by background duplicate detection, "confirmed" by a user
+    status = Column(
+        String(20), nullable=False, default="confirmed", server_default="confirmed"
+    )
+    similarity = Column(Float, nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -1,14 +1,40 @@
 import uuid
 
-from sqlalchemy import JSON, TIMESTAMP, Boolean, Column, Float, ForeignKey, func
+from sqlalchemy import (
+    JSON,
+    TIMESTAMP,
+    Boolean,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
+PROGRESS_UNIQUE_CONSTRAINT = "uq_user_progress_user_roadmap_concept"
+
 
 class UserProgress(Base):
     __tablename__ = "user_progress"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "roadmap_id", "concept_id", name=PROGRESS_UNIQUE_CONSTRAINT
+        ),
+        # NULLs never conflict in the constraint above; cover roadmap-level rows
+        Index(
+            "uq_user_progress_user_roadmap_no_concept",
+            "user_id",
+            "roadmap_id",
+            unique=True,
+            postgresql_where=text("concept_id IS NULL"),
+        ),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(
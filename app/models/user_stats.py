@@ -0,0 +1,29 @@
+from sqlalchemy import TIMESTAMP, Column, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.core.database import Base
+
+
+class UserStats(Base):
+    """Running XP/streak aggregates, maintained on every study session."""
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_xp = Column(Float, nullable=False, default=0.0, index=True)
+    current_streak = Column(Integer, nullable=False, default=0, index=True)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_session_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<UserStats user={self.user_id} xp={self.total_xp} streak={self.current_streak}>"
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from app.routers import (
     ai,
+    ai_jobs,
     ai_routes,
     analytics,
     auth,
@@ -19,6 +20,7 @@ from app.routers import (
     roadmaps,
     settings,
     tasks,
+    websocket,
 )
 
 api_router = APIRouter()
@@ -32,6 +34,7 @@ api_router.include_router(roadmap_steps.router)
 api_router.include_router(concepts.router)
 api_router.include_router(progress_routes.router)
 api_router.include_router(ai.router)
+api_router.include_router(ai_jobs.router)
 api_router.include_router(ai_routes.router)
 api_router.include_router(learning_routes.router)
 api_router.include_router(analytics.router)
@@ -42,3 +45,4 @@ api_router.include_router(notifications.router)
 api_router.include_router(exports.router)
 api_router.include_router(settings.router)
 api_router.include_router(health.router)
+api_router.include_router(websocket.router)
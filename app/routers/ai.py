@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from app.schemas.ai import (
     AIAnswerResponse,
@@ -10,16 +14,81 @@ from app.schemas.ai import (
     AITaskGenerationRequest,
     AITaskResponse,
 )
-from app.services.ai_service import get_ai_provider
+from app.services.ai_budget import AIBudgetExceeded, ai_user, get_usage
+from app.services.ai_cache import get_cache_stats, get_cached_ai_provider
+from app.services.ai_service import AIProviderError
+from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/ai", tags=["AI Assistant"])
-ai = get_ai_provider()
+ai = get_cached_ai_provider()
+
+# Per-call opt-out, e.g. when the user explicitly asks to regenerate
+USE_CACHE = Query(True, description="Set to false to bypass the response cache")
+STREAM = Query(
+    False, description="Stream the answer as Server-Sent Events (text/event-stream)"
+)
+
+
+async def ai_caller(user=Depends(get_current_user)):
+    """Authenticated caller; AI calls in this request spend their budget."""
+    ai_user.set(str(user.id))
+    return user
+
+
+def _budget_error(e: AIBudgetExceeded) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(max(1, round(e.retry_after)))},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _sse_response(chunks: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Relay provider chunks as SSE `delta` events, ending with `done`.
+    The first chunk is awaited before responding so upstream failures still
+    map to a 502; later failures are reported as an `error` event.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except AIBudgetExceeded as e:
+        raise _budget_error(e)
+    except AIProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        try:
+            if first is not None:
+                yield _sse("delta", {"text": first})
+            async for chunk in chunks:
+                yield _sse("delta", {"text": chunk})
+            yield _sse("done", {})
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/idea", response_model=AIProjectIdeaResponse)
-def generate_project_idea(req: AIProjectIdeaRequest):
+async def generate_project_idea(
+    req: AIProjectIdeaRequest, use_cache: bool = USE_CACHE, user=Depends(ai_caller)
+):
     try:
-        result = ai.generate_project_idea(req.user_goal, req.skill_level)
+        result = await ai.generate_project_idea(
+            req.user_goal, req.skill_level, use_cache=use_cache
+        )
         if isinstance(result, str):
             return AIProjectIdeaResponse(
                 title="Generated Project",
@@ -28,15 +97,38 @@ def generate_project_idea(req: AIProjectIdeaRequest):
                 suggested_stack=["FastAPI", "React"],
             )
         return result
+    except AIBudgetExceeded as e:
+        raise _budget_error(e)
+    except AIProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/roadmap", response_model=AIRoadmapResponse)
-def generate_roadmap(req: AIRoadmapRequest):
+async def generate_roadmap(
+    req: AIRoadmapRequest,
+    use_cache: bool = USE_CACHE,
+    stream: bool = STREAM,
+    user=Depends(ai_caller),
+):
+    if stream:
+        return await _sse_response(
+            ai.stream_roadmap(
+                req.project_title,
+                req.goal,
+                req.duration_weeks,
+                req.skill_level,
+                use_cache=use_cache,
+            )
+        )
     try:
-        result = ai.generate_roadmap(
-            req.project_title, req.goal, req.duration_weeks, req.skill_level
+        result = await ai.generate_roadmap(
+            req.project_title,
+            req.goal,
+            req.duration_weeks,
+            req.skill_level,
+            use_cache=use_cache,
         )
         if isinstance(result, str):
             return AIRoadmapResponse(
@@ -45,29 +137,71 @@ def generate_roadmap(req: AIRoadmapRequest):
                 learning_outcomes=["Skill growth", "Practical experience"],
             )
         return result
+    except AIBudgetExceeded as e:
+        raise _budget_error(e)
+    except AIProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/tasks", response_model=AITaskResponse)
-def generate_tasks(req: AITaskGenerationRequest):
+async def generate_tasks(
+    req: AITaskGenerationRequest, use_cache: bool = USE_CACHE, user=Depends(ai_caller)
+):
     try:
-        result = ai.generate_tasks(
-            req.project_title, req.description, req.roadmap_context
+        result = await ai.generate_tasks(
+            req.project_title,
+            req.description,
+            req.roadmap_context,
+            use_cache=use_cache,
         )
         if isinstance(result, str):
             return AITaskResponse(tasks=result.split("\n"))
         return result
+    except AIBudgetExceeded as e:
+        raise _budget_error(e)
+    except AIProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/ask", response_model=AIAnswerResponse)
-def ask_ai(req: AIQuestionRequest):
+async def ask_ai(
+    req: AIQuestionRequest,
+    use_cache: bool = USE_CACHE,
+    stream: bool = STREAM,
+    user=Depends(ai_caller),
+):
+    if stream:
+        return await _sse_response(ai.stream_answer(req.question, use_cache=use_cache))
     try:
-        result = ai.answer_question(req.question)
+        result = await ai.answer_question(req.question, use_cache=use_cache)
         if isinstance(result, str):
             return AIAnswerResponse(answer=result)
         return result
+    except AIBudgetExceeded as e:
+        raise _budget_error(e)
+    except AIProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache/stats")
+def ai_cache_stats(user=Depends(ai_caller)):
+    """Response-cache hit rate and size for the AI endpoints."""
+    try:
+        return get_cache_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/usage")
+def ai_usage(hours: int = Query(24, ge=1, le=168), user=Depends(get_current_user)):
+    """AI budget limits, your usage today and global hourly usage."""
+    try:
+        return get_usage(str(user.id), hours=hours)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
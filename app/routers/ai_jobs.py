@@ -0,0 +1,63 @@
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.core.config import settings
+from app.core.task_executor import enqueue
+from app.schemas.ai import AIJobCreate, AIJobResponse
+from app.services.ai_jobs import (
+    create_job,
+    job_view,
+    run_ai_job,
+    validate_job_params,
+    wait_for_job,
+)
+from app.utils.auth import get_current_user
+
+router = APIRouter(prefix="/ai/jobs", tags=["AI Jobs"])
+
+
+@router.post("", response_model=AIJobResponse, status_code=202)
+def submit_ai_job(
+    payload: AIJobCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(database.get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Queue an AI call and return immediately. Poll `GET /ai/jobs/{id}` or
+    listen for `ai_job.succeeded` / `ai_job.failed` on the WebSocket.
+    """
+    try:
+        params = validate_job_params(payload.kind, payload.params)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        job = create_job(db, user.id, payload.kind, params)
+        enqueue(run_ai_job, str(job.id), bg=background_tasks)
+        return job_view(job)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}", response_model=AIJobResponse)
+async def get_ai_job(
+    job_id: UUID,
+    wait: int = Query(
+        0,
+        ge=0,
+        le=settings.AI_JOB_MAX_WAIT,
+        description="Long-poll: seconds to wait for the job to finish",
+    ),
+    user=Depends(get_current_user),
+):
+    """Job status and, once finished, its result or error."""
+    view = await wait_for_job(job_id, user.id, wait)
+    if not view:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return view
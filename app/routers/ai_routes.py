@@ -1,19 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core import database
-from app.services.ai_recommendation import suggest_next_concept
+from app.services.ai_budget import AIBudgetExceeded, ai_user
+from app.services.ai_recommendation import recommend_for_user
+from app.services.ai_service import AIProviderError
 from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/ai", tags=["AI Recommendations"])
 
 
 @router.get("/recommend")
-def recommend_next(
-    user=Depends(get_current_user), db: Session = Depends(database.get_db)
+async def recommend_next(
+    fast: bool = Query(
+        False, description="Rank from the prerequisite graph only (no AI call)"
+    ),
+    user=Depends(get_current_user),
+    db: Session = Depends(database.get_db),
 ):
+    """Precomputed next-concept suggestions; generated live on a miss."""
     try:
-        suggestions = suggest_next_concept(db, user.id)
-        return {"user": user.username, "recommendations": suggestions}
+        ai_user.set(str(user.id))
+        result = await recommend_for_user(db, user.id, fast=fast)
+        return {"user": user.username, **result}
+    except AIBudgetExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))},
+        )
+    except AIProviderError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,15 @@
-from fastapi import APIRouter
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.models import User, UserStats
+from app.schemas.analytics import LeaderboardEntry, UserStatsResponse
+from app.services.progress_engine import STREAK_INTERVAL_HOURS
+from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -6,3 +17,75 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 @router.get("/ping")
 def ping_analytics():
     return {"message": "Analytics router active ✅"}
+
+
+def _streak_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(hours=STREAK_INTERVAL_HOURS)
+
+
+def _current_streak(stats: UserStats) -> int:
+    # The stored streak only moves on new sessions; a lapsed one reads as 0
+    if stats.last_session_at is None or stats.last_session_at < _streak_cutoff():
+        return 0
+    return stats.current_streak
+
+
+def _stats_view(user_id, stats: UserStats = None) -> dict:
+    if stats is None:
+        return {
+            "user_id": user_id,
+            "total_xp": 0.0,
+            "current_streak": 0,
+            "longest_streak": 0,
+            "last_session_at": None,
+        }
+    return {
+        "user_id": stats.user_id,
+        "total_xp": round(stats.total_xp, 2),
+        "current_streak": _current_streak(stats),
+        "longest_streak": stats.longest_streak,
+        "last_session_at": stats.last_session_at,
+    }
+
+
+# ------------------------------------------------------
+# 📈 XP / streak stats (read from the user_stats aggregate)
+# ------------------------------------------------------
+@router.get("/stats/me", response_model=UserStatsResponse)
+def my_stats(
+    db: Session = Depends(database.get_db),
+    current_user=Depends(get_current_user),
+):
+    return _stats_view(current_user.id, db.get(UserStats, current_user.id))
+
+
+@router.get("/stats/{user_id}", response_model=UserStatsResponse)
+def user_stats(
+    user_id: UUID,
+    db: Session = Depends(database.get_db),
+    current_user=Depends(get_current_user),
+):
+    if db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return _stats_view(user_id, db.get(UserStats, user_id))
+
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+def leaderboard(
+    by: Literal["xp", "streak"] = "xp",
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(database.get_db),
+    current_user=Depends(get_current_user),
+):
+    query = db.query(UserStats, User.username).join(User, User.id == UserStats.user_id)
+    if by == "streak":
+        query = query.filter(UserStats.last_session_at >= _streak_cutoff()).order_by(
+            UserStats.current_streak.desc(), UserStats.total_xp.desc()
+        )
+    else:
+        query = query.order_by(UserStats.total_xp.desc(), UserStats.user_id)
+
+    return [
+        {"rank": rank, "username": username, **_stats_view(stats.user_id, stats)}
+        for rank, (stats, username) in enumerate(query.limit(limit).all(), start=1)
+    ]
@@ -1,13 +1,20 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.database import get_db
 from app.models.concept import Concept
 from app.models.users import User
-from app.schemas.concept import ConceptCreate, ConceptResponse, ConceptUpdate
+from app.schemas.concept import (
+    ConceptCreate,
+    ConceptResponse,
+    ConceptSuggestion,
+    ConceptUpdate,
+)
+from app.services.concept_autocomplete import suggest_concepts
+from app.services.tags import set_tags, tagged_with
 from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/concepts", tags=["Concepts"])
@@ -20,7 +27,10 @@ def create_concept(
     current_user: User = Depends(get_current_user),
 ):
     """✅ Create a new concept (admin or roadmap owner context)."""
-    concept = Concept(**concept_in.dict())
+    data = concept_in.dict()
+    tags = data.pop("tags")
+    concept = Concept(**data)
+    set_tags(db, concept, tags)
     db.add(concept)
     db.commit()
     db.refresh(concept)
@@ -31,20 +41,30 @@ def create_concept(
 def list_concepts(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    tag: Optional[List[str]] = Query(
+        None, description="Only concepts carrying every given tag"
+    ),
     skip: int = 0,
     limit: int = 100,
 ):
     """✅ List all active concepts."""
-    concepts = (
-        db.query(Concept)
-        .filter(
-            Concept.is_active.is_(True)
-        )  # ✅ FIXED: Use .is_(True) instead of == True
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return concepts
+    query = db.query(Concept).filter(
+        Concept.is_active.is_(True)
+    )  # ✅ FIXED: Use .is_(True) instead of == True
+    if tag:
+        query = query.filter(Concept.id.in_(tagged_with("concept", tag)))
+    return query.offset(skip).limit(limit).all()
+
+
+@router.get("/autocomplete", response_model=List[ConceptSuggestion])
+def autocomplete_concepts(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """✅ Concepts, learning concepts and tags with a word starting with `q`."""
+    return suggest_concepts(db, q, limit)
 
 
 @router.get("/{concept_id}", response_model=ConceptResponse)
@@ -68,11 +88,17 @@ def update_concept(
     current_user: User = Depends(get_current_user),
 ):
     """✅ Update concept details."""
-    concept = db.query(Concept).filter(Concept.id == concept_id).first()
+    changes = concept_update.dict(exclude_unset=True)
+    query = db.query(Concept).filter(Concept.id == concept_id)
+    if "tags" in changes:
+        query = query.options(selectinload(Concept.normalized_tags))
+    concept = query.first()
     if not concept:
         raise HTTPException(status_code=404, detail="Concept not found")
 
-    for field, value in concept_update.dict(exclude_unset=True).items():
+    if "tags" in changes:
+        set_tags(db, concept, changes.pop("tags"))
+    for field, value in changes.items():
         setattr(concept, field, value)
 
     db.commit()
@@ -1,26 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core import database
+from app.core.events import publish_event_async, user_topic
 from app.services.learning_loop import run_learning_loop
+from app.services.progress_engine import ProgressNotFound
 from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/learning", tags=["Learning Intelligence"])
 
 
 @router.post("/loop")
-def execute_learning_loop(
+async def execute_learning_loop(
     concept_id: str,
     duration_minutes: int,
     understanding_score: float,
+    background_tasks: BackgroundTasks,
+    async_ai: bool = Query(
+        False,
+        description="Return right after the progress update and deliver AI "
+        "reflection/suggestion later via notification + WebSocket",
+    ),
     db: Session = Depends(database.get_db),
     user=Depends(get_current_user),
 ):
     """Full AI-powered learning loop (progress → reflection → next suggestion)."""
     try:
-        data = run_learning_loop(
-            db, user.id, concept_id, duration_minutes, understanding_score
+        data = await run_learning_loop(
+            db,
+            user.id,
+            concept_id,
+            duration_minutes,
+            understanding_score,
+            defer_ai=async_ai,
+            background_tasks=background_tasks,
+        )
+        await publish_event_async(
+            user_topic(user.id),
+            "progress.updated",
+            {
+                "concept_id": concept_id,
+                "progress": data["progress"],
+                "xp_gained": data["xp_gained"],
+                "streak": data["streak"],
+            },
         )
         return {"user": user.username, **data}
+    except ProgressNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
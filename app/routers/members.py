@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.core.database import get_db
+from app.core.events import project_topic, publish_event, user_topic
 from app.services.notifications import create_notification
 from app.utils.auth import get_current_user
 
@@ -35,6 +36,14 @@ def log_activity(
     return activity
 
 
+def _publish_member_event(member, event_type: str):
+    """Push a membership delta to the project and to the affected user."""
+    payload = schemas.ProjectMemberResponse.model_validate(member).model_dump()
+    publish_event(project_topic(member.project_id), event_type, payload)
+    if member.user_id:
+        publish_event(user_topic(member.user_id), event_type, payload)
+
+
 @router.post(
     "/",
     response_model=schemas.ProjectMemberResponse,
@@ -77,6 +86,8 @@ def add_member(
     db.commit()
     db.refresh(new_member)
 
+    _publish_member_event(new_member, "member.added")
+
     # Activity + Notification
     log_activity(
         db,
@@ -144,6 +155,8 @@ def update_member(
     db.commit()
     db.refresh(member)
 
+    _publish_member_event(member, "member.updated")
+
     # Activity + Notification
     log_activity(
         db,
@@ -183,10 +196,13 @@ def remove_member(
 
     project_name = member.project.name
     target_user_id = member.user_id
+    removed = schemas.ProjectMemberResponse.model_validate(member)
 
     db.delete(member)
     db.commit()
 
+    _publish_member_event(removed, "member.removed")
+
     # Activity + Notification
     log_activity(
         db,
@@ -9,12 +9,12 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
 @router.get("/summary")
-def daily_reflection(
+async def daily_reflection(
     user=Depends(get_current_user), db: Session = Depends(database.get_db)
 ):
     """Generate and store an AI-based reflection summary."""
     try:
-        result = send_study_summary(db, user.id)
+        result = await send_study_summary(db, user.id)
         if not result:
             return {"message": "No recent study sessions found."}
         return {"status": "success", "notification": result.message}
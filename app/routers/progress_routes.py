@@ -1,17 +1,27 @@
-from uuid import UUID
+from typing import Optional
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core import database
+from app.core.events import publish_event, user_topic
 from app.models.activity_log import ActivityLog
 from app.models.user_progress import UserProgress
 from app.schemas.progress import (
+    StudySessionBatchRequest,
+    StudySessionBatchResponse,
     UserProgressCreate,
     UserProgressResponse,
 )
+from app.services.learning_context import invalidate_learning_context
 from app.services.notifications import create_notification
-from app.services.progress_engine import update_user_progress
+from app.services.progress_engine import (
+    ProgressNotFound,
+    ingest_study_sessions,
+    update_user_progress,
+)
 from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/progress", tags=["Progress Tracking"])
@@ -34,30 +44,33 @@ def start_progress(
     db: Session = Depends(database.get_db),
     current_user=Depends(get_current_user),
 ):
-    existing = (
-        db.query(UserProgress)
-        .filter(
-            UserProgress.user_id == current_user.id,
-            UserProgress.roadmap_id == payload.roadmap_id,
-            UserProgress.concept_id == payload.concept_id,
+    # One statement: the unique constraint rejects duplicates atomically
+    progress = db.scalars(
+        insert(UserProgress)
+        .values(
+            id=uuid4(),
+            user_id=current_user.id,
+            roadmap_id=payload.roadmap_id,
+            concept_id=payload.concept_id,
+            progress_percent=payload.progress_percent or 0.0,
+            notes=payload.notes or {},
         )
-        .first()
-    )
-    if existing:
+        .on_conflict_do_nothing()
+        .returning(UserProgress)
+    ).first()
+    if progress is None:
+        db.rollback()
         raise HTTPException(
             status_code=400, detail="Progress already exists for this roadmap/concept."
         )
+    db.commit()
+    invalidate_learning_context(current_user.id)
 
-    progress = UserProgress(
-        user_id=current_user.id,
-        roadmap_id=payload.roadmap_id,
-        concept_id=payload.concept_id,
-        progress_percent=payload.progress_percent or 0.0,
-        notes=payload.notes or {},
+    publish_event(
+        user_topic(current_user.id),
+        "progress.started",
+        UserProgressResponse.model_validate(progress).model_dump(),
     )
-    db.add(progress)
-    db.commit()
-    db.refresh(progress)
 
     log_activity(
         db,
@@ -76,36 +89,34 @@ def update_progress(
     concept_id: UUID,
     duration_minutes: int,
     understanding_score: float,
+    roadmap_id: Optional[UUID] = None,
     db: Session = Depends(database.get_db),
     current_user=Depends(get_current_user),
 ):
     """
     Updates user's progress on a concept using the adaptive engine.
+    With `roadmap_id` the progress row is created if it doesn't exist yet.
     """
     try:
         result = update_user_progress(
-            db, current_user.id, concept_id, duration_minutes, understanding_score
-        )
-        progress = (
-            db.query(UserProgress)
-            .filter(
-                UserProgress.user_id == current_user.id,
-                UserProgress.concept_id == concept_id,
-            )
-            .first()
+            db,
+            current_user.id,
+            concept_id,
+            duration_minutes,
+            understanding_score,
+            roadmap_id=roadmap_id,
         )
-
-        if not progress:
-            raise HTTPException(
-                status_code=404, detail="No progress record found for this concept"
-            )
-
-        progress.progress_percent = result.get(
-            "progress_percent", progress.progress_percent
+        progress = result["entries"][0]
+
+        publish_event(
+            user_topic(current_user.id),
+            "progress.updated",
+            {
+                **UserProgressResponse.model_validate(progress).model_dump(),
+                "xp_gained": result.get("xp_gained"),
+                "streak": result.get("streak"),
+            },
         )
-        progress.completed = result.get("completed", progress.completed)
-        db.commit()
-        db.refresh(progress)
 
         # Log + notify
         log_activity(
@@ -124,10 +135,56 @@ def update_progress(
 
         return progress
 
+    except ProgressNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ------------------------------------------------------
+# 📦 Batch Session Ingestion (offline replay, idempotent by client_id)
+# ------------------------------------------------------
+@router.post("/sessions:batch", response_model=StudySessionBatchResponse)
+def ingest_sessions(
+    payload: StudySessionBatchRequest,
+    db: Session = Depends(database.get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Store many study sessions at once. Sessions whose client_id was already
+    received are reported as duplicates and not counted again.
+    """
+    try:
+        result = ingest_study_sessions(db, current_user.id, payload.sessions)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    if result["accepted"]:
+        publish_event(
+            user_topic(current_user.id),
+            "progress.batch_ingested",
+            {
+                "sessions": len(result["accepted"]),
+                "xp_gained": result["xp_gained"],
+                "streak": result["current_streak"],
+                "progress": [
+                    UserProgressResponse.model_validate(p).model_dump()
+                    for p in result["progress"]
+                ],
+            },
+        )
+        log_activity(
+            db,
+            current_user.id,
+            "sessions_ingested",
+            f"Ingested {len(result['accepted'])} study sessions",
+        )
+    return result
+
 
 # ------------------------------------------------------
 # 3️⃣ Get All Progress for Current User
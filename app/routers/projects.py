@@ -1,16 +1,37 @@
 # app/routers/projects.py
-from typing import List
-from uuid import UUID
-
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+import aiofiles
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.task_executor import enqueue
 from app.models import ActivityLog, Project, ProjectMember
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from app.schemas.task import TaskImportJobResponse
 from app.services.notifications import create_notification
+from app.services.tags import set_tags, tagged_with
+from app.services.task_import import (
+    IMPORT_FORMATS,
+    create_import_job,
+    get_import_job,
+    run_task_import,
+)
 from app.utils.auth import get_current_user
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
@@ -66,6 +87,7 @@ def create_project(
         status="active",
         visibility=project_in.visibility or "private",
     )
+    set_tags(db, new_project, project_in.tags)
     db.add(new_project)
     db.commit()
     db.refresh(new_project)
@@ -96,11 +118,16 @@ def create_project(
 # -----------------------------------------------------------
 @router.get("/", response_model=List[ProjectResponse])
 def get_user_projects(
+    tag: Optional[List[str]] = Query(
+        None, description="Only projects carrying every given tag"
+    ),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    projects = db.query(Project).filter(Project.owner_id == current_user.id).all()
-    return projects
+    query = db.query(Project).filter(Project.owner_id == current_user.id)
+    if tag:
+        query = query.filter(Project.id.in_(tagged_with("project", tag)))
+    return query.all()
 
 
 # -----------------------------------------------------------
@@ -143,7 +170,11 @@ def update_project(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    changes = project_in.dict(exclude_unset=True)
+    query = db.query(Project).filter(Project.id == project_id)
+    if "tags" in changes:
+        query = query.options(selectinload(Project.normalized_tags))
+    project = query.first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -152,7 +183,9 @@ def update_project(
             status_code=403, detail="Only project owner can update the project"
         )
 
-    for field, value in project_in.dict(exclude_unset=True).items():
+    if "tags" in changes:
+        set_tags(db, project, changes.pop("tags"))
+    for field, value in changes.items():
         setattr(project, field, value)
 
     db.commit()
@@ -295,3 +328,99 @@ def transfer_ownership(
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Transfer failed: {str(e)}")
+
+
+# -----------------------------------------------------------
+# 📥 Import Tasks (streamed CSV / NDJSON → background job)
+# -----------------------------------------------------------
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def _owned_project_id(db: Session, project_id: UUID, user_id: UUID):
+    return (
+        db.query(Project.id)
+        .filter(Project.id == project_id, Project.owner_id == user_id)
+        .first()
+    )
+
+
+@router.post(
+    "/{project_id}/tasks/import",
+    response_model=TaskImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def import_tasks(
+    project_id: UUID,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: Optional[str] = Query(
+        None, description="csv | ndjson (defaults to the Content-Type)"
+    ),
+    detect_duplicates: bool = Query(
+        False, description="Score imported tasks for duplicates after loading"
+    ),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Send the file as the raw request body. It is spooled to disk as it
+    arrives and loaded in chunks by a background job; poll
+    `GET /projects/{id}/tasks/import/{job_id}` for progress.
+    """
+    if not await run_in_threadpool(_owned_project_id, db, project_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Project not found or unauthorized")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = (format or IMPORT_CONTENT_TYPES.get(content_type, "")).lower()
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=415, detail="Send text/csv or application/x-ndjson"
+        )
+
+    os.makedirs(settings.TASK_IMPORT_DIR, exist_ok=True)
+    path = os.path.join(settings.TASK_IMPORT_DIR, f"{uuid4().hex}.{fmt}")
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.TASK_IMPORT_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail="Import file too large")
+                await out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty import file")
+        job_id = await run_in_threadpool(
+            create_import_job,
+            project_id,
+            current_user.id,
+            path,
+            fmt,
+            detect_duplicates=detect_duplicates,
+        )
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    enqueue(run_task_import, job_id, bg=background_tasks)
+    return await run_in_threadpool(get_import_job, job_id, project_id)
+
+
+@router.get("/{project_id}/tasks/import/{job_id}", response_model=TaskImportJobResponse)
+def get_task_import(
+    project_id: UUID,
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    if not _owned_project_id(db, project_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Project not found or unauthorized")
+    job = get_import_job(job_id, project_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
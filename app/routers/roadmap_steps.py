@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.events import publish_event, roadmap_topic
 
 # ✅ Use the background task system instead of direct normalization
 from app.core.task_executor import enqueue
@@ -78,6 +79,11 @@ def create_step(
     enqueue(normalize_roadmap_task, step_in.roadmap_id)
 
     db.refresh(new_step)
+    publish_event(
+        roadmap_topic(new_step.roadmap_id),
+        "roadmap_step.created",
+        RoadmapStepResponse.model_validate(new_step).model_dump(),
+    )
     return new_step
 
 
@@ -162,6 +168,11 @@ def update_step(
     if position_changed:
         enqueue(normalize_roadmap_task, roadmap.id)
 
+    publish_event(
+        roadmap_topic(roadmap.id),
+        "roadmap_step.updated",
+        {"id": step.id, "changes": payload},
+    )
     return step
 
 
@@ -188,6 +199,7 @@ def delete_step(
 
     # 🔄 Schedule background normalization
     enqueue(normalize_roadmap_task, roadmap_id)
+    publish_event(roadmap_topic(roadmap_id), "roadmap_step.deleted", {"id": step_id})
     return None
 
 
@@ -243,4 +255,9 @@ def reorder_steps(
         .all()
     )
     reordered_ids = [r[0] for r in reordered]
+    publish_event(
+        roadmap_topic(payload.roadmap_id),
+        "roadmap_step.reordered",
+        {"new_order": reordered_ids},
+    )
     return {"detail": "Steps reordered successfully", "new_order": reordered_ids}
@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.users import User
+from app.schemas.search import SearchResult
+from app.services.search import SEARCH_TYPES, search_all
+from app.utils.auth import get_current_user
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# -----------------------------------------------------------
+# 🔎 Full-text search (tasks, projects, roadmaps, concepts)
+# -----------------------------------------------------------
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(
+        None, description=f"Comma-separated subset of: {', '.join(SEARCH_TYPES)}"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Ranked full-text search over everything the user can see. Words are
+    stemmed and all must match; the last word also matches as a prefix.
+    """
+    selected = SEARCH_TYPES
+    if types:
+        selected = [t.strip() for t in types.split(",") if t.strip()]
+        unknown = sorted(set(selected) - set(SEARCH_TYPES))
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown types: {', '.join(unknown)}"
+            )
+    return search_all(db, current_user.id, q, selected, limit)
@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.users import User
+from app.schemas.tag import TagCountResponse
+from app.services.tags import tag_counts
+from app.utils.auth import get_current_user
+
+router = APIRouter(prefix="/tags", tags=["Tags"])
+
+
+# -----------------------------------------------------------
+# 🏷️ Tag usage counts
+# -----------------------------------------------------------
+@router.get("/", response_model=List[TagCountResponse])
+def list_tag_counts(
+    prefix: Optional[str] = Query(None, max_length=50),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """✅ Tags in use, most used first, with per-kind counts."""
+    return tag_counts(db, current_user.id, prefix, limit)
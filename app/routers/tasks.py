@@ -1,17 +1,32 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.core.database import get_db
+from app.core.events import project_topic, publish_event
+from app.core.task_executor import enqueue
+from app.services.task_bulk import apply_bulk_tasks
+from app.services.task_duplicates import list_possible_duplicates, scan_task_duplicates
 from app.utils.auth import get_current_user
 from app.utils.crud_helpers import (
     clear_user_cache,
     detect_possible_duplicates,
     generate_task_key,
 )
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -24,6 +39,13 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
 )
 def create_task(
     task: schemas.TaskCreate,
+    background_tasks: BackgroundTasks,
+    async_duplicates: bool = Query(
+        False,
+        description="Create right away and score duplicates in the background; "
+        "results arrive as `task.duplicates_suggested` on the WebSocket and via "
+        "GET /tasks/{id}/possible-duplicates",
+    ),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -38,8 +60,10 @@ def create_task(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found or unauthorized")
 
-    # Detect duplicates
-    duplicates = detect_possible_duplicates(db, task.project_id, task.title)
+    # Detect duplicates (advisory; optionally deferred off the request path)
+    duplicates = None
+    if not async_duplicates:
+        duplicates = detect_possible_duplicates(db, task.project_id, task.title)
 
     new_task = models.Task(**task.dict(), task_key=generate_task_key(db, project))
     db.add(new_task)
@@ -47,8 +71,10 @@ def create_task(
     db.refresh(new_task)
 
     clear_user_cache(current_user.id)
+    if async_duplicates:
+        enqueue(scan_task_duplicates, str(new_task.id), bg=background_tasks)
 
-    return {
+    response = {
         "id": new_task.id,
         "task_key": new_task.task_key,
         "title": new_task.title,
@@ -61,20 +87,85 @@ def create_task(
         "updated_at": new_task.updated_at,
         "possible_duplicates": duplicates,
     }
+    publish_event(project_topic(new_task.project_id), "task.created", response)
+    return response
+
+
+# -----------------------------------------------------------
+# 📦 BULK CREATE / UPDATE / DELETE
+# -----------------------------------------------------------
+@router.post(":bulk", response_model=schemas.TaskBulkResponse)
+def bulk_tasks(
+    payload: schemas.TaskBulkRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Apply many task changes in one transaction (e.g. dragging a board column).
+    Each item gets its own result; unknown or foreign ids report not_found.
+    """
+    return apply_bulk_tasks(db, current_user.id, payload)
 
 
 # -----------------------------------------------------------
 # 📋 LIST TASKS
 # -----------------------------------------------------------
-@router.get("/", response_model=List[schemas.TaskResponse])
+TASK_LIST_FIELDS = (
+    "id",
+    "task_key",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "project_id",
+    "assignee_id",
+    "due_date",
+    "completed_at",
+    "created_at",
+    "updated_at",
+)
+
+
+def _parse_fields(fields: Optional[str]) -> list:
+    if not fields:
+        return list(TASK_LIST_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(TASK_LIST_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+@router.get(
+    "/", response_model=None, responses={200: {"model": List[schemas.TaskResponse]}}
+)
 def list_tasks(
     project_id: UUID,
+    response: Response,
     status: Optional[str] = Query(None),
+    assignee_id: Optional[UUID] = Query(None),
+    priority: Optional[int] = Query(None),
+    due_after: Optional[datetime] = Query(None),
+    due_before: Optional[datetime] = Query(None),
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns to return, e.g. id,title,status"
+    ),
+    cursor: Optional[str] = Query(
+        None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"
+    ),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    """
+    Newest first, paginated by (created_at, id). The next page's cursor is
+    returned in the X-Next-Cursor header (absent on the last page).
+    """
     project = (
-        db.query(models.Project)
+        db.query(models.Project.id)
         .filter(
             models.Project.id == project_id, models.Project.owner_id == current_user.id
         )
@@ -83,11 +174,39 @@ def list_tasks(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found or unauthorized")
 
-    query = db.query(models.Task).filter(models.Task.project_id == project.id)
+    Task = models.Task
+    selected = _parse_fields(fields)
+    # The keyset columns are always read; only requested ones are returned
+    columns = list(dict.fromkeys([*selected, "created_at", "id"]))
+    query = select(*(getattr(Task, c) for c in columns)).where(
+        Task.project_id == project_id
+    )
     if status:
-        query = query.filter(models.Task.status == status)
+        query = query.where(Task.status == status)
+    if assignee_id:
+        query = query.where(Task.assignee_id == assignee_id)
+    if priority is not None:
+        query = query.where(Task.priority == priority)
+    if due_after:
+        query = query.where(Task.due_date >= due_after)
+    if due_before:
+        query = query.where(Task.due_date < due_before)
+    if q:
+        pattern = q.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        # Served by the trigram index on title
+        query = query.where(Task.title.ilike(f"%{pattern}%", escape="/"))
+    if cursor:
+        query = query.where(tuple_(Task.created_at, Task.id) < decode_cursor(cursor))
+
+    rows = db.execute(
+        query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit + 1)
+    ).all()
 
-    return query.order_by(models.Task.created_at.desc()).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return [{c: getattr(row, c) for c in selected} for row in rows]
 
 
 # -----------------------------------------------------------
@@ -110,6 +229,29 @@ def get_task(
     return task
 
 
+# -----------------------------------------------------------
+# 👯 POSSIBLE DUPLICATES
+# -----------------------------------------------------------
+@router.get(
+    "/{task_id}/possible-duplicates",
+    response_model=List[schemas.PossibleDuplicateResponse],
+)
+def get_possible_duplicates(
+    task_id: UUID,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    task = (
+        db.query(models.Task.id)
+        .join(models.Project)
+        .filter(models.Task.id == task_id, models.Project.owner_id == current_user.id)
+        .first()
+    )
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found or unauthorized")
+    return list_possible_duplicates(db, task_id)
+
+
 # -----------------------------------------------------------
 # ✏️ UPDATE TASK
 # -----------------------------------------------------------
@@ -129,13 +271,19 @@ def update_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found or unauthorized")
 
-    for key, value in data.dict(exclude_unset=True).items():
+    changes = data.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(task, key, value)
 
     db.commit()
     db.refresh(task)
 
     clear_user_cache(current_user.id)
+    publish_event(
+        project_topic(task.project_id),
+        "task.updated",
+        {"id": task.id, "task_key": task.task_key, "changes": changes},
+    )
 
     return task
 
@@ -158,7 +306,11 @@ def delete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found or unauthorized")
 
+    project_id, task_key = task.project_id, task.task_key
     db.delete(task)
     db.commit()
     clear_user_cache(current_user.id)
+    publish_event(
+        project_topic(project_id), "task.deleted", {"id": task_id, "task_key": task_key}
+    )
     return None
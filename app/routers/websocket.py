@@ -0,0 +1,147 @@
+# app/routers/websocket.py
+from typing import Dict, Iterable
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import status as http_status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.core.events import user_topic
+from app.models import Project, ProjectMember, Roadmap, User
+from app.utils.auth import verify_jwt
+from app.utils.websocket_manager import manager
+
+router = APIRouter(tags=["Realtime"])
+
+MAX_TOPICS_PER_CONNECTION = 50
+
+
+# -----------------------------------------------------------
+# 🔐 Helpers (sync — executed in the threadpool)
+# -----------------------------------------------------------
+def _authenticate(token: str):
+    """Resolve the user behind an access token, or None if invalid."""
+    try:
+        payload = verify_jwt(token)
+    except HTTPException:
+        return None
+    if payload.get("type") != "access" or not payload.get("sub"):
+        return None
+
+    with SessionLocal() as db:
+        return db.query(User.id).filter(User.id == payload["sub"]).first()
+
+
+def _allowed_topics(user_id: UUID, topics: Iterable[str]) -> Dict[str, str]:
+    """Map each requested topic this user may watch to its canonical name."""
+    allowed = {}
+    with SessionLocal() as db:
+        for topic in topics:
+            kind, _, raw_id = str(topic).partition(":")
+            try:
+                target_id = UUID(raw_id)
+            except ValueError:
+                continue
+
+            if kind == "user":
+                ok = target_id == user_id
+            elif kind == "project":
+                ok = (
+                    db.query(Project.id)
+                    .filter(Project.id == target_id, Project.owner_id == user_id)
+                    .first()
+                    or db.query(ProjectMember.id)
+                    .filter(
+                        ProjectMember.project_id == target_id,
+                        ProjectMember.user_id == user_id,
+                        ProjectMember.status == "active",
+                    )
+                    .first()
+                )
+            elif kind == "roadmap":
+                ok = (
+                    db.query(Roadmap.id)
+                    .filter(
+                        Roadmap.id == target_id,
+                        (Roadmap.is_public.is_(True)) | (Roadmap.owner_id == user_id),
+                    )
+                    .first()
+                )
+            else:
+                ok = False
+
+            if ok:
+                allowed[str(topic)] = f"{kind}:{target_id}"
+    return allowed
+
+
+# -----------------------------------------------------------
+# 📡 Realtime Endpoint
+# -----------------------------------------------------------
+@router.websocket("/ws")
+async def realtime_socket(websocket: WebSocket, token: str = Query(...)):
+    """
+    Authenticated realtime channel.
+
+    Protocol (JSON text frames):
+      → {"action": "subscribe", "topics": ["project:<id>", "roadmap:<id>"]}
+      → {"action": "unsubscribe", "topics": [...]}
+      → {"action": "ping"}
+      ← {"type": "<entity>.<change>", "topic": ..., "payload": {...}, "timestamp": ...}
+
+    Every connection is subscribed to its own "user:<id>" topic automatically.
+    """
+    user = await run_in_threadpool(_authenticate, token)
+    if not user:
+        await websocket.close(code=http_status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await manager.connect(websocket)
+    manager.subscribe(websocket, user_topic(user.id))
+    await websocket.send_json(
+        {"type": "connected", "topics": manager.topics_for(websocket)}
+    )
+
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Invalid JSON"})
+                continue
+
+            action = message.get("action") if isinstance(message, dict) else None
+            topics = (message.get("topics") or []) if action else []
+            if not isinstance(topics, list):
+                topics = [topics]
+
+            if action == "subscribe":
+                room = MAX_TOPICS_PER_CONNECTION - len(manager.topics_for(websocket))
+                requested = topics[: max(room, 0)]
+                granted = await run_in_threadpool(_allowed_topics, user.id, requested)
+                for topic in granted.values():
+                    manager.subscribe(websocket, topic)
+                await websocket.send_json(
+                    {
+                        "type": "subscribed",
+                        "topics": sorted(set(granted.values())),
+                        "denied": [t for t in topics if str(t) not in granted],
+                    }
+                )
+            elif action == "unsubscribe":
+                for topic in topics:
+                    manager.unsubscribe(websocket, str(topic))
+                await websocket.send_json(
+                    {"type": "unsubscribed", "topics": manager.topics_for(websocket)}
+                )
+            elif action == "ping":
+                await websocket.send_json({"type": "pong"})
+            else:
+                await websocket.send_json(
+                    {"type": "error", "detail": f"Unknown action: {action}"}
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket)
@@ -32,7 +32,12 @@ from app.schemas.auth import (
 )
 
 # === Concept ===
-from app.schemas.concept import ConceptCreate, ConceptResponse, ConceptUpdate
+from app.schemas.concept import (
+    ConceptCreate,
+    ConceptResponse,
+    ConceptSuggestion,
+    ConceptUpdate,
+)
 
 # === Progress ===
 from app.schemas.progress import (
@@ -70,8 +75,24 @@ from app.schemas.roadmap_step import (
     RoadmapStepUpdate,
 )
 
+# === Search ===
+from app.schemas.search import SearchResult
+
+# === Tag ===
+from app.schemas.tag import TagCountResponse
+
 # === Task ===
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.schemas.task import (
+    PossibleDuplicateResponse,
+    TaskBulkItemResult,
+    TaskBulkRequest,
+    TaskBulkResponse,
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskImportJobResponse,
+    TaskResponse,
+    TaskUpdate,
+)
 
 __all__ = [
     # Modules (for schemas.module access)
@@ -99,6 +120,16 @@ __all__ = [
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
+    "PossibleDuplicateResponse",
+    "TaskBulkRequest",
+    "TaskBulkUpdateItem",
+    "TaskBulkItemResult",
+    "TaskBulkResponse",
+    "TaskImportJobResponse",
+    # Search
+    "SearchResult",
+    # Tags
+    "TagCountResponse",
     # Analytics
     "TaskAnalyticsResponse",
     # Auth
@@ -115,6 +146,7 @@ __all__ = [
     "ConceptCreate",
     "ConceptUpdate",
     "ConceptResponse",
+    "ConceptSuggestion",
     # Progress
     "UserProgressCreate",
     "UserProgressUpdate",
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -48,3 +48,20 @@ class AIQuestionRequest(BaseModel):
 
 class AIAnswerResponse(BaseModel):
     answer: str
+
+
+class AIJobCreate(BaseModel):
+    kind: str = Field(
+        ..., example="project_idea / roadmap / tasks / answer / recommend"
+    )
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class AIJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    queued_at: Optional[str] = None
+    finished_at: Optional[str] = None
@@ -1,3 +1,7 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
 from pydantic import BaseModel
 
 
@@ -7,3 +11,20 @@ class TaskAnalyticsResponse(BaseModel):
     in_progress: int
     pending: int
     completion_rate: str
+
+
+class UserStatsResponse(BaseModel):
+    user_id: UUID
+    total_xp: float
+    current_streak: int
+    longest_streak: int
+    last_session_at: Optional[datetime] = None
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: UUID
+    username: str
+    total_xp: float
+    current_streak: int
+    longest_streak: int
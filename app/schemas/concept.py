@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -31,3 +31,10 @@ class ConceptResponse(ConceptBase):
     updated_at: Optional[datetime]
 
     model_config = {"from_attributes": True}
+
+
+class ConceptSuggestion(BaseModel):
+    type: Literal["concept", "learning_concept", "tag"]
+    id: Optional[UUID] = None  # None for tags
+    label: str
+    popularity: int
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -29,3 +29,27 @@ class UserProgressResponse(BaseModel):
     notes: Optional[dict]
 
     model_config = {"from_attributes": True}
+
+
+class StudySessionBatchItem(BaseModel):
+    client_id: str = Field(min_length=1, max_length=64)
+    concept_id: UUID
+    duration_minutes: int = Field(ge=0, le=24 * 60)
+    understanding_score: float = Field(ge=0.0, le=1.0)
+    studied_at: Optional[datetime] = None
+    reflection_notes: Optional[str] = Field(default=None, max_length=500)
+
+
+class StudySessionBatchRequest(BaseModel):
+    sessions: List[StudySessionBatchItem] = Field(min_length=1, max_length=500)
+
+
+class StudySessionBatchResponse(BaseModel):
+    accepted: List[str]
+    duplicates: List[str]
+    rejected: List[str] = []  # no progress row for the concept
+    xp_gained: float
+    total_xp: float
+    current_streak: int
+    longest_streak: int
+    progress: List[UserProgressResponse]
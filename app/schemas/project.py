@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 # -----------------------------------------------------------
@@ -43,6 +43,14 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
+    # Stored as comma-separated text on the row
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _split_tags(cls, value):
+        if isinstance(value, str):
+            return [t for t in value.split(",") if t]
+        return value
+
     class Config:
         from_attributes = True
 
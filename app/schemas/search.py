@@ -0,0 +1,12 @@
+from typing import Literal, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: Literal["task", "project", "roadmap", "concept"]
+    id: UUID
+    title: str
+    project_id: Optional[UUID] = None  # set for tasks and projects
+    rank: float
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class TagCountResponse(BaseModel):
+    name: str
+    projects: int  # among the current user's projects
+    concepts: int  # among active concepts
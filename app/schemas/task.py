@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TaskCreate(BaseModel):
@@ -33,6 +33,57 @@ class TaskResponse(BaseModel):
     assignee_id: Optional[UUID]
     created_at: datetime
     updated_at: Optional[datetime]
+    # Only set on create; null while an async duplicate scan is pending
+    possible_duplicates: Optional[List[dict]] = None
 
     class Config:
         from_attributes = True
+
+
+class PossibleDuplicateResponse(BaseModel):
+    id: UUID
+    task_id: UUID
+    task_key: Optional[str]
+    title: str
+    similarity: Optional[float]
+    status: str
+    created_at: Optional[datetime]
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: UUID
+    assignee_id: Optional[UUID] = None
+
+
+class TaskBulkRequest(BaseModel):
+    create: List[TaskCreate] = Field(default_factory=list, max_length=500)
+    update: List[TaskBulkUpdateItem] = Field(default_factory=list, max_length=500)
+    delete: List[UUID] = Field(default_factory=list, max_length=500)
+
+
+class TaskBulkItemResult(BaseModel):
+    op: str
+    index: int
+    id: Optional[UUID] = None
+    task_key: Optional[str] = None
+    status: str  # ok | not_found | invalid
+    detail: Optional[str] = None
+
+
+class TaskBulkResponse(BaseModel):
+    results: List[TaskBulkItemResult]
+    created: int
+    updated: int
+    deleted: int
+
+
+class TaskImportJobResponse(BaseModel):
+    id: str
+    status: str
+    processed: int = 0
+    created: int = 0
+    invalid: int = 0
+    errors: List[dict] = []
+    error: Optional[str] = None
+    queued_at: Optional[str] = None
+    finished_at: Optional[str] = None
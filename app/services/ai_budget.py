@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.redis_async import get_async_redis
+from app.services.ai_service import AIProvider
+
+logger = logging.getLogger("skillstack.ai.budget")
+
+BUDGET_PREFIX = "ai:budget"
+USAGE_PREFIX = "ai:usage"
+GLOBAL_BUCKET_KEY = f"{BUDGET_PREFIX}:global"
+ANONYMOUS = "anonymous"
+USAGE_RETENTION = 8 * 24 * 3600
+
+# Caller identity for budget accounting, set by routes/jobs before AI calls
+ai_user: ContextVar[Optional[str]] = ContextVar("ai_user", default=None)
+# Optional override of how long a caller may queue for budget (seconds)
+ai_max_wait: ContextVar[Optional[float]] = ContextVar("ai_max_wait", default=None)
+
+
+class AIBudgetExceeded(Exception):
+    """Raised when no AI budget became available before the caller's deadline."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"AI budget exhausted ({reason}), retry in {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+# -------------------------------------------------------------------
+# 🪣 Token buckets (user + global) and per-user concurrency leases,
+# checked and taken atomically so concurrent workers can't overspend.
+# KEYS: user bucket, global bucket, user lease zset
+# ARGV: user rate/ms, user capacity, global rate/ms, global capacity,
+#       max concurrent, lease id, lease ttl ms
+# Returns {granted, wait_ms, reason}
+# -------------------------------------------------------------------
+TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local function level(key, rate, cap)
+  local b = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(b[1]) or cap
+  local ts = tonumber(b[2]) or now
+  return math.min(cap, tokens + math.max(0, now - ts) * rate)
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+if redis.call('ZCARD', KEYS[3]) >= tonumber(ARGV[5]) then
+  local oldest = redis.call('ZRANGE', KEYS[3], 0, 0, 'WITHSCORES')
+  return {0, math.min(1000, tonumber(oldest[2]) - now), 'concurrency'}
+end
+
+local urate, ucap = tonumber(ARGV[1]), tonumber(ARGV[2])
+local grate, gcap = tonumber(ARGV[3]), tonumber(ARGV[4])
+local user = level(KEYS[1], urate, ucap)
+local global = level(KEYS[2], grate, gcap)
+
+if user < 1 then
+  return {0, math.ceil((1 - user) / urate), 'user'}
+end
+if global < 1 then
+  return {0, math.ceil((1 - global) / grate), 'global'}
+end
+
+redis.call('HSET', KEYS[1], 'tokens', user - 1, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(ucap / urate) + 1000)
+redis.call('HSET', KEYS[2], 'tokens', global - 1, 'ts', now)
+redis.call('PEXPIRE', KEYS[2], math.ceil(gcap / grate) + 1000)
+redis.call('ZADD', KEYS[3], now + tonumber(ARGV[7]), ARGV[6])
+redis.call('PEXPIRE', KEYS[3], tonumber(ARGV[7]))
+return {1, 0, 'ok'}
+"""
+
+
+def _redis():
+    # Sync client for the usage report (served from a sync route).
+    # Imported lazily: app.core.cache connects to Redis at import time.
+    from app.core.cache import get_redis
+
+    return get_redis()
+
+
+def _hour_key(moment: datetime) -> str:
+    return f"{USAGE_PREFIX}:{moment:%Y%m%d%H}"
+
+
+def _user_usage_key(user_id, moment: datetime) -> str:
+    return f"{USAGE_PREFIX}:user:{user_id}:{moment:%Y%m%d}"
+
+
+class AIBudget:
+    """Redis token-bucket budget with queueing up to a deadline."""
+
+    def __init__(
+        self,
+        per_user_per_min: int = settings.AI_RATE_LIMIT_PER_MIN,
+        global_per_min: int = settings.AI_GLOBAL_RATE_LIMIT_PER_MIN,
+        max_concurrent: int = settings.AI_USER_MAX_CONCURRENCY,
+        max_wait: float = settings.AI_BUDGET_MAX_WAIT,
+        lease_ttl: float = settings.AI_READ_TIMEOUT * 2,
+    ):
+        self.per_user_per_min = per_user_per_min
+        self.global_per_min = global_per_min
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self.lease_ttl = lease_ttl
+        self._script = None
+
+    def _leases_key(self, user_id) -> str:
+        return f"{BUDGET_PREFIX}:leases:{user_id}"
+
+    async def try_acquire(self, user_id) -> tuple:
+        """One atomic attempt → (lease_id | None, wait_seconds, reason)."""
+        lease_id = uuid.uuid4().hex
+        try:
+            client = get_async_redis()
+            if self._script is None:
+                self._script = client.register_script(TOKEN_BUCKET_LUA)
+            # Clients are per event loop, so pass this loop's one explicitly
+            granted, wait_ms, reason = await self._script(
+                keys=[
+                    f"{BUDGET_PREFIX}:user:{user_id}",
+                    GLOBAL_BUCKET_KEY,
+                    self._leases_key(user_id),
+                ],
+                args=[
+                    self.per_user_per_min / 60000,
+                    self.per_user_per_min,
+                    self.global_per_min / 60000,
+                    self.global_per_min,
+                    self.max_concurrent,
+                    lease_id,
+                    int(self.lease_ttl * 1000),
+                ],
+                client=client,
+            )
+        except Exception as e:
+            # Fail open: a Redis outage must not take the AI features down
+            logger.warning(f"AI budget check skipped: {e}")
+            return None, 0.0, "unavailable"
+        if int(granted):
+            return lease_id, 0.0, "ok"
+        return None, max(int(wait_ms), 50) / 1000, str(reason)
+
+    async def release(self, user_id, lease_id: Optional[str]):
+        if lease_id is None:
+            return
+        try:
+            await get_async_redis().zrem(self._leases_key(user_id), lease_id)
+        except Exception as e:
+            logger.warning(f"AI budget lease release failed: {e}")
+
+    async def acquire(self, user_id, max_wait: float = None) -> Optional[str]:
+        """Wait for a token and a concurrency slot, up to `max_wait` seconds."""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        waited = False
+
+        while True:
+            lease_id, wait, reason = await self.try_acquire(user_id)
+            if wait == 0:
+                await record_usage(user_id, "throttled" if waited else "granted")
+                return lease_id
+            remaining = deadline - loop.time()
+            if wait > remaining:
+                await record_usage(user_id, "rejected")
+                raise AIBudgetExceeded(reason, retry_after=wait)
+            waited = True
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self, user_id=None, max_wait: float = None):
+        user_id = user_id or ai_user.get() or ANONYMOUS
+        lease_id = await self.acquire(user_id, max_wait or ai_max_wait.get())
+        try:
+            yield
+        finally:
+            await self.release(user_id, lease_id)
+
+
+# -------------------------------------------------------------------
+# 📊 Usage counters (hourly global, daily per user)
+# -------------------------------------------------------------------
+async def record_usage(user_id, outcome: str):
+    """outcome: granted | throttled (granted after queueing) | rejected"""
+    now = datetime.now(timezone.utc)
+    try:
+        pipe = get_async_redis().pipeline()
+        for key in (_hour_key(now), _user_usage_key(user_id, now)):
+            pipe.hincrby(key, outcome, 1)
+            pipe.expire(key, USAGE_RETENTION)
+        await pipe.execute()
+    except Exception as e:
+        logger.debug(f"AI usage counter update failed: {e}")
+
+
+def get_usage(user_id, hours: int = 24) -> dict:
+    """Per-hour global usage for the last `hours` plus today's usage for a user."""
+    now = datetime.now(timezone.utc)
+    moments = [now - timedelta(hours=h) for h in range(hours - 1, -1, -1)]
+    pipe = _redis().pipeline()
+    for moment in moments:
+        pipe.hgetall(_hour_key(moment))
+    pipe.hgetall(_user_usage_key(user_id, now))
+    *hourly, mine = pipe.execute()
+
+    def _counts(raw):
+        return {
+            k: int((raw or {}).get(k, 0)) for k in ("granted", "throttled", "rejected")
+        }
+
+    return {
+        "limits": {
+            "per_user_per_min": ai_budget.per_user_per_min,
+            "global_per_min": ai_budget.global_per_min,
+            "user_max_concurrency": ai_budget.max_concurrent,
+            "max_wait_seconds": ai_budget.max_wait,
+        },
+        "user_today": _counts(mine),
+        "global_hourly": [
+            {"hour": f"{moment:%Y-%m-%dT%H:00Z}", **_counts(raw)}
+            for moment, raw in zip(moments, hourly)
+        ],
+    }
+
+
+ai_budget = AIBudget()
+
+
+# -------------------------------------------------------------------
+# 🛡️ Provider wrapper: every upstream call spends budget
+# -------------------------------------------------------------------
+class BudgetedAIProvider(AIProvider):
+    """Spend one budget token (and hold a concurrency lease) per provider call."""
+
+    def __init__(self, inner: AIProvider, budget: AIBudget = None):
+        self.inner = inner
+        self.budget = budget or ai_budget
+        self.name = inner.name
+        self.model = inner.model
+
+    async def generate_project_idea(self, goal, skill_level):
+        async with self.budget.slot():
+            return await self.inner.generate_project_idea(goal, skill_level)
+
+    async def generate_roadmap(self, title, goal, duration_weeks, skill_level):
+        async with self.budget.slot():
+            return await self.inner.generate_roadmap(
+                title, goal, duration_weeks, skill_level
+            )
+
+    async def generate_tasks(self, title, description, roadmap_context=None):
+        async with self.budget.slot():
+            return await self.inner.generate_tasks(title, description, roadmap_context)
+
+    async def answer_question(self, question):
+        async with self.budget.slot():
+            return await self.inner.answer_question(question)
+
+    async def generate_json(self, prompt, schema):
+        async with self.budget.slot():
+            return await self.inner.generate_json(prompt, schema)
+
+    async def stream_roadmap(self, title, goal, duration_weeks, skill_level):
+        async with self.budget.slot():
+            async for chunk in self.inner.stream_roadmap(
+                title, goal, duration_weeks, skill_level
+            ):
+                yield chunk
+
+    async def stream_answer(self, question):
+        async with self.budget.slot():
+            async for chunk in self.inner.stream_answer(question):
+                yield chunk
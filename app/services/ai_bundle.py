@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.ai_service import AIProvider
+
+logger = logging.getLogger("skillstack.ai.bundle")
+
+MAX_TEXT_LENGTH = 1200
+
+
+def _clean_text(value: Any) -> str:
+    """Default validator for STRING asks: non-empty, trimmed, bounded."""
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("expected a non-empty string")
+    return value.strip()[:MAX_TEXT_LENGTH]
+
+
+@dataclass
+class BundleAsk:
+    """One logical question inside a bundled structured-output request."""
+
+    key: str
+    instruction: str
+    schema: dict = field(default_factory=lambda: {"type": "STRING"})
+    validate: Callable[[Any], Any] = _clean_text
+    fallback: Any = None
+
+
+@dataclass
+class BundleResult:
+    values: Dict[str, Any]
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.errors)
+
+
+# -------------------- Prompt / Schema --------------------
+def build_bundle_prompt(context: str, asks: List[BundleAsk]) -> str:
+    lines = [
+        context.strip(),
+        "",
+        "Answer every item below. Reply with one JSON object whose keys are "
+        "the item names:",
+    ]
+    lines += [f"- {ask.key}: {ask.instruction}" for ask in asks]
+    return "\n".join(lines)
+
+
+def build_bundle_schema(asks: List[BundleAsk]) -> dict:
+    return {
+        "type": "OBJECT",
+        "properties": {ask.key: ask.schema for ask in asks},
+        "required": [ask.key for ask in asks],
+    }
+
+
+def split_bundle_response(data: Any, asks: List[BundleAsk]) -> BundleResult:
+    """
+    Validate each part of a bundled reply independently. Missing or invalid
+    parts get their fallback and are reported in `errors`; valid parts are kept.
+    """
+    result = BundleResult(values={})
+    if not isinstance(data, dict):
+        data = {}
+        reason = "response is not a JSON object"
+    else:
+        reason = None
+
+    for ask in asks:
+        try:
+            if ask.key not in data:
+                raise ValueError(reason or "missing from response")
+            result.values[ask.key] = ask.validate(data[ask.key])
+        except Exception as e:
+            result.values[ask.key] = ask.fallback
+            result.errors[ask.key] = str(e)
+    return result
+
+
+# -------------------- Execution --------------------
+async def _ask_json(provider: AIProvider, context: str, asks, timeout):
+    prompt = build_bundle_prompt(context, asks)
+    return await asyncio.wait_for(
+        provider.generate_json(prompt, build_bundle_schema(asks)), timeout=timeout
+    )
+
+
+async def run_prompt_bundle(
+    provider: AIProvider,
+    context: str,
+    asks: List[BundleAsk],
+    timeout: Optional[float] = None,
+    retry_failed: bool = True,
+) -> BundleResult:
+    """
+    Send all `asks` sharing `context` as a single structured-output request
+    and split the reply back per key.
+
+    If the request itself fails every ask degrades to its fallback (no extra
+    calls against a provider that is already struggling). If only some parts
+    come back invalid, those are retried individually when `retry_failed`.
+    """
+    try:
+        data = await _ask_json(provider, context, asks, timeout)
+    except Exception as e:
+        logger.warning(f"⚠️ Prompt bundle failed ({[a.key for a in asks]}): {e!r}")
+        return BundleResult(
+            values={ask.key: ask.fallback for ask in asks},
+            errors={ask.key: f"request failed: {e!r}" for ask in asks},
+        )
+
+    result = split_bundle_response(data, asks)
+    if not result.errors or not retry_failed or len(result.errors) == len(asks):
+        return result
+
+    failed = [ask for ask in asks if ask.key in result.errors]
+    logger.info(f"Retrying bundle parts individually: {[a.key for a in failed]}")
+    retried = await asyncio.gather(
+        *(_ask_json(provider, context, [ask], timeout) for ask in failed),
+        return_exceptions=True,
+    )
+    for ask, data in zip(failed, retried):
+        if isinstance(data, Exception):
+            continue
+        single = split_bundle_response(data, [ask])
+        if not single.errors:
+            result.values[ask.key] = single.values[ask.key]
+            result.errors.pop(ask.key)
+    return result
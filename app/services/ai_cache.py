@@ -0,0 +1,296 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.redis_async import get_async_redis
+from app.services.ai_service import PARSE_ERROR_MESSAGE, AIProvider, get_ai_provider
+
+logger = logging.getLogger("skillstack.ai.cache")
+
+CACHE_PREFIX = "ai:cache"
+STREAM_PREFIX = f"{CACHE_PREFIX}:stream"  # assembled streamed text
+INDEX_KEY = f"{CACHE_PREFIX}:index"  # sorted set: cache key → insertion time
+STATS_KEY = f"{CACHE_PREFIX}:stats"  # hash: hits / misses / bypassed
+
+_WHITESPACE = re.compile(r"\s+")
+_SKILL_LEVELS = {
+    "beginner": "beginner",
+    "novice": "beginner",
+    "newbie": "beginner",
+    "basic": "beginner",
+    "intermediate": "intermediate",
+    "medium": "intermediate",
+    "advanced": "advanced",
+    "expert": "advanced",
+}
+
+
+# -------------------- Key Normalization --------------------
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    if value is None:
+        return ""
+    text = _WHITESPACE.sub(" ", str(value)).strip().lower()
+    return text.rstrip(" .!?;,")
+
+
+def canonicalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring call parameters into a stable, comparable form."""
+    canonical = {}
+    for key, value in params.items():
+        if key == "skill_level":
+            level = normalize_text(value)
+            canonical[key] = _SKILL_LEVELS.get(level, level or "intermediate")
+        elif isinstance(value, bool) or value is None:
+            canonical[key] = value
+        elif isinstance(value, (int, float)):
+            canonical[key] = int(value) if float(value).is_integer() else value
+        else:
+            canonical[key] = normalize_text(value)
+    return canonical
+
+
+def make_cache_key(
+    provider: str, model: str, method: str, params: dict, prefix: str = CACHE_PREFIX
+) -> str:
+    """Hash provider, model, method and canonical params into a Redis key."""
+    material = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "method": method,
+            "params": canonicalize_params(params),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+# -------------------- Redis Helpers --------------------
+def _redis():
+    # Imported lazily: app.core.cache connects to Redis at import time.
+    from app.core.cache import get_redis
+
+    return get_redis()
+
+
+async def _record(outcome: str):
+    try:
+        await get_async_redis().hincrby(STATS_KEY, outcome, 1)
+    except Exception as e:
+        logger.debug(f"AI cache stats update failed: {e}")
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters and current size, for dashboards and capacity planning."""
+    client = _redis()
+    raw = client.hgetall(STATS_KEY) or {}
+    hits, misses = int(raw.get("hits", 0)), int(raw.get("misses", 0))
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "bypassed": int(raw.get("bypassed", 0)),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "entries": client.zcard(INDEX_KEY),
+        "max_entries": settings.AI_CACHE_MAX_ENTRIES,
+        "ttl_seconds": settings.AI_CACHE_TTL,
+    }
+
+
+# -------------------- Cached Provider --------------------
+class CachedAIProvider(AIProvider):
+    """
+    Read-through response cache in front of another AIProvider.
+    Entries expire after `ttl` seconds and the oldest are evicted once
+    more than `max_entries` responses are stored.
+    """
+
+    def __init__(
+        self,
+        inner: AIProvider,
+        ttl: int = settings.AI_CACHE_TTL,
+        max_entries: int = settings.AI_CACHE_MAX_ENTRIES,
+        enabled: bool = True,
+    ):
+        self.inner = inner
+        self.enabled = enabled
+        self.name = inner.name
+        self.model = inner.model
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    async def _lookup(self, key: str):
+        try:
+            raw = await get_async_redis().get(key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"AI cache read failed: {e}")
+            return None
+
+    async def _store(self, key: str, value):
+        if value == PARSE_ERROR_MESSAGE:
+            return
+        try:
+            client = get_async_redis()
+            pipe = client.pipeline()
+            pipe.setex(key, self.ttl, json.dumps(value))
+            pipe.zadd(INDEX_KEY, {key: time.time()})
+            # Forget index entries whose value has already expired
+            pipe.zremrangebyscore(INDEX_KEY, "-inf", time.time() - self.ttl)
+            pipe.zcard(INDEX_KEY)
+            size = (await pipe.execute())[-1]
+
+            overflow = size - self.max_entries
+            if overflow > 0:
+                evicted = [k for k, _ in await client.zpopmin(INDEX_KEY, overflow)]
+                if evicted:
+                    await client.delete(*evicted)
+        except Exception as e:
+            logger.warning(f"AI cache write failed: {e}")
+
+    async def _cached(
+        self,
+        method: str,
+        params: dict,
+        use_cache: bool,
+        call: Callable[[], Awaitable[Any]],
+    ):
+        if not self.enabled:
+            return await call()
+        if not use_cache:
+            await _record("bypassed")
+            return await call()
+
+        key = make_cache_key(self.name, self.model, method, params)
+        hit = await self._lookup(key)
+        if hit is not None:
+            await _record("hits")
+            return hit
+
+        await _record("misses")
+        result = await call()
+        await self._store(key, result)
+        return result
+
+    async def _cached_stream(
+        self,
+        method: str,
+        params: dict,
+        use_cache: bool,
+        stream: Callable[[], AsyncIterator[str]],
+    ) -> AsyncIterator[str]:
+        """
+        Streaming read-through: a text hit is sent as a single chunk, a miss
+        is relayed chunk by chunk and the assembled text stored once complete.
+        Kept under their own prefix: raw streamed text is not the parsed
+        value the non-streaming call of the same method returns.
+        """
+        key = None
+        if self.enabled and use_cache:
+            key = make_cache_key(
+                self.name, self.model, method, params, prefix=STREAM_PREFIX
+            )
+            hit = await self._lookup(key)
+            if isinstance(hit, str):
+                await _record("hits")
+                yield hit
+                return
+            await _record("misses")
+        elif self.enabled:
+            await _record("bypassed")
+
+        chunks = []
+        async for chunk in stream():
+            chunks.append(chunk)
+            yield chunk
+        if key is not None and chunks:
+            await self._store(key, "".join(chunks))
+
+    async def generate_project_idea(self, goal, skill_level, use_cache=True):
+        return await self._cached(
+            "project_idea",
+            {"goal": goal, "skill_level": skill_level},
+            use_cache,
+            lambda: self.inner.generate_project_idea(goal, skill_level),
+        )
+
+    async def generate_roadmap(
+        self, title, goal, duration_weeks, skill_level, use_cache=True
+    ):
+        return await self._cached(
+            "roadmap",
+            {
+                "title": title,
+                "goal": goal,
+                "duration_weeks": duration_weeks,
+                "skill_level": skill_level,
+            },
+            use_cache,
+            lambda: self.inner.generate_roadmap(
+                title, goal, duration_weeks, skill_level
+            ),
+        )
+
+    async def generate_tasks(
+        self, title, description, roadmap_context=None, use_cache=True
+    ):
+        return await self._cached(
+            "tasks",
+            {
+                "title": title,
+                "description": description,
+                "roadmap_context": roadmap_context,
+            },
+            use_cache,
+            lambda: self.inner.generate_tasks(title, description, roadmap_context),
+        )
+
+    async def stream_roadmap(
+        self, title, goal, duration_weeks, skill_level, use_cache=True
+    ):
+        async for chunk in self._cached_stream(
+            "roadmap",
+            {
+                "title": title,
+                "goal": goal,
+                "duration_weeks": duration_weeks,
+                "skill_level": skill_level,
+            },
+            use_cache,
+            lambda: self.inner.stream_roadmap(title, goal, duration_weeks, skill_level),
+        ):
+            yield chunk
+
+    async def answer_question(self, question, use_cache=True):
+        return await self._cached(
+            "answer",
+            {"question": question},
+            use_cache,
+            lambda: self.inner.answer_question(question),
+        )
+
+    async def stream_answer(self, question, use_cache=True):
+        async for chunk in self._cached_stream(
+            "answer",
+            {"question": question},
+            use_cache,
+            lambda: self.inner.stream_answer(question),
+        ):
+            yield chunk
+
+    async def generate_json(self, prompt, schema):
+        # Structured asks carry per-user context, so they are never cached
+        return await self.inner.generate_json(prompt, schema)
+
+
+# -------------------- Factory --------------------
+def get_cached_ai_provider() -> AIProvider:
+    """Return the configured provider behind the response cache."""
+    return CachedAIProvider(get_ai_provider(), enabled=settings.AI_CACHE_ENABLED)
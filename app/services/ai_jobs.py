@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import publish_event_async, user_topic
+from app.core.redis_async import close_async_redis
+from app.models import AIRecommendation
+from app.schemas.ai import (
+    AIProjectIdeaRequest,
+    AIQuestionRequest,
+    AIRoadmapRequest,
+    AITaskGenerationRequest,
+)
+from app.services.ai_budget import ai_max_wait, ai_user
+from app.services.ai_cache import get_cached_ai_provider
+from app.services.ai_service import close_http_client
+
+logger = logging.getLogger("skillstack.ai.jobs")
+
+JOB_PREFIX = "job:"
+TERMINAL_STATUSES = {"succeeded", "failed"}
+
+# kind → request schema used to validate the job parameters (None = no params)
+JOB_KINDS = {
+    "project_idea": AIProjectIdeaRequest,
+    "roadmap": AIRoadmapRequest,
+    "tasks": AITaskGenerationRequest,
+    "answer": AIQuestionRequest,
+    "recommend": None,
+    "study_summary": None,
+}
+
+ai = get_cached_ai_provider()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# -------------------------------------------------------------------
+# 📝 Job records (stored as AIRecommendation rows, suggestion_type="job:<kind>")
+# -------------------------------------------------------------------
+def validate_job_params(kind: str, params: dict) -> dict:
+    """Validate parameters for `kind`; raises ValueError on unknown kinds."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown AI job kind '{kind}'")
+    schema = JOB_KINDS[kind]
+    return schema.model_validate(params or {}).model_dump() if schema else {}
+
+
+def create_job(db: Session, user_id, kind: str, params: dict) -> AIRecommendation:
+    job = AIRecommendation(
+        user_id=user_id,
+        suggestion_type=f"{JOB_PREFIX}{kind}",
+        content={
+            "status": "queued",
+            "params": params,
+            "result": None,
+            "error": None,
+            "queued_at": _now(),
+        },
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_job(db: Session, job_id, user_id) -> Optional[AIRecommendation]:
+    return (
+        db.query(AIRecommendation)
+        .filter(
+            AIRecommendation.id == job_id,
+            AIRecommendation.user_id == user_id,
+            AIRecommendation.suggestion_type.like(f"{JOB_PREFIX}%"),
+        )
+        .first()
+    )
+
+
+def job_view(job: AIRecommendation) -> dict:
+    content = job.content or {}
+    return {
+        "id": str(job.id),
+        "kind": job.suggestion_type[len(JOB_PREFIX) :],
+        "status": content.get("status"),
+        "result": content.get("result"),
+        "error": content.get("error"),
+        "queued_at": content.get("queued_at"),
+        "finished_at": content.get("finished_at"),
+    }
+
+
+def _update_job(db: Session, job: AIRecommendation, **changes):
+    # JSON column without mutation tracking: assign a new dict
+    job.content = {**(job.content or {}), **changes}
+    db.commit()
+
+
+async def wait_for_job(job_id, user_id, wait: float) -> Optional[dict]:
+    """Long-poll a job until it finishes or `wait` seconds pass."""
+    deadline = asyncio.get_running_loop().time() + wait
+    delay = 0.25
+
+    def _load():
+        with SessionLocal() as db:
+            job = get_job(db, job_id, user_id)
+            return job_view(job) if job else None
+
+    while True:
+        view = await run_in_threadpool(_load)
+        remaining = deadline - asyncio.get_running_loop().time()
+        if view is None or view["status"] in TERMINAL_STATUSES or remaining <= 0:
+            return view
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 2.0)
+
+
+# -------------------------------------------------------------------
+# ⚙️ Execution (Celery `ai` queue, or a thread when Celery is off)
+# -------------------------------------------------------------------
+async def _call_provider(kind: str, params: dict, user_id):
+    if kind == "project_idea":
+        return await ai.generate_project_idea(
+            params["user_goal"], params["skill_level"]
+        )
+    if kind == "roadmap":
+        return await ai.generate_roadmap(
+            params["project_title"],
+            params["goal"],
+            params["duration_weeks"],
+            params["skill_level"],
+        )
+    if kind == "tasks":
+        return await ai.generate_tasks(
+            params["project_title"], params["description"], params["roadmap_context"]
+        )
+    if kind == "answer":
+        return await ai.answer_question(params["question"])
+    if kind == "recommend":
+        from app.services.ai_recommendation import recommend_for_user
+
+        with SessionLocal() as db:
+            return await recommend_for_user(db, user_id)
+    if kind == "study_summary":
+        from app.services.notifications import send_study_summary
+
+        with SessionLocal() as db:
+            notif = await send_study_summary(db, user_id)
+            return {"notification": notif.message if notif else None}
+    raise ValueError(f"Unknown AI job kind '{kind}'")
+
+
+async def execute_job(job_id: str):
+    """Run one queued job, persist its outcome and notify the owner."""
+    with SessionLocal() as db:
+        job = db.get(AIRecommendation, uuid.UUID(str(job_id)))
+        if job is None or (job.content or {}).get("status") != "queued":
+            return
+        kind = job.suggestion_type[len(JOB_PREFIX) :]
+        user_id = job.user_id
+        params = (job.content or {}).get("params") or {}
+        _update_job(db, job, status="running", started_at=_now())
+        # Background jobs spend the owner's budget but may queue for longer
+        ai_user.set(str(user_id))
+        ai_max_wait.set(settings.AI_READ_TIMEOUT)
+
+        try:
+            # Results may carry datetimes/UUIDs; the content column is plain JSON
+            result = jsonable_encoder(await _call_provider(kind, params, user_id))
+            _update_job(db, job, status="succeeded", result=result, finished_at=_now())
+        except Exception as e:
+            logger.error(f"❌ AI job {job_id} ({kind}) failed: {e}")
+            db.rollback()
+            _update_job(db, job, status="failed", error=str(e), finished_at=_now())
+
+        view = job_view(job)
+    await publish_event_async(user_topic(user_id), f"ai_job.{view['status']}", view)
+
+
+def run_ai_job(job_id: str):
+    """Sync entrypoint for the Celery worker / thread fallback."""
+
+    async def _run():
+        try:
+            await execute_job(job_id)
+        finally:
+            await close_http_client()
+            await close_async_redis()
+
+    asyncio.run(_run())
+
+
+# -------------------------------------------------------------------
+# 🧹 Retention
+# -------------------------------------------------------------------
+def cleanup_expired_jobs(db: Session, ttl_seconds: int = None) -> int:
+    """Delete job rows older than the retention window."""
+    ttl_seconds = ttl_seconds or settings.AI_JOB_TTL
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl_seconds)
+    deleted = (
+        db.query(AIRecommendation)
+        .filter(
+            AIRecommendation.suggestion_type.like(f"{JOB_PREFIX}%"),
+            AIRecommendation.created_at < cutoff,
+        )
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
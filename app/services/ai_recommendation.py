@@ -1,69 +1,224 @@
 import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
-import google.generativeai as genai
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.models import RoadmapStep, UserProgress
+from app.models import AIRecommendation
+from app.services.ai_budget import ai_user
+from app.services.ai_service import get_ai_provider
+from app.services.concept_graph import rank_next_concepts
+from app.services.learning_context import get_learning_context
 
-# --- Configure Gemini ---
-genai.configure(api_key=settings.GEMINI_API_KEY)
+logger = logging.getLogger("skillstack.ai.recommend")
 
+RECOMMENDATION_TYPE = "next_concepts"
+DEFAULT_CONFIDENCE = 0.5
+MAX_SUGGESTIONS = 3
+
+RECOMMENDATION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "suggestions": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "title": {"type": "STRING"},
+                    "reason": {"type": "STRING"},
+                    "confidence": {"type": "NUMBER"},
+                },
+                "required": ["title", "reason"],
+            },
+        }
+    },
+    "required": ["suggestions"],
+}
+
+ai = get_ai_provider()
+
+
+def get_user_learning_context(db: Session, user_id: str) -> str:
+    """Compact, token-bounded progress context for AI prompts (cached per user)."""
+    return get_learning_context(db, user_id)
+
+
+def _prompt(context: str, candidates: list = None) -> str:
+    if candidates:
+        # The graph already picked what is unlocked; the LLM only phrases it
+        names = ", ".join(c["title"] for c in candidates)
+        choice = (
+            f"Choose the {MAX_SUGGESTIONS} best of these unlocked concepts, "
+            f"listed best first by our ranking: {names}."
+        )
+    else:
+        choice = f"Suggest {MAX_SUGGESTIONS} next learning concepts to focus on."
+    return f"""
+    You are a learning coach.
+    Based on this user's current progress data:
+    {context}
+    {choice} Give each a short reason and your confidence (0 to 1) that it
+    is the right next step.
+    """
 
-def get_user_learning_context(db: Session, user_id: str):
-    """Collect user progress and concept context for AI prompt."""
-    progress_data = db.query(UserProgress).filter(UserProgress.user_id == user_id).all()
-    roadmap_steps = (
-        db.query(RoadmapStep)
-        .join(UserProgress, RoadmapStep.roadmap_id == UserProgress.roadmap_id)
-        .filter(UserProgress.user_id == user_id)
-        .all()
-    )
 
-    # Format context summary
-    context = {
-        "progress_summary": [
+def graph_suggestions(candidates: list) -> list:
+    """Phrase ranked graph candidates without an LLM call."""
+    suggestions = []
+    for c in candidates[:MAX_SUGGESTIONS]:
+        if c["in_progress"]:
+            reason = "You've already started this and its prerequisites are done."
+        elif c["unlocks"]:
+            reason = (
+                f"All prerequisites mastered; unlocks {c['unlocks']} more concepts."
+            )
+        else:
+            reason = "All prerequisites mastered."
+        suggestions.append(
             {
-                "concept_id": str(p.concept_id),
-                "progress": p.progress,
-                "completed": p.completed,
+                "title": c["title"],
+                "reason": reason,
+                "confidence": round(min(1.0, c["score"]), 3),
+                "concept_id": c["concept_id"],
             }
-            for p in progress_data
-        ],
-        "roadmap_steps": [
+        )
+    return suggestions
+
+
+def parse_suggestions(data) -> tuple:
+    """Validate the structured reply → (suggestions, overall confidence)."""
+    items = data.get("suggestions") if isinstance(data, dict) else None
+    suggestions = []
+    for item in items or []:
+        if not isinstance(item, dict) or not str(item.get("title", "")).strip():
+            continue
+        try:
+            confidence = min(1.0, max(0.0, float(item.get("confidence"))))
+        except (TypeError, ValueError):
+            confidence = DEFAULT_CONFIDENCE
+        suggestions.append(
             {
-                "concept_id": str(r.concept_id),
-                "completed": r.completed,
-                "order": r.order_index,
+                "title": str(item["title"]).strip(),
+                "reason": str(item.get("reason", "")).strip(),
+                "confidence": confidence,
             }
-            for r in roadmap_steps
-        ],
-    }
-    return context
+        )
+    suggestions = suggestions[:MAX_SUGGESTIONS]
+    if not suggestions:
+        raise ValueError("AI response contained no usable suggestions")
+    overall = sum(s["confidence"] for s in suggestions) / len(suggestions)
+    return suggestions, round(overall, 3)
 
 
-def suggest_next_concept(db: Session, user_id: str):
-    """Use Gemini to suggest the next concept based on progress."""
+def load_recommendation_inputs(db: Session, user_id) -> tuple:
+    """Prompt context plus graph-ranked candidates for one user."""
     context = get_user_learning_context(db, user_id)
-    prompt = f"""
-    You are a learning coach.
-    Based on this user's current progress data:
-    {json.dumps(context, indent=2)}
-    Suggest 3 next learning concepts to focus on.
-    Respond with JSON like:
-    [
-      {{ "title": "Next Concept", "reason": "Why relevant" }},
-      ...
-    ]
+    candidates = rank_next_concepts(db, user_id, k=MAX_SUGGESTIONS * 2)
+    return context, candidates
+
+
+async def generate_recommendations(
+    user_id, context: str, candidates: list = None
+) -> tuple:
+    ai_user.set(str(user_id))
+    data = await ai.generate_json(_prompt(context, candidates), RECOMMENDATION_SCHEMA)
+    return parse_suggestions(data)
+
+
+# -------------------------------------------------------------------
+# 💾 Stored recommendations (latest row per user)
+# -------------------------------------------------------------------
+def store_recommendations(
+    db: Session, user_id, suggestions: list, confidence: float
+) -> AIRecommendation:
+    """Replace the user's stored recommendation with a fresh one."""
+    db.query(AIRecommendation).filter(
+        AIRecommendation.user_id == user_id,
+        AIRecommendation.suggestion_type == RECOMMENDATION_TYPE,
+    ).delete(synchronize_session=False)
+    row = AIRecommendation(
+        user_id=user_id,
+        suggestion_type=RECOMMENDATION_TYPE,
+        content=suggestions,
+        confidence=confidence,
+    )
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+def get_precomputed_recommendations(
+    db: Session, user_id, max_age: int = None
+) -> Optional[AIRecommendation]:
+    """Newest stored recommendation still within `max_age` seconds."""
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=max_age or settings.AI_RECOMMEND_MAX_AGE
+    )
+    return (
+        db.query(AIRecommendation)
+        .filter(
+            AIRecommendation.user_id == user_id,
+            AIRecommendation.suggestion_type == RECOMMENDATION_TYPE,
+            AIRecommendation.created_at >= cutoff,
+        )
+        .order_by(AIRecommendation.created_at.desc())
+        .first()
+    )
+
+
+def _view(row: AIRecommendation, source: str) -> dict:
+    return {
+        "recommendations": row.content,
+        "confidence": row.confidence,
+        "generated_at": row.created_at,
+        "source": source,
+    }
+
+
+async def _generate_and_store(db: Session, user_id) -> AIRecommendation:
+    context, candidates = await run_in_threadpool(
+        load_recommendation_inputs, db, user_id
+    )
+    suggestions, confidence = await generate_recommendations(
+        user_id, context, candidates
+    )
+    return await run_in_threadpool(
+        store_recommendations, db, user_id, suggestions, confidence
+    )
+
+
+async def suggest_next_concept(db: Session, user_id: str) -> list:
+    """Live generation: build context, ask the provider and store the result."""
+    return (await _generate_and_store(db, user_id)).content
+
+
+async def recommend_for_user(db: Session, user_id, fast: bool = False) -> dict:
     """
+    Serve the precomputed recommendation; generate live only on a miss.
+    `fast` ranks straight from the prerequisite graph with no LLM call.
+    """
+    if fast:
+        candidates = await run_in_threadpool(rank_next_concepts, db, user_id)
+        suggestions = graph_suggestions(candidates)
+        return {
+            "recommendations": suggestions,
+            "confidence": suggestions[0]["confidence"] if suggestions else 0.0,
+            "generated_at": datetime.now(timezone.utc),
+            "source": "graph",
+        }
+
+    row = await run_in_threadpool(get_precomputed_recommendations, db, user_id)
+    if row is not None:
+        return _view(row, "precomputed")
+    return _view(await _generate_and_store(db, user_id), "live")
 
-    model = genai.GenerativeModel("gemini-2.0-flash")
-    response = model.generate_content(prompt)
 
+def has_learning_data(context: str) -> bool:
     try:
-        # Extract valid JSON
-        text = response.text.strip()
-        suggestions = json.loads(text)
-        return suggestions
+        return bool(json.loads(context).get("roadmaps"))
     except Exception:
-        return [{"title": "Error parsing AI response", "reason": response.text}]
+        return False
@@ -1,81 +1,278 @@
+import asyncio
+import json
 import logging
+import random
+import weakref
+from typing import AsyncIterator, Optional
 
-import requests
+import httpx
 
 from app.core.config import settings
 
 logger = logging.getLogger("skillstack.ai")
 
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+PARSE_ERROR_MESSAGE = "Sorry, I couldn't understand the AI response."
+
+
+class AIProviderError(Exception):
+    """Raised when the upstream AI provider fails after all retries."""
+
+
+# -------------------- Shared HTTP Client --------------------
+# One pooled AsyncClient (and concurrency gate) per event loop, so TCP/TLS
+# connections are reused across requests instead of re-handshaking per call.
+# Worker threads running their own loop (background AI jobs) get their own pair.
+_loop_resources: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _ensure_loop_resources():
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None or resources[0].is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.AI_READ_TIMEOUT, connect=settings.AI_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.AI_MAX_CONCURRENCY,
+                max_keepalive_connections=settings.AI_MAX_CONCURRENCY,
+                keepalive_expiry=30,
+            ),
+        )
+        resources = (client, asyncio.Semaphore(settings.AI_MAX_CONCURRENCY))
+        _loop_resources[loop] = resources
+    return resources
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client for AI provider calls."""
+    return _ensure_loop_resources()[0]
+
+
+def get_concurrency_gate() -> asyncio.Semaphore:
+    """Return the semaphore capping in-flight AI requests for this loop."""
+    return _ensure_loop_resources()[1]
+
+
+async def close_http_client():
+    """Close this loop's client (application shutdown / end of a job)."""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), None)
+    if resources is not None and not resources[0].is_closed:
+        await resources[0].aclose()
+
 
 # -------------------- Provider Interfaces --------------------
 class AIProvider:
-    def generate_project_idea(self, goal: str, skill_level: str):
+    name = "base"
+    model: Optional[str] = None
+
+    async def generate_project_idea(self, goal: str, skill_level: str):
         raise NotImplementedError
 
-    def generate_roadmap(
+    async def generate_roadmap(
         self, title: str, goal: str, duration_weeks: int, skill_level: str
     ):
         raise NotImplementedError
 
-    def generate_tasks(self, title: str, description: str, roadmap_context: str = None):
+    async def generate_tasks(
+        self, title: str, description: str, roadmap_context: str = None
+    ):
+        raise NotImplementedError
+
+    async def answer_question(self, question: str):
         raise NotImplementedError
 
-    def answer_question(self, question: str):
+    async def generate_json(self, prompt: str, schema: dict) -> dict:
+        """Structured output: return a JSON object matching `schema`."""
         raise NotImplementedError
 
+    # Streaming variants yield text chunks as soon as the provider emits them.
+    # Providers without native streaming send the full answer as one chunk.
+    async def stream_roadmap(
+        self, title: str, goal: str, duration_weeks: int, skill_level: str
+    ) -> AsyncIterator[str]:
+        yield _as_text(
+            await self.generate_roadmap(title, goal, duration_weeks, skill_level)
+        )
+
+    async def stream_answer(self, question: str) -> AsyncIterator[str]:
+        yield _as_text(await self.answer_question(question))
+
+
+def _as_text(value) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
+
 
 # -------------------- Gemini Provider --------------------
 class GeminiProvider(AIProvider):
-    def __init__(self):
+    name = "gemini"
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.api_key = settings.GEMINI_API_KEY
         self.model = settings.GEMINI_MODEL
-        self.url = (
-            f"https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{self.model}:generateContent?key={self.api_key}"
-        )  # ✅ FIXED: Split long line
+        self.url = f"{GEMINI_BASE_URL}/{self.model}:generateContent"
+        self.stream_url = f"{GEMINI_BASE_URL}/{self.model}:streamGenerateContent"
+        self.max_retries = settings.AI_MAX_RETRIES
+        self.backoff_base = 0.5
+        # Waiting between attempts never runs past this (Retry-After included)
+        self.retry_budget = settings.AI_READ_TIMEOUT
+        self._client = client  # injected in tests; shared pool otherwise
+
+    def _backoff_delay(self, attempt: int, response: httpx.Response = None) -> float:
+        retry_after = response.headers.get("retry-after") if response else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_base * (2**attempt) + random.uniform(0, self.backoff_base)
+
+    async def _send(
+        self, url: str, payload: dict, stream: bool = False, params: dict = None
+    ) -> httpx.Response:
+        """POST with retries; with `stream`, returns once headers arrive."""
+        client = self._client or get_http_client()
+        headers = {"x-goog-api-key": self.api_key}
+        last_error = None
+        deadline = asyncio.get_running_loop().time() + self.retry_budget
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                request = client.build_request(
+                    "POST", url, json=payload, headers=headers, params=params
+                )
+                async with get_concurrency_gate():
+                    response = await client.send(request, stream=stream)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    return response
+                last_error = f"HTTP {response.status_code}"
+                await response.aclose()
+            except RETRYABLE_ERRORS as e:
+                last_error = f"{type(e).__name__}: {e}"
+            except httpx.TimeoutException as e:
+                raise AIProviderError(f"Gemini request timed out: {e}") from e
+            except httpx.HTTPStatusError as e:
+                await e.response.aclose()
+                raise AIProviderError(
+                    f"Gemini request failed: HTTP {e.response.status_code}"
+                ) from e
 
-    def _ask_gemini(self, prompt: str) -> str:
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response)
+                if delay > deadline - asyncio.get_running_loop().time():
+                    raise AIProviderError(
+                        f"Gemini unavailable ({last_error}); retry in {delay:.0f}s "
+                        "would exceed the time budget"
+                    )
+                logger.warning(
+                    f"Gemini call failed ({last_error}), retry {attempt + 1} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+        raise AIProviderError(f"Gemini unavailable after retries ({last_error})")
+
+    async def _post(self, url: str, payload: dict) -> httpx.Response:
+        return await self._send(url, payload)
+
+    async def _stream_gemini(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text deltas from Gemini's server-sent-events endpoint."""
         payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        response = requests.post(self.url, json=payload, timeout=60)
-        response.raise_for_status()
+        response = await self._send(
+            self.stream_url, payload, stream=True, params={"alt": "sse"}
+        )
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    chunk = json.loads(line[5:])
+                    parts = chunk["candidates"][0]["content"].get("parts", [])
+                except Exception as e:
+                    logger.error(f"Gemini stream parse error: {e}")
+                    continue
+                text = "".join(part.get("text", "") for part in parts)
+                if text:
+                    yield text
+        except httpx.HTTPError as e:
+            raise AIProviderError(f"Gemini stream interrupted: {e}") from e
+        finally:
+            await response.aclose()
+
+    async def _ask_gemini(self, prompt: str) -> str:
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        response = await self._post(self.url, payload)
         data = response.json()
         try:
             return data["candidates"][0]["content"]["parts"][0]["text"]
         except Exception as e:
             logger.error(f"Gemini response parse error: {e}")
-            return "Sorry, I couldn't understand the AI response."
+            return PARSE_ERROR_MESSAGE
+
+    async def generate_json(self, prompt, schema):
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "responseMimeType": "application/json",
+                "responseSchema": schema,
+            },
+        }
+        response = await self._post(self.url, payload)
+        try:
+            text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
+            return json.loads(text)
+        except Exception as e:
+            raise AIProviderError(f"Gemini returned invalid JSON: {e}") from e
 
-    def generate_project_idea(self, goal, skill_level):
+    async def generate_project_idea(self, goal, skill_level):
         prompt = (
             f"Generate a concise project idea for a {skill_level} learner. "
             f"Goal: {goal}. Include title, short description, and suggested stack."
         )  # ✅ FIXED: Split long line
-        return self._ask_gemini(prompt)
+        return await self._ask_gemini(prompt)
 
-    def generate_roadmap(self, title, goal, duration_weeks, skill_level):
-        prompt = (
+    @staticmethod
+    def _roadmap_prompt(title, goal, duration_weeks, skill_level) -> str:
+        return (
             f"Create a {duration_weeks}-week learning roadmap for project '{title}'. "
             f"Goal: {goal}. Skill level: {skill_level}. "
             f"Include weekly milestones and learning outcomes."
         )  # ✅ FIXED: Split long line
-        return self._ask_gemini(prompt)
 
-    def generate_tasks(self, title, description, roadmap_context=None):
+    async def generate_roadmap(self, title, goal, duration_weeks, skill_level):
+        prompt = self._roadmap_prompt(title, goal, duration_weeks, skill_level)
+        return await self._ask_gemini(prompt)
+
+    async def stream_roadmap(self, title, goal, duration_weeks, skill_level):
+        prompt = self._roadmap_prompt(title, goal, duration_weeks, skill_level)
+        async for chunk in self._stream_gemini(prompt):
+            yield chunk
+
+    async def generate_tasks(self, title, description, roadmap_context=None):
         context = roadmap_context or ""
         prompt = (
             f"Generate clear actionable development tasks for the project '{title}'. "
             f"Description: {description}. Context: {context}"
         )  # ✅ FIXED: Split long line
-        return self._ask_gemini(prompt)
+        return await self._ask_gemini(prompt)
 
-    def answer_question(self, question):
+    async def answer_question(self, question):
         prompt = f"Answer concisely and educationally: {question}"
-        return self._ask_gemini(prompt)
+        return await self._ask_gemini(prompt)
+
+    async def stream_answer(self, question):
+        prompt = f"Answer concisely and educationally: {question}"
+        async for chunk in self._stream_gemini(prompt):
+            yield chunk
 
 
 # -------------------- Mock Provider (for local/dev) --------------------
 class MockAIProvider(AIProvider):
-    def generate_project_idea(self, goal, skill_level):
+    name = "mock"
+    model = "mock"
+
+    async def generate_project_idea(self, goal, skill_level):
         return {
             "title": "Habit Tracker App",
             "description": "A simple app to monitor study sessions and productivity.",
@@ -83,7 +280,7 @@ class MockAIProvider(AIProvider):
             "suggested_stack": ["FastAPI", "PostgreSQL", "React"],
         }
 
-    def generate_roadmap(self, title, goal, duration_weeks, skill_level):
+    async def generate_roadmap(self, title, goal, duration_weeks, skill_level):
         return {
             "roadmap_steps": [
                 f"Week {i+1}: Learn {topic}"
@@ -97,17 +294,64 @@ class MockAIProvider(AIProvider):
             ],
         }
 
-    def generate_tasks(self, title, description, roadmap_context=None):
+    async def generate_tasks(self, title, description, roadmap_context=None):
         return {"tasks": ["Set up backend", "Design UI", "Integrate database"]}
 
-    def answer_question(self, question):
+    async def answer_question(self, question):
         return {"answer": f"This is a mock answer for: {question}"}
 
+    async def generate_json(self, prompt, schema):
+        return _mock_from_schema(schema)
+
+    # Deterministic word-by-word streams (set `stream_delay` to simulate latency)
+    stream_delay = 0.0
+
+    async def _stream_words(self, text: str):
+        for i, word in enumerate(text.split(" ")):
+            if self.stream_delay:
+                await asyncio.sleep(self.stream_delay)
+            yield word if i == 0 else f" {word}"
+
+    async def stream_roadmap(self, title, goal, duration_weeks, skill_level):
+        roadmap = await self.generate_roadmap(title, goal, duration_weeks, skill_level)
+        async for chunk in self._stream_words("\n".join(roadmap["roadmap_steps"])):
+            yield chunk
+
+    async def stream_answer(self, question):
+        answer = (await self.answer_question(question))["answer"]
+        async for chunk in self._stream_words(answer):
+            yield chunk
+
+
+def _mock_from_schema(schema: dict, key: str = "value"):
+    """Deterministic sample value for a Gemini response schema."""
+    kind = str(schema.get("type", "STRING")).upper()
+    if kind == "OBJECT":
+        return {
+            name: _mock_from_schema(sub, name)
+            for name, sub in schema.get("properties", {}).items()
+        }
+    if kind == "ARRAY":
+        return [_mock_from_schema(schema.get("items", {}), key)]
+    if kind in ("NUMBER", "INTEGER"):
+        return 1
+    if kind == "BOOLEAN":
+        return True
+    return f"Mock {key.replace('_', ' ')}."
+
 
 # -------------------- Factory --------------------
-def get_ai_provider() -> AIProvider:
+def get_ai_provider(budgeted: bool = True) -> AIProvider:
     if settings.AI_PROVIDER.lower() == "gemini" and settings.GEMINI_API_KEY:
         logger.info(f"Using Gemini provider ({settings.GEMINI_MODEL})")
-        return GeminiProvider()
-    logger.info("Using Mock AI provider")
-    return MockAIProvider()
+        provider = GeminiProvider()
+    else:
+        logger.info("Using Mock AI provider")
+        provider = MockAIProvider()
+    if not budgeted:
+        return provider
+
+    # Imported here: ai_budget builds on the AIProvider interface above
+    from app.services.ai_budget import BudgetedAIProvider
+
+    return BudgetedAIProvider(provider)
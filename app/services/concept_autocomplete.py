@@ -0,0 +1,286 @@
+import bisect
+import heapq
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Concept, LearningConcept, RoadmapStep, StudySession, UserProgress
+
+logger = logging.getLogger("skillstack.concept_autocomplete")
+
+INDEX_MAX_AGE = 300  # seconds; reload for other processes' writes and popularity
+MAX_SUGGESTIONS = 50
+SHORT_PREFIX = 2  # prefixes this short match many keys; their top-N is memoized
+_KEY_END = "\uffff"  # sorts after any character a key can continue with
+
+Entry = Tuple[str, str, str, str]  # (key, kind, ref, label)
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def parse_tags(tags) -> List[str]:
+    """Concept.tags is comma-separated text, LearningConcept.tags a JSON list."""
+    if not tags:
+        return []
+    items = tags.split(",") if isinstance(tags, str) else tags
+    seen = {}
+    for tag in items:
+        tag = " ".join(str(tag).split())
+        if tag:
+            seen.setdefault(tag.lower(), tag)
+    return list(seen.values())
+
+
+def _keys(label: str) -> List[str]:
+    """The label and every word-aligned tail, so "sql" finds "Advanced SQL"."""
+    words = normalize(label).split()
+    return list(dict.fromkeys(" ".join(words[i:]) for i in range(len(words))))
+
+
+class AutocompleteIndex:
+    """
+    Sorted array of lowercase keys → (kind, ref, label), searched with
+    bisect. Kinds are "concept", "learning_concept" and "tag"; a tag's
+    popularity is the number of concepts carrying it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (sorted keys, entries, tag key → (label, concept count), memo of
+        # short-prefix results), swapped as one tuple so readers never mix
+        # two versions
+        self._snapshot: tuple = ([], [], {}, {})
+        self._docs: Dict[Tuple[str, str], Tuple[str, Tuple[str, ...]]] = {}
+        self._popularity: Dict[Tuple[str, str], int] = {}
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def keys(self) -> List[str]:
+        return self._snapshot[0]
+
+    def __len__(self):
+        return len(self._snapshot[1])
+
+    # ----- building -----
+    def load(self, db: Session):
+        docs, popularity = {}, {}
+
+        usage = dict(
+            db.execute(
+                select(UserProgress.concept_id, func.count()).group_by(
+                    UserProgress.concept_id
+                )
+            ).all()
+        )
+        steps = dict(
+            db.execute(
+                select(RoadmapStep.concept_id, func.count()).group_by(
+                    RoadmapStep.concept_id
+                )
+            ).all()
+        )
+        for c in db.execute(
+            select(Concept.id, Concept.title, Concept.tags).where(
+                Concept.is_active.is_(True)
+            )
+        ):
+            ref = ("concept", str(c.id))
+            docs[ref] = (c.title, tuple(parse_tags(c.tags)))
+            popularity[ref] = usage.get(c.id, 0) + steps.get(c.id, 0)
+
+        sessions = dict(
+            db.execute(
+                select(StudySession.concept_id, func.count()).group_by(
+                    StudySession.concept_id
+                )
+            ).all()
+        )
+        for c in db.execute(
+            select(LearningConcept.id, LearningConcept.name, LearningConcept.tags)
+        ):
+            ref = ("learning_concept", str(c.id))
+            docs[ref] = (c.name, tuple(parse_tags(c.tags)))
+            popularity[ref] = sessions.get(c.id, 0)
+
+        self.build(docs, popularity)
+        logger.info(f"🔤 Autocomplete index loaded ({len(self)} keys)")
+
+    def build(self, docs: dict, popularity: dict):
+        counts: Dict[str, List] = {}
+        entries = []
+        for (kind, ref), (label, doc_tags) in docs.items():
+            entries += [(key, kind, ref, label) for key in _keys(label)]
+            for tag in doc_tags:
+                counts.setdefault(tag.lower(), [tag, 0])[1] += 1
+        tags = {k: tuple(v) for k, v in counts.items()}
+        for tag_key, (label, _) in tags.items():
+            entries += [(key, "tag", tag_key, label) for key in _keys(label)]
+        entries.sort()
+
+        with self._lock:
+            self._docs, self._popularity = dict(docs), dict(popularity)
+            self._snapshot = ([e[0] for e in entries], entries, tags, {})
+            self.loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > INDEX_MAX_AGE:
+            self.load(db)
+
+    # ----- incremental changes (copy-on-write) -----
+    @staticmethod
+    def _insert(keys, entries, kind, ref, label):
+        for key in _keys(label):
+            entry = (key, kind, ref, label)
+            i = bisect.bisect_left(entries, entry)
+            entries.insert(i, entry)
+            keys.insert(i, key)
+
+    @staticmethod
+    def _delete(keys, entries, kind, ref, label):
+        for key in _keys(label):
+            i = bisect.bisect_left(entries, (key, kind, ref, label))
+            if i < len(entries) and entries[i] == (key, kind, ref, label):
+                del entries[i], keys[i]
+
+    def _retag(self, keys, entries, tags, tag, delta):
+        tag_key = tag.lower()
+        label, count = tags.get(tag_key, (tag, 0))
+        count += delta
+        if count > 0 and tag_key not in tags:
+            self._insert(keys, entries, "tag", tag_key, label)
+        elif count <= 0 and tag_key in tags:
+            self._delete(keys, entries, "tag", tag_key, label)
+        if count > 0:
+            tags[tag_key] = (label, count)
+        else:
+            tags.pop(tag_key, None)
+
+    def _apply(self, kind: str, ref: str, doc: Optional[tuple]):
+        with self._lock:
+            keys, entries, tags, _ = self._snapshot
+            keys, entries = list(keys), list(entries)
+            tags = dict(tags)
+            docs = dict(self._docs)
+
+            old = docs.pop((kind, ref), None)
+            if old is not None:
+                self._delete(keys, entries, kind, ref, old[0])
+                for tag in old[1]:
+                    self._retag(keys, entries, tags, tag, -1)
+            if doc is not None:
+                docs[(kind, ref)] = doc
+                self._insert(keys, entries, kind, ref, doc[0])
+                for tag in doc[1]:
+                    self._retag(keys, entries, tags, tag, +1)
+
+            self._docs = docs
+            self._snapshot = (keys, entries, tags, {})
+
+    def upsert(self, kind: str, ref: str, label: str, tags):
+        self._apply(kind, ref, (label, tuple(parse_tags(tags))))
+
+    def remove(self, kind: str, ref: str):
+        self._apply(kind, ref, None)
+
+    # ----- lookup -----
+    def _popularity_of(self, kind: str, ref: str, tags: dict) -> int:
+        if kind == "tag":
+            return tags[ref][1] if ref in tags else 0
+        return self._popularity.get((kind, ref), 0)
+
+    def _ranked(self, prefix: str, keys, entries, tags) -> list:
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + _KEY_END, lo)
+        best = {}
+        for _, kind, ref, label in entries[lo:hi]:
+            best[(kind, ref)] = label
+        return heapq.nsmallest(
+            MAX_SUGGESTIONS,
+            (
+                (-self._popularity_of(kind, ref, tags), label.lower(), kind, ref, label)
+                for (kind, ref), label in best.items()
+            ),
+        )
+
+    def suggest(self, q: str, limit: int = 10) -> List[dict]:
+        """Concepts and tags with a word starting with `q`, most popular first."""
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        keys, entries, tags, top = self._snapshot
+
+        if len(prefix) <= SHORT_PREFIX:
+            ranked = top.get(prefix)
+            if ranked is None:
+                ranked = top[prefix] = self._ranked(prefix, keys, entries, tags)
+        else:
+            ranked = self._ranked(prefix, keys, entries, tags)
+
+        return [
+            {
+                "type": kind,
+                "id": None if kind == "tag" else ref,
+                "label": label,
+                "popularity": -neg_popularity,
+            }
+            for neg_popularity, _, kind, ref, label in ranked[:limit]
+        ]
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+def suggest_concepts(db: Session, q: str, limit: int = 10) -> List[dict]:
+    autocomplete_index.ensure_loaded(db)
+    return autocomplete_index.suggest(q, limit)
+
+
+# -------------------------------------------------------------------
+# 🔁 Incremental updates: apply concept changes once they are committed
+# -------------------------------------------------------------------
+_PENDING_KEY = "concept_autocomplete_changes"
+
+
+def _change(obj) -> Optional[tuple]:
+    if isinstance(obj, Concept):
+        if obj.is_active is False:
+            return ("remove", "concept", str(obj.id))
+        return ("upsert", "concept", str(obj.id), obj.title, obj.tags)
+    if isinstance(obj, LearningConcept):
+        return ("upsert", "learning_concept", str(obj.id), obj.name, obj.tags)
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_autocomplete_changes(session, flush_context):
+    if autocomplete_index.loaded_at is None:
+        return
+    changes = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new.union(session.dirty):
+        change = _change(obj)
+        if change:
+            changes.append(change)
+    for obj in session.deleted:
+        if isinstance(obj, (Concept, LearningConcept)):
+            kind = "concept" if isinstance(obj, Concept) else "learning_concept"
+            changes.append(("remove", kind, str(obj.id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_autocomplete_changes(session):
+    for action, kind, ref, *rest in session.info.pop(_PENDING_KEY, []):
+        if action == "upsert":
+            autocomplete_index.upsert(kind, ref, *rest)
+        else:
+            autocomplete_index.remove(kind, ref)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_autocomplete_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,294 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.models import Concept, LearningConcept, StudySession, UserProgress
+
+logger = logging.getLogger("skillstack.concept_graph")
+
+MASTERY_THRESHOLD = 0.7  # understanding (0–1) at which a concept counts as known
+GRAPH_MAX_AGE = 300  # seconds; reload to pick up changes made by other processes
+
+# Ranking weights
+W_READINESS = 0.4
+W_MOMENTUM = 0.25
+W_UNLOCKS = 0.2
+W_DIFFICULTY = 0.15
+
+
+@dataclass(frozen=True)
+class ConceptNode:
+    id: str
+    name: str
+    category: Optional[str]
+    difficulty: float
+    prerequisites: Tuple[str, ...]  # raw refs: concept ids or names
+
+
+def _node(concept) -> ConceptNode:
+    refs = concept.prerequisites or []
+    if isinstance(refs, str):
+        refs = [refs]
+    return ConceptNode(
+        id=str(concept.id),
+        name=concept.name,
+        category=concept.category,
+        difficulty=float(concept.difficulty_level or 1.0),
+        prerequisites=tuple(str(r).strip() for r in refs if str(r).strip()),
+    )
+
+
+class ConceptGraph:
+    """
+    In-memory prerequisite DAG over learning_concepts.
+    Loaded once per process, updated incrementally from ORM commits and
+    reloaded after GRAPH_MAX_AGE to catch writes from other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.nodes: Dict[str, ConceptNode] = {}
+        self._by_name: Dict[str, str] = {}
+        self._edges: Dict[str, Tuple[str, ...]] = {}  # id → prerequisite ids
+        self._dependents: Dict[str, int] = {}
+        self.loaded_at: Optional[float] = None
+
+    # ----- building -----
+    def load(self, db: Session):
+        concepts = db.query(LearningConcept).all()
+        with self._lock:
+            self.nodes = {str(c.id): _node(c) for c in concepts}
+            self._rebuild()
+            self.loaded_at = time.monotonic()
+        logger.info(f"🧭 Concept graph loaded ({len(self.nodes)} concepts)")
+
+    def ensure_loaded(self, db: Session):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > GRAPH_MAX_AGE:
+            self.load(db)
+
+    # Copy-on-write so rankers holding a snapshot never see a half update
+    def upsert(self, node: ConceptNode):
+        with self._lock:
+            self.nodes = {**self.nodes, node.id: node}
+            self._rebuild()
+
+    def remove(self, concept_id: str):
+        with self._lock:
+            if str(concept_id) in self.nodes:
+                self.nodes = {
+                    cid: n for cid, n in self.nodes.items() if cid != str(concept_id)
+                }
+                self._rebuild()
+
+    def _resolve(self, ref: str) -> Optional[str]:
+        if ref in self.nodes:
+            return ref
+        return self._by_name.get(ref.lower())
+
+    def _rebuild(self):
+        """Resolve refs to ids and drop edges that would close a cycle."""
+        self._by_name = {n.name.lower(): n.id for n in self.nodes.values()}
+        edges = {
+            node_id: tuple(
+                {pid for pid in map(self._resolve, node.prerequisites) if pid}
+                - {node_id}
+            )
+            for node_id, node in self.nodes.items()
+        }
+
+        components = _strongly_connected(edges)
+        cyclic = {node_id for comp in components if len(comp) > 1 for node_id in comp}
+        if cyclic:
+            logger.warning(
+                f"⚠️ Prerequisite cycle among {len(cyclic)} concepts; "
+                "ignoring their in-cycle prerequisites"
+            )
+            component_of = {n: i for i, comp in enumerate(components) for n in comp}
+            edges = {
+                node_id: tuple(
+                    p for p in prereqs if component_of[p] != component_of[node_id]
+                )
+                for node_id, prereqs in edges.items()
+            }
+
+        counts = {node_id: 0 for node_id in edges}
+        for prereqs in edges.values():
+            for pid in prereqs:
+                counts[pid] += 1
+        self._edges, self._dependents = edges, counts
+
+    # ----- ranking -----
+    def rank(self, mastery: Dict[str, float], k: int = 5) -> List[dict]:
+        """
+        Rank concepts the learner has not mastered but whose prerequisites
+        are all mastered. `mastery` maps concept id → 0–1 understanding.
+        """
+        with self._lock:
+            nodes, edges, dependents = self.nodes, self._edges, self._dependents
+
+        mastered = {cid for cid, score in mastery.items() if score >= MASTERY_THRESHOLD}
+        known = [nodes[cid].difficulty for cid in mastered if cid in nodes]
+        target_difficulty = (sum(known) / len(known) + 0.5) if known else 1.0
+        max_unlocks = max(dependents.values(), default=0) or 1
+
+        ranked = []
+        for cid, node in nodes.items():
+            if cid in mastered or not all(p in mastered for p in edges[cid]):
+                continue
+            prereqs = edges[cid]
+            readiness = (
+                sum(min(1.0, mastery.get(p, 0.0)) for p in prereqs) / len(prereqs)
+                if prereqs
+                else 1.0
+            )
+            momentum = min(1.0, mastery.get(cid, 0.0) / MASTERY_THRESHOLD)
+            unlocks = math.log1p(dependents[cid]) / math.log1p(max_unlocks)
+            difficulty_fit = 1.0 / (1.0 + abs(node.difficulty - target_difficulty))
+            score = (
+                W_READINESS * readiness
+                + W_MOMENTUM * momentum
+                + W_UNLOCKS * unlocks
+                + W_DIFFICULTY * difficulty_fit
+            )
+            ranked.append(
+                {
+                    "concept_id": cid,
+                    "title": node.name,
+                    "category": node.category,
+                    "difficulty": node.difficulty,
+                    "score": round(score, 4),
+                    "unlocks": dependents[cid],
+                    "in_progress": momentum > 0,
+                }
+            )
+
+        ranked.sort(key=lambda c: (-c["score"], c["title"].lower()))
+        return ranked[:k]
+
+
+def _strongly_connected(edges: Dict[str, Tuple[str, ...]]) -> List[List[str]]:
+    """Tarjan's SCC algorithm (iterative, so deep chains don't hit recursion)."""
+    index, low, on_stack, stack, components = {}, {}, set(), [], []
+    counter = 0
+    for root in edges:
+        if root in index:
+            continue
+        work = [(root, iter(edges[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node_id, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges[child])))
+                    break
+                if child in on_stack:
+                    low[node_id] = min(low[node_id], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node_id])
+                if low[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+    return components
+
+
+concept_graph = ConceptGraph()
+
+
+# -------------------------------------------------------------------
+# 👤 Learner state (two grouped queries)
+# -------------------------------------------------------------------
+def _clamp(score) -> float:
+    return max(0.0, min(1.0, float(score or 0.0)))
+
+
+def load_mastery(db: Session, user_id) -> Dict[str, float]:
+    """Best understanding per learning concept from sessions and progress."""
+    mastery = {
+        str(concept_id): _clamp(best)
+        for concept_id, best in db.query(
+            StudySession.concept_id, func.max(StudySession.understanding_score)
+        )
+        .filter(StudySession.user_id == user_id)
+        .group_by(StudySession.concept_id)
+    }
+
+    # Roadmap progress is tracked on `concepts`; match learning concepts by name
+    progress = (
+        db.query(
+            func.lower(Concept.title),
+            func.max(UserProgress.progress_percent),
+            func.bool_or(UserProgress.completed),
+        )
+        .join(Concept, Concept.id == UserProgress.concept_id)
+        .filter(UserProgress.user_id == user_id)
+        .group_by(func.lower(Concept.title))
+    )
+    for title, percent, completed in progress:
+        concept_id = concept_graph._by_name.get(title)
+        if concept_id:
+            score = 1.0 if completed else _clamp((percent or 0) / 100)
+            mastery[concept_id] = max(mastery.get(concept_id, 0.0), score)
+    return mastery
+
+
+def rank_next_concepts(db: Session, user_id, k: int = 5) -> List[dict]:
+    concept_graph.ensure_loaded(db)
+    return concept_graph.rank(load_mastery(db, user_id), k=k)
+
+
+# -------------------------------------------------------------------
+# 🔁 Incremental updates: apply concept changes once they are committed
+# -------------------------------------------------------------------
+_PENDING_KEY = "concept_graph_changes"
+
+
+def _queue_change(session: Session, change):
+    session.info.setdefault(_PENDING_KEY, []).append(change)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_concept_changes(session, flush_context):
+    if concept_graph.loaded_at is None:
+        return
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, LearningConcept):
+            _queue_change(session, ("upsert", _node(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, LearningConcept):
+            _queue_change(session, ("remove", str(obj.id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_concept_changes(session):
+    for action, payload in session.info.pop(_PENDING_KEY, []):
+        if action == "upsert":
+            concept_graph.upsert(payload)
+        else:
+            concept_graph.remove(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_concept_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,187 @@
+import json
+import logging
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Concept, Roadmap, RoadmapStep, UserProgress
+
+logger = logging.getLogger("skillstack.ai.context")
+
+CONTEXT_CACHE_PREFIX = "ai:context"
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for budgeting prompts
+MAX_ROADMAPS = 5
+MAX_ITEMS_PER_LIST = 15
+MAX_TITLE_LENGTH = 60
+
+# Least useful information is dropped first when over budget
+TRIM_ORDER = ("done", "next", "in_progress")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _clip(text) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= MAX_TITLE_LENGTH else text[: MAX_TITLE_LENGTH - 1] + "…"
+
+
+def estimate_tokens(value) -> int:
+    return len(_dumps(value)) // CHARS_PER_TOKEN + 1
+
+
+# -------------------------------------------------------------------
+# 🔎 One query: the user's most recently active roadmaps, their steps
+# and the user's (aggregated) progress on each step's concept
+# -------------------------------------------------------------------
+def _context_query(user_id):
+    progress = (
+        select(
+            UserProgress.roadmap_id,
+            UserProgress.concept_id,
+            func.max(UserProgress.progress_percent).label("percent"),
+            func.bool_or(UserProgress.completed).label("completed"),
+            func.max(UserProgress.last_updated).label("touched"),
+        )
+        .where(UserProgress.user_id == user_id)
+        .group_by(UserProgress.roadmap_id, UserProgress.concept_id)
+        .cte("progress")
+    )
+    active = (
+        select(progress.c.roadmap_id, func.max(progress.c.touched).label("touched"))
+        .group_by(progress.c.roadmap_id)
+        .order_by(func.max(progress.c.touched).desc())
+        .limit(MAX_ROADMAPS)
+        .cte("active_roadmaps")
+    )
+    return (
+        select(
+            Roadmap.id.label("roadmap_id"),
+            Roadmap.title.label("roadmap_title"),
+            func.coalesce(Concept.title, RoadmapStep.title).label("title"),
+            RoadmapStep.completed.label("step_completed"),
+            progress.c.percent,
+            progress.c.completed,
+        )
+        .select_from(active)
+        .join(Roadmap, Roadmap.id == active.c.roadmap_id)
+        .join(RoadmapStep, RoadmapStep.roadmap_id == Roadmap.id)
+        .outerjoin(Concept, Concept.id == RoadmapStep.concept_id)
+        .outerjoin(
+            progress,
+            and_(
+                progress.c.roadmap_id == RoadmapStep.roadmap_id,
+                progress.c.concept_id == RoadmapStep.concept_id,
+            ),
+        )
+        .order_by(active.c.touched.desc(), Roadmap.id, RoadmapStep.position)
+    )
+
+
+# -------------------------------------------------------------------
+# 🗜️ Compaction + token budget
+# -------------------------------------------------------------------
+def compact_context(rows) -> dict:
+    """Group rows per roadmap into done / in-progress / next, deduplicated."""
+    roadmaps, seen = {}, {}
+    for row in rows:
+        entry = roadmaps.setdefault(
+            row.roadmap_id,
+            {
+                "roadmap": _clip(row.roadmap_title),
+                "in_progress": [],
+                "next": [],
+                "done": [],
+            },
+        )
+        title = _clip(row.title)
+        titles = seen.setdefault(row.roadmap_id, set())
+        if not title or title.lower() in titles:
+            continue
+        titles.add(title.lower())
+
+        if row.completed or row.step_completed:
+            entry["done"].append(title)
+        elif row.percent:
+            entry["in_progress"].append(f"{title} ({round(row.percent)}%)")
+        else:
+            entry["next"].append(title)
+
+    for entry in roadmaps.values():
+        # Recent completions and the nearest upcoming steps matter most
+        entry["done"] = entry["done"][-MAX_ITEMS_PER_LIST:]
+        entry["next"] = entry["next"][:MAX_ITEMS_PER_LIST]
+        entry["in_progress"] = entry["in_progress"][:MAX_ITEMS_PER_LIST]
+    return {"roadmaps": list(roadmaps.values())}
+
+
+def truncate_to_budget(context: dict, token_budget: int) -> dict:
+    """Drop the least useful items until the serialized context fits."""
+    roadmaps = context["roadmaps"]
+    omitted = 0
+
+    for field in TRIM_ORDER:
+        while estimate_tokens(context) > token_budget:
+            candidates = [r for r in roadmaps if r[field]]
+            if not candidates:
+                break
+            # Trim the longest list, preferring the least recently active roadmap
+            target = max(reversed(candidates), key=lambda r: len(r[field]))
+            target[field].pop(0 if field == "done" else -1)
+            omitted += 1
+            context["omitted"] = omitted
+
+    while estimate_tokens(context) > token_budget and len(roadmaps) > 1:
+        roadmaps.pop()
+        context["omitted"] = omitted = omitted + 1
+    return context
+
+
+# -------------------------------------------------------------------
+# 🧠 Cached builder
+# -------------------------------------------------------------------
+def _redis():
+    # Imported lazily: app.core.cache connects to Redis at import time.
+    from app.core.cache import get_redis
+
+    return get_redis()
+
+
+def _cache_key(user_id) -> str:
+    return f"{CONTEXT_CACHE_PREFIX}:{user_id}"
+
+
+def build_learning_context(db: Session, user_id, token_budget: int = None) -> str:
+    """Compact JSON summary of a user's learning state, bounded in size."""
+    rows = db.execute(_context_query(user_id)).all()
+    context = truncate_to_budget(
+        compact_context(rows), token_budget or settings.AI_CONTEXT_TOKEN_BUDGET
+    )
+    return _dumps(context)
+
+
+def get_learning_context(db: Session, user_id) -> str:
+    """Cached per user; invalidated whenever the user's progress changes."""
+    key = _cache_key(user_id)
+    try:
+        cached = _redis().get(key)
+        if cached:
+            return cached
+    except Exception as e:
+        logger.warning(f"Learning context cache read failed: {e}")
+
+    context = build_learning_context(db, user_id)
+    try:
+        _redis().setex(key, settings.AI_CONTEXT_CACHE_TTL, context)
+    except Exception as e:
+        logger.warning(f"Learning context cache write failed: {e}")
+    return context
+
+
+def invalidate_learning_context(user_id):
+    try:
+        _redis().delete(_cache_key(user_id))
+    except Exception as e:
+        logger.warning(f"Learning context invalidation failed for {user_id}: {e}")
@@ -1,41 +1,65 @@
-import google.generativeai as genai
+import json
+import logging
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import publish_event_async, user_topic
 from app.models import StudySession
-from app.services.notifications import create_notification, generate_ai_reflection
+from app.services.ai_budget import ai_user
+from app.services.ai_bundle import BundleAsk, run_prompt_bundle
+from app.services.ai_service import get_ai_provider
+from app.services.notifications import create_notifications
 from app.services.progress_engine import update_user_progress
 
-genai.configure(api_key=settings.GEMINI_API_KEY)
+logger = logging.getLogger("skillstack.learning")
 
+ai = get_ai_provider()
 
-def ai_suggest_next_concept(user_id: str, recent_sessions: list):
-    """Use Gemini 2.5 Flash to suggest what the learner should study next."""
-    prompt = f"""
-    You are a personalized study planner.
-    The user recently worked on these concepts: {recent_sessions}.
-    Suggest ONE specific next concept or topic to study, and why.
-    Keep it concise (<50 words).
-    """
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    res = model.generate_content(prompt)
-    return res.text.strip()
+# Degraded answers used when an LLM call fails or exceeds its time budget
+REFLECTION_FALLBACK = (
+    "Nice work showing up for another session! Review what felt hardest today "
+    "and keep the same steady rhythm tomorrow."
+)
+NEXT_STEP_FALLBACK = (
+    "Revisit today's concept with a short exercise, then continue with the next "
+    "step on your roadmap."
+)
 
+# Both asks share the same session context, so they go out as one request
+LOOP_ASKS = [
+    BundleAsk(
+        key="reflection",
+        instruction="A short motivational reflection (under 80 words) with one "
+        "key improvement area, one strength and a positive next-step suggestion.",
+        fallback=REFLECTION_FALLBACK,
+    ),
+    BundleAsk(
+        key="next_concept",
+        instruction="ONE specific next concept or topic to study, and why "
+        "(under 50 words).",
+        fallback=NEXT_STEP_FALLBACK,
+    ),
+]
 
-def run_learning_loop(
+
+# -------------------------------------------------------------------
+# 1️⃣ Synchronous part: progress + recent session context
+# -------------------------------------------------------------------
+def record_study_session(
     db: Session,
     user_id: str,
     concept_id: str,
     duration_minutes: int,
     understanding_score: float,
 ):
-    """Main orchestrator: updates progress, reflection, and next-step suggestion."""
-    # 1️⃣  Update progress + XP
+    """Update progress + XP and return it with the recent-session context."""
     result = update_user_progress(
         db, user_id, concept_id, duration_minutes, understanding_score
     )
 
-    # 2️⃣  Collect recent sessions
     recent_sessions = (
         db.query(StudySession)
         .filter(StudySession.user_id == user_id)
@@ -51,21 +75,101 @@ def run_learning_loop(
         }
         for s in recent_sessions
     ]
+    return result, session_data
 
-    # 3️⃣  AI reflection
-    reflection = generate_ai_reflection(user_id, session_data)
 
-    # 4️⃣  AI next suggestion
-    next_concept = ai_suggest_next_concept(user_id, session_data)
+# -------------------------------------------------------------------
+# 2️⃣ AI part: reflection + next concept in one structured request
+# -------------------------------------------------------------------
+async def generate_loop_insights(user_id: str, session_data: list) -> dict:
+    """Ask for reflection and next-concept suggestion in a single LLM call."""
+    ai_user.set(str(user_id))
+    context = (
+        "You are a learning coach and study planner. The user's most recent "
+        f"study sessions: {json.dumps(session_data, separators=(',', ':'))}"
+    )
+    result = await run_prompt_bundle(
+        ai, context, LOOP_ASKS, timeout=settings.LEARNING_AI_TIMEOUT
+    )
+    if result.degraded:
+        logger.warning(f"⚠️ Learning loop insights degraded: {result.errors}")
+    return {
+        "reflection": result.values["reflection"],
+        "next_suggestion": result.values["next_concept"],
+        "ai_status": "degraded" if result.degraded else "ready",
+    }
 
-    # 5️⃣  Save as notifications
-    create_notification(db, user_id, "Study Reflection", reflection)
-    create_notification(db, user_id, "Next Recommended Step", next_concept)
 
-    return {
+def save_loop_insights(db: Session, user_id: str, insights: dict):
+    """Persist both AI outputs as notifications in one commit."""
+    create_notifications(
+        db,
+        user_id,
+        [
+            ("Study Reflection", insights["reflection"]),
+            ("Next Recommended Step", insights["next_suggestion"]),
+        ],
+    )
+
+
+async def deliver_loop_insights(user_id: str, session_data: list):
+    """
+    Background delivery for clients that opted in to async AI results:
+    generate, store as notifications and push over the user's WebSocket topic.
+    """
+    insights = await generate_loop_insights(user_id, session_data)
+
+    def _persist():
+        with SessionLocal() as db:
+            save_loop_insights(db, user_id, insights)
+
+    try:
+        await run_in_threadpool(_persist)
+    except Exception as e:
+        logger.error(f"❌ Could not store learning insights for {user_id}: {e}")
+    await publish_event_async(user_topic(user_id), "learning.insights", insights)
+
+
+# -------------------------------------------------------------------
+# 🔁 Orchestrator
+# -------------------------------------------------------------------
+async def run_learning_loop(
+    db: Session,
+    user_id: str,
+    concept_id: str,
+    duration_minutes: int,
+    understanding_score: float,
+    defer_ai: bool = False,
+    background_tasks=None,
+):
+    """
+    Update progress, then produce reflection + next-step suggestion.
+    With `defer_ai`, returns right after the progress update and delivers the
+    AI outputs later via notification + WebSocket ("learning.insights").
+    """
+    result, session_data = await run_in_threadpool(
+        record_study_session,
+        db,
+        user_id,
+        concept_id,
+        duration_minutes,
+        understanding_score,
+    )
+    response = {
         "progress": result["progress"],
         "xp_gained": result["xp_gained"],
         "streak": result["streak"],
-        "reflection": reflection,
-        "next_suggestion": next_concept,
     }
+
+    if defer_ai and background_tasks is not None:
+        background_tasks.add_task(deliver_loop_insights, user_id, session_data)
+        return {
+            **response,
+            "reflection": None,
+            "next_suggestion": None,
+            "ai_status": "pending",
+        }
+
+    insights = await generate_loop_insights(user_id, session_data)
+    await run_in_threadpool(save_loop_insights, db, user_id, insights)
+    return {**response, **insights}
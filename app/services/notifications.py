@@ -1,13 +1,17 @@
+import json
 from datetime import datetime, timedelta
 
-import google.generativeai as genai
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.notification import Notification
 from app.models.study_session import StudySession
+from app.services.ai_budget import ai_user
+from app.services.ai_bundle import BundleAsk, run_prompt_bundle
+from app.services.ai_service import get_ai_provider
 
-genai.configure(api_key=settings.GEMINI_API_KEY)
+ai = get_ai_provider()
 
 
 def create_notification(db: Session, user_id: str, title: str, message: str):
@@ -19,26 +23,32 @@ def create_notification(db: Session, user_id: str, title: str, message: str):
     return notif
 
 
-def generate_ai_reflection(user_id: str, recent_sessions: list):
-    """Use Gemini 2.5 Flash to analyze recent study sessions."""
-    prompt = f"""
-    You are a learning coach analyzing this user's last few study sessions:
-    {recent_sessions}
+def create_notifications(db: Session, user_id: str, items: list):
+    """Store several (title, message) notifications with a single commit."""
+    notifs = [
+        Notification(user_id=user_id, title=title, message=message, is_read=False)
+        for title, message in items
+    ]
+    db.add_all(notifs)
+    db.commit()
+    return notifs
 
-    Write a short motivational reflection summary (under 80 words).
-    Include:
-    - Key improvement area
-    - One strength
-    - A positive next-step suggestion
-    """
 
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    response = model.generate_content(prompt)
-    return response.text.strip()
+SUMMARY_FALLBACK = (
+    "You put in focused study time today. Look back at the topic that felt "
+    "hardest and give it a quick review tomorrow."
+)
 
+SUMMARY_ASK = BundleAsk(
+    key="summary",
+    instruction="A short motivational reflection on the last day of study "
+    "(under 80 words) covering one improvement area, one strength and a "
+    "positive next-step suggestion.",
+    fallback=SUMMARY_FALLBACK,
+)
 
-def send_study_summary(db: Session, user_id: str):
-    """AI-generated reflection and milestone notification."""
+
+def _recent_session_data(db: Session, user_id: str):
     one_day_ago = datetime.utcnow() - timedelta(hours=24)
     recent_sessions = (
         db.query(StudySession)
@@ -48,11 +58,8 @@ def send_study_summary(db: Session, user_id: str):
         .all()
     )
 
-    if not recent_sessions:
-        return None
-
     # Format for AI input
-    session_data = [
+    return [
         {
             "concept_id": str(s.concept_id),
             "duration": s.duration_minutes,
@@ -62,5 +69,25 @@ def send_study_summary(db: Session, user_id: str):
         for s in recent_sessions
     ]
 
-    ai_message = generate_ai_reflection(user_id, session_data)
-    return create_notification(db, user_id, "Daily Learning Reflection", ai_message)
+
+async def send_study_summary(db: Session, user_id: str):
+    """AI-generated reflection and milestone notification."""
+    ai_user.set(str(user_id))
+    session_data = await run_in_threadpool(_recent_session_data, db, user_id)
+    if not session_data:
+        return None
+
+    context = (
+        "You are a learning coach analyzing this user's study sessions from "
+        f"the last 24 hours: {json.dumps(session_data, separators=(',', ':'))}"
+    )
+    result = await run_prompt_bundle(
+        ai, context, [SUMMARY_ASK], timeout=settings.LEARNING_AI_TIMEOUT
+    )
+    return await run_in_threadpool(
+        create_notification,
+        db,
+        user_id,
+        "Daily Learning Reflection",
+        result.values["summary"],
+    )
@@ -1,13 +1,22 @@
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.models import StudySession, UserProgress
+from app.models import StudySession, UserProgress, UserStats
+from app.models.user_progress import PROGRESS_UNIQUE_CONSTRAINT
+from app.services.learning_context import invalidate_learning_context
 
 XP_PER_MINUTE = 2
 STREAK_INTERVAL_HOURS = 36  # 1.5 days
 
 
+class ProgressNotFound(LookupError):
+    """No progress row for the concept, and no roadmap to create one under."""
+
+
 def calculate_xp(duration_minutes: int, understanding_score: float):
     """XP = time * score weight."""
     base_xp = duration_minutes * XP_PER_MINUTE
@@ -15,46 +24,144 @@ def calculate_xp(duration_minutes: int, understanding_score: float):
     return round(base_xp * multiplier, 2)
 
 
+def next_streak(current: int, last_session_at, now: datetime) -> int:
+    """Streak after a session at `now` (same rule as the SQL upsert below)."""
+    if last_session_at is None:
+        return 1
+    if last_session_at.date() == now.date():
+        return max(current, 1)
+    if now - last_session_at <= timedelta(hours=STREAK_INTERVAL_HOURS):
+        return current + 1
+    return 1
+
+
+def progress_gain(understanding_score: float) -> float:
+    """Progress percent earned by one session (capped at 100 by callers)."""
+    return 30 * understanding_score
+
+
+def record_session_stats(db: Session, user_id, xp: float, at: datetime = None):
+    """
+    Add `xp` and advance the streak in one upsert. Runs in the caller's
+    transaction; returns (total_xp, current_streak, longest_streak).
+    """
+    at = at or datetime.now(timezone.utc)
+    stats = UserStats.__table__
+    last = stats.c.last_session_at
+    streak = case(
+        (last.is_(None), 1),
+        (func.date(last) == func.date(at), func.greatest(stats.c.current_streak, 1)),
+        (
+            last >= at - timedelta(hours=STREAK_INTERVAL_HOURS),
+            stats.c.current_streak + 1,
+        ),
+        else_=1,
+    )
+    stmt = (
+        insert(stats)
+        .values(
+            user_id=user_id,
+            total_xp=xp,
+            current_streak=1,
+            longest_streak=1,
+            last_session_at=at,
+        )
+        .on_conflict_do_update(
+            index_elements=[stats.c.user_id],
+            set_={
+                "total_xp": stats.c.total_xp + xp,
+                "current_streak": streak,
+                "longest_streak": func.greatest(stats.c.longest_streak, streak),
+                "last_session_at": func.greatest(last, at),
+                "updated_at": func.now(),
+            },
+        )
+        .returning(stats.c.total_xp, stats.c.current_streak, stats.c.longest_streak)
+    )
+    return tuple(db.execute(stmt).one())
+
+
+# -------------------------------------------------------------------
+# 📈 Progress writes (one statement each; increment computed in SQL)
+# -------------------------------------------------------------------
+def _bumped_percent(gain: float):
+    return func.least(100.0, func.coalesce(UserProgress.progress_percent, 0.0) + gain)
+
+
+def apply_progress_gain(
+    db: Session, user_id, concept_id, gain: float, roadmap_id=None
+) -> list:
+    """
+    Add `gain` percent (capped at 100) to the user's progress on a concept.
+    With `roadmap_id` the row is upserted on (user, roadmap, concept);
+    without it every existing row for the concept is bumped in place.
+    Returns the written UserProgress rows.
+    """
+    if roadmap_id is not None:
+        stmt = (
+            insert(UserProgress)
+            .values(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                roadmap_id=roadmap_id,
+                concept_id=concept_id,
+                progress_percent=min(100.0, gain),
+                completed=gain >= 100.0,
+                notes={},
+            )
+            .on_conflict_do_update(
+                constraint=PROGRESS_UNIQUE_CONSTRAINT,
+                set_={
+                    "progress_percent": _bumped_percent(gain),
+                    "completed": UserProgress.completed.is_(True)
+                    | (_bumped_percent(gain) >= 100.0),
+                    "last_updated": func.now(),
+                },
+            )
+        )
+    else:
+        stmt = (
+            update(UserProgress)
+            .where(
+                UserProgress.user_id == user_id,
+                UserProgress.concept_id == concept_id,
+            )
+            .values(
+                progress_percent=_bumped_percent(gain),
+                completed=UserProgress.completed.is_(True)
+                | (_bumped_percent(gain) >= 100.0),
+            )
+        )
+    return list(
+        db.scalars(
+            stmt.returning(UserProgress),
+            execution_options={"populate_existing": True},
+        )
+    )
+
+
 def update_user_progress(
     db: Session,
     user_id: str,
     concept_id: str,
     duration_minutes: int,
     understanding_score: float,
+    roadmap_id=None,
 ):
-    """Update progress and calculate XP/streak."""
-    progress = (
-        db.query(UserProgress)
-        .filter(UserProgress.user_id == user_id, UserProgress.concept_id == concept_id)
-        .first()
+    """
+    Update progress and calculate XP/streak. Raises ProgressNotFound, with
+    nothing recorded, when there is no row to update and no `roadmap_id`.
+    """
+    entries = apply_progress_gain(
+        db, user_id, concept_id, progress_gain(understanding_score), roadmap_id
     )
+    if not entries:
+        db.rollback()
+        raise ProgressNotFound("No progress record found for this concept")
 
-    if not progress:
-        progress = UserProgress(
-            user_id=user_id, concept_id=concept_id, progress=0.0, completed=False
-        )
-        db.add(progress)
-
-    # Increase progress
-    gain = min(0.3 * understanding_score, 1.0 - progress.progress)
-    progress.progress += gain
-    if progress.progress >= 1.0:
-        progress.completed = True
-
-    # Compute XP and streaks
+    # XP and streak come from the running aggregates, not a session scan
     xp_gained = calculate_xp(duration_minutes, understanding_score)
-    now = datetime.utcnow()
-    last_session = (
-        db.query(StudySession)
-        .filter(StudySession.user_id == user_id)
-        .order_by(StudySession.created_at.desc())
-        .first()
-    )
-    streak = 1
-    if last_session:
-        delta = now - last_session.created_at
-        if delta < timedelta(hours=STREAK_INTERVAL_HOURS):
-            streak += 1
+    total_xp, streak, longest_streak = record_session_stats(db, user_id, xp_gained)
 
     # Save updated study session
     new_session = StudySession(
@@ -65,12 +172,159 @@ def update_user_progress(
         reflection_notes=f"XP gained: {xp_gained}, streak: {streak}",
     )
     db.add(new_session)
+    percent = max((e.progress_percent for e in entries), default=0.0)
+    completed = any(e.completed for e in entries)
     db.commit()
-    db.refresh(progress)
+    invalidate_learning_context(user_id)
 
     return {
-        "progress": round(progress.progress, 2),
-        "completed": progress.completed,
+        "progress": round(percent / 100, 2),
+        "progress_percent": round(percent, 2),
+        "completed": completed,
         "xp_gained": xp_gained,
         "streak": streak,
+        "longest_streak": longest_streak,
+        "total_xp": round(total_xp, 2),
+        "entries": entries,
+    }
+
+
+# -------------------------------------------------------------------
+# 📦 Batch ingestion (offline clients replaying queued sessions)
+# -------------------------------------------------------------------
+def _as_utc(moment: datetime, now: datetime) -> datetime:
+    if moment is None:
+        return now
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return min(moment, now)  # client clocks can run ahead
+
+
+def fold_session_stats(stats: dict, sessions: list) -> dict:
+    """
+    Apply sessions (sorted by time) to {total_xp, current_streak,
+    longest_streak, last_session_at} in one pass. Sessions older than the
+    last recorded one still earn XP but can't rewrite the streak history.
+    """
+    stats = dict(stats)
+    for session in sessions:
+        stats["total_xp"] += session["xp"]
+        last = stats["last_session_at"]
+        if last is not None and session["at"] < last:
+            continue
+        stats["current_streak"] = next_streak(
+            stats["current_streak"], last, session["at"]
+        )
+        stats["longest_streak"] = max(stats["longest_streak"], stats["current_streak"])
+        stats["last_session_at"] = session["at"]
+    return stats
+
+
+def ingest_study_sessions(db: Session, user_id, items: list) -> dict:
+    """
+    Store a batch of sessions idempotently (by client_id) with one multi-row
+    insert, then apply XP/streak once and one progress update per concept.
+    Sessions on concepts the user has no progress row for are rejected:
+    neither stored nor counted.
+    """
+    now = datetime.now(timezone.utc)
+    unique = {}
+    for item in items:
+        unique.setdefault(item.client_id, item)
+    tracked = set(
+        db.scalars(
+            select(UserProgress.concept_id)
+            .where(
+                UserProgress.user_id == user_id,
+                UserProgress.concept_id.in_({i.concept_id for i in unique.values()}),
+            )
+            .distinct()
+        )
+    )
+    rejected = [i.client_id for i in unique.values() if i.concept_id not in tracked]
+    rows = sorted(
+        (
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "client_id": item.client_id,
+                "concept_id": item.concept_id,
+                "duration_minutes": item.duration_minutes,
+                "understanding_score": item.understanding_score,
+                "reflection_notes": item.reflection_notes,
+                "created_at": _as_utc(item.studied_at, now),
+            }
+            for item in unique.values()
+            if item.concept_id in tracked
+        ),
+        key=lambda r: r["created_at"],
+    )
+
+    sessions = StudySession.__table__
+    inserted = set()
+    if rows:
+        inserted = set(
+            db.execute(
+                insert(sessions)
+                .values(rows)
+                .on_conflict_do_nothing(
+                    index_elements=[sessions.c.user_id, sessions.c.client_id]
+                )
+                .returning(sessions.c.client_id)
+            ).scalars()
+        )
+    new_rows = [r for r in rows if r["client_id"] in inserted]
+
+    # XP + streaks: lock the aggregate row, fold the batch, write it back once
+    xp_rows = [
+        {
+            "xp": calculate_xp(r["duration_minutes"], r["understanding_score"]),
+            "at": r["created_at"],
+        }
+        for r in new_rows
+    ]
+    stats_table = UserStats.__table__
+    db.execute(
+        insert(stats_table)
+        .values(user_id=user_id, total_xp=0.0, current_streak=0, longest_streak=0)
+        .on_conflict_do_nothing(index_elements=[stats_table.c.user_id])
+    )
+    stats = (
+        db.query(UserStats).filter(UserStats.user_id == user_id).with_for_update().one()
+    )
+    folded = fold_session_stats(
+        {
+            "total_xp": stats.total_xp,
+            "current_streak": stats.current_streak,
+            "longest_streak": stats.longest_streak,
+            "last_session_at": stats.last_session_at,
+        },
+        xp_rows,
+    )
+    for field, value in folded.items():
+        setattr(stats, field, value)
+
+    # Progress: sum the gains per concept, one capped write per concept
+    gains = {}
+    for r in new_rows:
+        gains[r["concept_id"]] = gains.get(r["concept_id"], 0.0) + progress_gain(
+            r["understanding_score"]
+        )
+    progress = []
+    for concept_id, gain in gains.items():
+        progress += apply_progress_gain(db, user_id, concept_id, gain)
+
+    db.commit()
+    if new_rows:
+        invalidate_learning_context(user_id)
+
+    return {
+        "accepted": [r["client_id"] for r in new_rows],
+        "duplicates": [r["client_id"] for r in rows if r["client_id"] not in inserted],
+        "rejected": rejected,
+        "xp_gained": round(sum(x["xp"] for x in xp_rows), 2),
+        "total_xp": round(folded["total_xp"], 2),
+        "current_streak": folded["current_streak"],
+        "longest_streak": folded["longest_streak"],
+        "progress": progress,
     }
@@ -0,0 +1,99 @@
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import String, cast, exists, func, literal, null, or_, select, union_all
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.models import Concept, Project, ProjectMember, Roadmap, Task
+
+# Must match the configuration the search_vector triggers were created with
+SEARCH_CONFIG = "english"
+SEARCH_TYPES = ("task", "project", "roadmap", "concept")
+MAX_QUERY_TERMS = 8
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+_NO_PROJECT = cast(null(), UUID(as_uuid=True))
+
+
+def build_tsquery(q: str) -> Optional[str]:
+    """
+    Turn free text into a to_tsquery() expression: every word must match,
+    and the last one also as a prefix so results appear while typing.
+    Only word characters survive, so user input can't inject tsquery syntax.
+    """
+    terms = _TERM.findall((q or "").lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+
+
+def _can_see_project(user_id):
+    member = exists().where(
+        ProjectMember.project_id == Project.id,
+        ProjectMember.user_id == user_id,
+        ProjectMember.status == "active",
+    )
+    return or_(Project.owner_id == user_id, member)
+
+
+def _ranked(kind: str, model, title, project_id, query):
+    return select(
+        literal(kind).label("type"),
+        model.id.label("id"),
+        cast(title, String).label("title"),
+        project_id.label("project_id"),
+        func.ts_rank(model.search_vector, query).label("rank"),
+    ).where(model.search_vector.op("@@")(query))
+
+
+def search_all(
+    db: Session,
+    user_id,
+    q: str,
+    types: Iterable[str] = SEARCH_TYPES,
+    limit: int = 20,
+) -> list:
+    """
+    Ranked matches across the requested entity types, visible to the user.
+    Each branch is a GIN lookup on its table's search_vector; visibility is
+    part of the same statement, so nothing is filtered in Python.
+    """
+    expression = build_tsquery(q)
+    if expression is None:
+        return []
+    query = func.to_tsquery(SEARCH_CONFIG, expression)
+
+    branches = []
+    if "task" in types:
+        branches.append(
+            _ranked("task", Task, Task.title, Task.project_id, query)
+            .join(Project, Project.id == Task.project_id)
+            .where(_can_see_project(user_id))
+        )
+    if "project" in types:
+        branches.append(
+            _ranked("project", Project, Project.name, Project.id, query).where(
+                _can_see_project(user_id)
+            )
+        )
+    if "roadmap" in types:
+        branches.append(
+            _ranked("roadmap", Roadmap, Roadmap.title, _NO_PROJECT, query).where(
+                or_(Roadmap.is_public.is_(True), Roadmap.owner_id == user_id)
+            )
+        )
+    if "concept" in types:
+        branches.append(
+            _ranked("concept", Concept, Concept.title, _NO_PROJECT, query).where(
+                Concept.is_active.is_(True)
+            )
+        )
+    if not branches:
+        return []
+
+    matches = union_all(*branches).subquery()
+    rows = db.execute(
+        select(matches).order_by(matches.c.rank.desc(), matches.c.title).limit(limit)
+    ).all()
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,95 @@
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Concept, Project, Tag, concept_tags, project_tags
+from app.models.tag import TAG_MAX_LENGTH
+from app.services.concept_autocomplete import parse_tags
+
+TAG_LINKS = {
+    "project": (project_tags, "project_id"),
+    "concept": (concept_tags, "concept_id"),
+}
+
+
+def normalize_tags(value) -> List[str]:
+    """Comma-separated text or a list → unique lowercase tag names, in order."""
+    return list(dict.fromkeys(t.lower()[:TAG_MAX_LENGTH] for t in parse_tags(value)))
+
+
+def set_tags(db: Session, obj, value):
+    """
+    Point a Project or Concept at its Tag rows (creating missing ones) and
+    keep its text `tags` column as the canonical comma-separated copy.
+    """
+    names = normalize_tags(value)
+    if names:
+        db.execute(
+            insert(Tag)
+            .values([{"id": uuid.uuid4(), "name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        by_name = {
+            t.name: t for t in db.scalars(select(Tag).where(Tag.name.in_(names)))
+        }
+        obj.normalized_tags = [by_name[name] for name in names]
+    else:
+        obj.normalized_tags = []
+    obj.tags = ",".join(names) or None
+
+
+def tagged_with(kind: str, value):
+    """Ids carrying every given tag, answered from the (tag_id, id) index."""
+    link, id_column = TAG_LINKS[kind]
+    names = normalize_tags(value)
+    return (
+        select(link.c[id_column])
+        .join(Tag, Tag.id == link.c.tag_id)
+        .where(Tag.name.in_(names))
+        .group_by(link.c[id_column])
+        .having(func.count() == len(names))
+    )
+
+
+def tag_counts(
+    db: Session, user_id, prefix: Optional[str] = None, limit: int = 50
+) -> List[dict]:
+    """Tags by usage across the user's projects and all active concepts."""
+    projects = (
+        select(project_tags.c.tag_id, func.count().label("n"))
+        .join(Project, Project.id == project_tags.c.project_id)
+        .where(Project.owner_id == user_id)
+        .group_by(project_tags.c.tag_id)
+        .subquery()
+    )
+    concepts = (
+        select(concept_tags.c.tag_id, func.count().label("n"))
+        .join(Concept, Concept.id == concept_tags.c.concept_id)
+        .where(Concept.is_active.is_(True))
+        .group_by(concept_tags.c.tag_id)
+        .subquery()
+    )
+    project_count = func.coalesce(projects.c.n, 0)
+    concept_count = func.coalesce(concepts.c.n, 0)
+    query = (
+        select(
+            Tag.name,
+            project_count.label("projects"),
+            concept_count.label("concepts"),
+        )
+        .outerjoin(projects, projects.c.tag_id == Tag.id)
+        .outerjoin(concepts, concepts.c.tag_id == Tag.id)
+        .where((projects.c.n.isnot(None)) | (concepts.c.n.isnot(None)))
+    )
+    if prefix:
+        escaped = (
+            prefix.lower().replace("/", "//").replace("%", "/%").replace("_", "/_")
+        )
+        query = query.where(Tag.name.like(f"{escaped}%", escape="/"))
+    rows = db.execute(
+        query.order_by((project_count + concept_count).desc(), Tag.name).limit(limit)
+    ).all()
+    return [dict(row._mapping) for row in rows]
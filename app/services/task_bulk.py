@@ -0,0 +1,131 @@
+import uuid
+from collections import Counter, defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.events import project_topic, publish_event
+from app.models import Project, Task
+from app.schemas.task import TaskBulkRequest
+from app.services.task_title_index import drop_title_index
+from app.utils.crud_helpers import allocate_task_keys, clear_user_cache
+
+TASK_STATUSES = set(Task.__table__.c.status.type.enums)
+
+
+def _result(op: str, index: int, status: str = "ok", **fields) -> dict:
+    return {"op": op, "index": index, "status": status, **fields}
+
+
+def apply_bulk_tasks(db: Session, user_id, payload: TaskBulkRequest) -> dict:
+    """
+    Create, update and delete many tasks in one transaction. Authorization is
+    checked once per project; items the user can't reach report not_found.
+    """
+    results = []
+
+    # ----- 🔐 one ownership query per kind of reference -----
+    project_ids = {item.project_id for item in payload.create}
+    owned_projects = (
+        {
+            p.id: p
+            for p in db.query(Project).filter(
+                Project.id.in_(project_ids), Project.owner_id == user_id
+            )
+        }
+        if project_ids
+        else {}
+    )
+
+    task_ids = {item.id for item in payload.update} | set(payload.delete)
+    owned_tasks = (
+        dict(
+            db.execute(
+                select(Task.id, Task.project_id)
+                .join(Project, Project.id == Task.project_id)
+                .where(Task.id.in_(task_ids), Project.owner_id == user_id)
+            ).all()
+        )
+        if task_ids
+        else {}
+    )
+
+    touched_projects = defaultdict(
+        lambda: {"created": [], "updated": [], "deleted": []}
+    )
+
+    # ----- 🧩 creates: keys reserved per project as one range -----
+    creates_by_project = defaultdict(list)
+    for i, item in enumerate(payload.create):
+        if item.project_id not in owned_projects:
+            results.append(
+                _result(
+                    "create", i, "not_found", detail="Project not found or unauthorized"
+                )
+            )
+            continue
+        creates_by_project[item.project_id].append((i, item))
+
+    rows = []
+    for project_id, items in creates_by_project.items():
+        keys = allocate_task_keys(db, owned_projects[project_id], len(items))
+        for (i, item), key in zip(items, keys):
+            row = {**item.model_dump(), "id": uuid.uuid4(), "task_key": key}
+            rows.append(row)
+            results.append(_result("create", i, id=row["id"], task_key=key))
+            touched_projects[project_id]["created"].append(key)
+    if rows:
+        db.execute(insert(Task), rows)  # executemany
+
+    # ----- ✏️ updates: bulk UPDATE by primary key -----
+    updates = []
+    for i, item in enumerate(payload.update):
+        if item.id not in owned_tasks:
+            results.append(_result("update", i, "not_found", id=item.id))
+            continue
+        changes = item.model_dump(exclude_unset=True)
+        if changes.get("status") is not None and changes["status"] not in TASK_STATUSES:
+            results.append(
+                _result("update", i, "invalid", id=item.id, detail="Unknown status")
+            )
+            continue
+        updates.append(changes)
+        results.append(_result("update", i, id=item.id))
+        touched_projects[owned_tasks[item.id]]["updated"].append(str(item.id))
+    if updates:
+        db.execute(update(Task), updates)  # grouped executemany per column set
+
+    # ----- ❌ deletes: one statement -----
+    deletable = []
+    for i, task_id in enumerate(payload.delete):
+        if task_id not in owned_tasks:
+            results.append(_result("delete", i, "not_found", id=task_id))
+            continue
+        deletable.append(task_id)
+        results.append(_result("delete", i, id=task_id))
+        touched_projects[owned_tasks[task_id]]["deleted"].append(str(task_id))
+    if deletable:
+        db.execute(delete(Task).where(Task.id.in_(deletable)))
+
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Bulk operation failed: {e}")
+
+    # ----- 📣 once per request / project -----
+    clear_user_cache(user_id)
+    for project_id, changes in touched_projects.items():
+        drop_title_index(project_id)  # Core statements bypass the ORM hooks
+        publish_event(project_topic(project_id), "tasks.bulk", changes)
+
+    order = {"create": 0, "update": 1, "delete": 2}
+    results.sort(key=lambda r: (order[r["op"]], r["index"]))
+    done = Counter(r["op"] for r in results if r["status"] == "ok")
+    return {
+        "results": results,
+        "created": done["create"],
+        "updated": done["update"],
+        "deleted": done["delete"],
+    }
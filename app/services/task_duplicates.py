@@ -0,0 +1,89 @@
+import logging
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from app.core.database import SessionLocal
+from app.core.events import project_topic, publish_event
+from app.models import Task, TaskDuplicate
+from app.utils.crud_helpers import detect_possible_duplicates
+
+logger = logging.getLogger("skillstack.tasks.duplicates")
+
+SUGGESTED = "suggested"
+
+
+def store_duplicate_suggestions(db: Session, task_id, matches: list) -> int:
+    """Record matches as suggested links (new task → similar existing task)."""
+    if not matches:
+        return 0
+    table = TaskDuplicate.__table__
+    inserted = db.execute(
+        insert(table)
+        .values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "original_id": uuid.UUID(str(m["id"])),
+                    "duplicate_id": task_id,
+                    "status": SUGGESTED,
+                    "similarity": m["similarity"],
+                }
+                for m in matches
+            ]
+        )
+        .on_conflict_do_nothing(constraint="uq_task_duplicates_pair")
+        .returning(table.c.id)
+    ).all()
+    return len(inserted)
+
+
+def scan_task_duplicates(task_id: str):
+    """
+    Background duplicate scoring for a freshly created task; stores the
+    suggestions and pushes them to the project's WebSocket subscribers.
+    """
+    with SessionLocal() as db:
+        task = db.get(Task, uuid.UUID(str(task_id)))
+        if task is None:
+            return
+        try:
+            matches = detect_possible_duplicates(
+                db, task.project_id, task.title, exclude_id=task.id
+            )
+            store_duplicate_suggestions(db, task.id, matches)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Duplicate scan failed for task {task_id}: {e}")
+            return
+
+        project_id, task_key = task.project_id, task.task_key
+
+    publish_event(
+        project_topic(project_id),
+        "task.duplicates_suggested",
+        {"id": str(task_id), "task_key": task_key, "possible_duplicates": matches},
+    )
+
+
+def list_possible_duplicates(db: Session, task_id) -> list:
+    """Suggested and confirmed originals for a task, most similar first."""
+    original = aliased(Task)
+    rows = db.execute(
+        select(
+            TaskDuplicate.id,
+            TaskDuplicate.status,
+            TaskDuplicate.similarity,
+            TaskDuplicate.created_at,
+            original.id.label("task_id"),
+            original.task_key,
+            original.title,
+        )
+        .join(original, original.id == TaskDuplicate.original_id)
+        .where(TaskDuplicate.duplicate_id == task_id)
+        .order_by(TaskDuplicate.similarity.desc().nulls_last(), original.task_key)
+    ).all()
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,257 @@
+import csv
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterator, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.events import project_topic, publish_event
+from app.models import Project, Task, User
+from app.services.task_title_index import drop_title_index
+from app.utils.crud_helpers import allocate_task_keys
+
+logger = logging.getLogger("skillstack.tasks.import")
+
+IMPORT_PREFIX = "tasks:import"
+IMPORT_FORMATS = {"csv", "ndjson"}
+MAX_REPORTED_ERRORS = 50
+TASK_STATUSES = set(Task.__table__.c.status.type.enums)
+
+
+class TaskImportRow(BaseModel):
+    title: str = Field(min_length=1, max_length=500)
+    description: Optional[str] = None
+    status: str = "pending"
+    priority: int = 1
+    due_date: Optional[datetime] = None
+    assignee_id: Optional[UUID] = None
+
+    @field_validator("status")
+    @classmethod
+    def _known_status(cls, value):
+        if value not in TASK_STATUSES:
+            raise ValueError(f"status must be one of {sorted(TASK_STATUSES)}")
+        return value
+
+
+# -------------------------------------------------------------------
+# 📄 Incremental parsing (one row in memory at a time)
+# -------------------------------------------------------------------
+def iter_import_rows(stream, fmt: str) -> Iterator[tuple]:
+    """Yield (line number, raw dict | error message) from a text stream."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # CSV has no null: empty cells mean "not given"
+            yield reader.line_num, {
+                k.strip().lower(): v.strip()
+                for k, v in record.items()
+                if k and isinstance(v, str) and v.strip()
+            }
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"Invalid JSON: {e.msg}"
+            continue
+        yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def validate_chunk(records, known_assignees: Optional[set] = None) -> tuple:
+    """
+    → (valid TaskImportRow list, [(line, error)]). With `known_assignees`,
+    rows assigned to anyone else are errors rather than FK violations.
+    """
+    valid, errors = [], []
+    for line_no, record in records:
+        if isinstance(record, str):
+            errors.append((line_no, record))
+            continue
+        try:
+            row = TaskImportRow.model_validate(record)
+        except ValidationError as e:
+            first = e.errors()[0]
+            field = ".".join(str(p) for p in first["loc"]) or "row"
+            errors.append((line_no, f"{field}: {first['msg']}"))
+            continue
+        if (
+            known_assignees is not None
+            and row.assignee_id is not None
+            and row.assignee_id not in known_assignees
+        ):
+            errors.append((line_no, "assignee_id: no such user"))
+            continue
+        valid.append(row)
+    return valid, errors
+
+
+def known_assignees(db, records) -> set:
+    """Ids among the chunk's assignee_id values that belong to real users."""
+    wanted = set()
+    for _, record in records:
+        if isinstance(record, dict) and record.get("assignee_id"):
+            try:
+                wanted.add(UUID(str(record["assignee_id"])))
+            except ValueError:
+                pass  # reported by validation
+    if not wanted:
+        return set()
+    return set(db.scalars(select(User.id).where(User.id.in_(wanted))))
+
+
+# -------------------------------------------------------------------
+# 📊 Job state (Redis hash per import)
+# -------------------------------------------------------------------
+def _redis():
+    # Imported lazily: app.core.cache connects to Redis at import time.
+    from app.core.cache import get_redis
+
+    return get_redis()
+
+
+def _job_key(job_id: str) -> str:
+    return f"{IMPORT_PREFIX}:{job_id}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def create_import_job(project_id, user_id, path: str, fmt: str, **options) -> str:
+    job_id = uuid.uuid4().hex
+    key = _job_key(job_id)
+    client = _redis()
+    client.hset(
+        key,
+        mapping={
+            "status": "queued",
+            "project_id": str(project_id),
+            "user_id": str(user_id),
+            "path": path,
+            "format": fmt,
+            "options": json.dumps(options),
+            "processed": 0,
+            "created": 0,
+            "invalid": 0,
+            "errors": "[]",
+            "queued_at": _now(),
+        },
+    )
+    client.expire(key, settings.TASK_IMPORT_JOB_TTL)
+    return job_id
+
+
+def _update_job(job_id: str, **fields):
+    try:
+        _redis().hset(_job_key(job_id), mapping=fields)
+    except Exception as e:
+        logger.warning(f"Import job {job_id} status update failed: {e}")
+
+
+def get_import_job(job_id: str, project_id) -> Optional[dict]:
+    raw = _redis().hgetall(_job_key(job_id))
+    if not raw or raw.get("project_id") != str(project_id):
+        return None
+    return {
+        "id": job_id,
+        "status": raw.get("status"),
+        "processed": int(raw.get("processed", 0)),
+        "created": int(raw.get("created", 0)),
+        "invalid": int(raw.get("invalid", 0)),
+        "errors": json.loads(raw.get("errors") or "[]"),
+        "error": raw.get("error"),
+        "queued_at": raw.get("queued_at"),
+        "finished_at": raw.get("finished_at"),
+    }
+
+
+# -------------------------------------------------------------------
+# ⚙️ Loader (Celery / thread via enqueue)
+# -------------------------------------------------------------------
+def _insert_chunk(db, project: Project, rows: list) -> list:
+    """Reserve a key range and load one validated chunk; returns new ids."""
+    keys = allocate_task_keys(db, project, len(rows))
+    values = [
+        {
+            **row.model_dump(),
+            "id": uuid.uuid4(),
+            "project_id": project.id,
+            "task_key": key,
+        }
+        for row, key in zip(rows, keys)
+    ]
+    db.execute(insert(Task), values)  # executemany, batched by the driver
+    db.commit()
+    return [v["id"] for v in values]
+
+
+def run_task_import(job_id: str):
+    """Stream the spooled upload into the project, one committed chunk at a time."""
+    job = _redis().hgetall(_job_key(job_id))
+    if not job or job.get("status") != "queued":
+        return
+    path, fmt = job["path"], job["format"]
+    options = json.loads(job.get("options") or "{}")
+    _update_job(job_id, status="running", started_at=_now())
+
+    processed = created = invalid = 0
+    errors = []
+    try:
+        with SessionLocal() as db, open(path, newline="", encoding="utf-8-sig") as fh:
+            project = db.get(Project, UUID(job["project_id"]))
+            if project is None:
+                raise ValueError("Project no longer exists")
+
+            records = iter_import_rows(fh, fmt)
+            while chunk := list(islice(records, settings.TASK_IMPORT_CHUNK_SIZE)):
+                valid, chunk_errors = validate_chunk(chunk, known_assignees(db, chunk))
+                if valid:
+                    new_ids = _insert_chunk(db, project, valid)
+                    created += len(new_ids)
+                    if options.get("detect_duplicates"):
+                        _scan_duplicates(new_ids)
+                processed += len(chunk)
+                invalid += len(chunk_errors)
+                room = MAX_REPORTED_ERRORS - len(errors)
+                errors += [{"line": n, "error": msg} for n, msg in chunk_errors[:room]]
+                _update_job(
+                    job_id,
+                    processed=processed,
+                    created=created,
+                    invalid=invalid,
+                    errors=json.dumps(errors),
+                )
+        _update_job(job_id, status="succeeded", finished_at=_now())
+    except Exception as e:
+        logger.error(f"❌ Task import {job_id} failed after {processed} rows: {e}")
+        _update_job(job_id, status="failed", error=str(e), finished_at=_now())
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    drop_title_index(job["project_id"])  # rows were loaded without the ORM
+    publish_event(
+        project_topic(job["project_id"]),
+        "tasks.imported",
+        {"job_id": job_id, "created": created, "invalid": invalid},
+    )
+
+
+def _scan_duplicates(task_ids: list):
+    from app.services.task_duplicates import scan_task_duplicates
+
+    for task_id in task_ids:
+        scan_task_duplicates(str(task_id))
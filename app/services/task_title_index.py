@@ -0,0 +1,162 @@
+import bisect
+import threading
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models import Task
+from app.utils.cache import cache_clear, cache_get, cache_set
+
+INDEX_CACHE_PREFIX = "tasks:title_index"
+INDEX_TTL = 600  # seconds; rebuild to pick up writes from other processes
+DEFAULT_LIMIT = 10
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip punctuation and sort tokens (token_sort_ratio's key)."""
+    from rapidfuzz.utils import default_process
+
+    return " ".join(sorted(default_process(title or "").split()))
+
+
+class ProjectTitleIndex:
+    """
+    Pre-normalized titles of one project's tasks, kept sorted by
+    normalized title. `rows` holds (id, task_key, normalized title, title)
+    and `titles` the normalized titles alone, the choice list for RapidFuzz.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str, str, str]]):
+        self._lock = threading.Lock()
+        self.rows = sorted(rows, key=lambda r: r[2])
+        self.titles = [r[2] for r in self.rows]
+        self._by_id = {r[0]: r[2] for r in self.rows}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _position(self, task_id: str, title: str) -> Optional[int]:
+        i = bisect.bisect_left(self.titles, title)
+        while i < len(self.titles) and self.titles[i] == title:
+            if self.rows[i][0] == task_id:
+                return i
+            i += 1
+        return None
+
+    # Copy-on-write so a concurrent search never sees a half-applied change
+    def upsert(self, task_id: str, task_key: str, title: str):
+        with self._lock:
+            rows, titles = list(self.rows), list(self.titles)
+            old = self._by_id.get(task_id)
+            if old is not None:
+                i = self._position(task_id, old)
+                if i is not None:
+                    del rows[i], titles[i]
+            norm = normalize_title(title)
+            i = bisect.bisect_left(titles, norm)
+            rows.insert(i, (task_id, task_key, norm, title))
+            titles.insert(i, norm)
+            self._by_id = {**self._by_id, task_id: norm}
+            self.rows, self.titles = rows, titles
+
+    def remove(self, task_id: str):
+        with self._lock:
+            old = self._by_id.get(task_id)
+            i = self._position(task_id, old) if old is not None else None
+            if i is None:
+                return
+            self.rows = self.rows[:i] + self.rows[i + 1 :]
+            self.titles = self.titles[:i] + self.titles[i + 1 :]
+            self._by_id = {k: v for k, v in self._by_id.items() if k != task_id}
+
+    def search(self, title: str, threshold: int = 80, limit: int = DEFAULT_LIMIT):
+        """One RapidFuzz pass over every title → [(row, score)], best first."""
+        from rapidfuzz import fuzz, process
+
+        rows, titles = self.rows, self.titles
+        matches = process.extract(
+            normalize_title(title),
+            titles,
+            scorer=fuzz.ratio,  # titles are pre-sorted, so ratio == token_sort_ratio
+            processor=None,
+            score_cutoff=threshold,
+            limit=limit,
+        )
+        return [(rows[i], score) for _, score, i in matches]
+
+
+# -------------------------------------------------------------------
+# 🗄️ Process cache (one index per project)
+# -------------------------------------------------------------------
+def _cache_key(project_id) -> str:
+    return f"{INDEX_CACHE_PREFIX}:{project_id}"
+
+
+def build_title_index(db: Session, project_id) -> ProjectTitleIndex:
+    rows = db.execute(
+        select(Task.id, Task.task_key, Task.title).where(Task.project_id == project_id)
+    ).all()
+    return ProjectTitleIndex(
+        [(str(r.id), r.task_key, normalize_title(r.title), r.title) for r in rows]
+    )
+
+
+def get_title_index(db: Session, project_id) -> ProjectTitleIndex:
+    index = cache_get(_cache_key(project_id))
+    if index is None:
+        index = build_title_index(db, project_id)
+        cache_set(_cache_key(project_id), index, expire_seconds=INDEX_TTL)
+    return index
+
+
+def drop_title_index(project_id):
+    """Forget a cached index, e.g. after Core-level bulk writes."""
+    cache_clear(_cache_key(project_id))
+
+
+def find_similar_titles(
+    db: Session, project_id, title: str, threshold: int = 80, limit=DEFAULT_LIMIT
+) -> list:
+    index = get_title_index(db, project_id)
+    return [
+        {"id": row[0], "task_key": row[1], "title": row[3], "similarity": score}
+        for row, score in index.search(title, threshold, limit)
+    ]
+
+
+# -------------------------------------------------------------------
+# 🔁 Incremental updates: apply task changes once they are committed
+# -------------------------------------------------------------------
+_PENDING_KEY = "task_title_index_changes"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_task_changes(session, flush_context):
+    changes = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, Task) and obj.project_id is not None:
+            changes.append(
+                ("upsert", str(obj.project_id), str(obj.id), obj.task_key, obj.title)
+            )
+    for obj in session.deleted:
+        if isinstance(obj, Task) and obj.project_id is not None:
+            changes.append(("remove", str(obj.project_id), str(obj.id)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_task_changes(session):
+    for action, project_id, task_id, *rest in session.info.pop(_PENDING_KEY, []):
+        # Only projects already indexed in this process need patching
+        index = cache_get(_cache_key(project_id))
+        if index is None:
+            continue
+        if action == "upsert":
+            index.upsert(task_id, *rest)
+        else:
+            index.remove(task_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_task_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,27 @@
+# app/tasks/ai_tasks.py
+from app.background.cleanup_jobs import cleanup_ai_jobs
+from app.background.recommendation_jobs import run_recommendation_batch
+from app.core.celery_app import celery_app
+from app.core.logging_config import get_logger
+from app.services.ai_jobs import run_ai_job
+
+logger = get_logger("AITasks")
+
+
+@celery_app.task(name="run_ai_job")
+def run_ai_job_task(job_id: str):
+    """Run a queued AI job on the dedicated `ai` queue."""
+    logger.info(f"🤖 Running AI job {job_id}")
+    run_ai_job(job_id)
+
+
+@celery_app.task(name="cleanup_ai_jobs")
+def cleanup_ai_jobs_task():
+    """Periodic retention sweep for finished AI jobs."""
+    cleanup_ai_jobs()
+
+
+@celery_app.task(name="precompute_recommendations")
+def precompute_recommendations_task():
+    """Refresh stored next-concept recommendations for active users."""
+    return run_recommendation_batch()
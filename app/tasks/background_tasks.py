@@ -22,3 +22,19 @@ def normalize_roadmap_steps_task(roadmap_id: str):
         logger.error(f"❌ Error during normalization for {roadmap_id}: {e}")
     finally:
         db.close()
+
+
+@celery_app.task(name="scan_task_duplicates")
+def scan_task_duplicates_task(task_id: str):
+    """Score a new task against its project and store duplicate suggestions."""
+    from app.services.task_duplicates import scan_task_duplicates
+
+    scan_task_duplicates(task_id)
+
+
+@celery_app.task(name="run_task_import")
+def run_task_import_task(job_id: str):
+    """Load a spooled CSV / NDJSON upload into its project in chunks."""
+    from app.services.task_import import run_task_import
+
+    run_task_import(job_id)
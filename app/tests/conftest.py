@@ -75,3 +75,68 @@ def sample_notification_data():
         "message": "You have been assigned a new task",
         "is_read": False,
     }
+
+
+@pytest.fixture
+def live_redis():
+    """The configured Redis server, or skip when it is not running."""
+    import redis
+
+    from app.core.config import settings
+
+    client = redis.Redis.from_url(
+        settings.REDIS_URL, decode_responses=True, socket_connect_timeout=1
+    )
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("Redis is not reachable")
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def pg_session(live_redis):
+    """
+    Session on the configured (migrated) Postgres database. Everything made
+    through `pg_session.make_user()` is deleted afterwards via cascades.
+    Redis must be up too: app.routers connects to it on import.
+    """
+    import uuid
+
+    from sqlalchemy import inspect
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.database import SessionLocal, engine
+    from app.models import User
+
+    try:
+        with engine.connect() as conn:
+            tables = set(inspect(conn).get_table_names())
+    except OperationalError:
+        pytest.skip("PostgreSQL is not reachable")
+    if "tags" not in tables:
+        pytest.skip("Database is not migrated to head")
+
+    db = SessionLocal()
+    user_ids = []
+
+    def make_user():
+        suffix = uuid.uuid4().hex[:10]
+        user = User(
+            username=f"test-{suffix}",
+            email=f"test-{suffix}@example.com",
+            hashed_password="x",
+        )
+        db.add(user)
+        db.commit()
+        user_ids.append(user.id)
+        return user
+
+    db.make_user = make_user
+    yield db
+
+    db.rollback()
+    db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
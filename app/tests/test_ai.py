@@ -0,0 +1,513 @@
+"""Tests for the async AI provider layer."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.ai_service import AIProviderError, GeminiProvider, MockAIProvider
+
+
+def gemini_reply(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+def make_provider(handler) -> GeminiProvider:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = GeminiProvider(client=client)
+    provider.backoff_base = 0
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_gemini_retries_on_rate_limit_then_succeeds():
+    """429 responses are retried with backoff until the call succeeds."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(429)
+        return httpx.Response(200, json=gemini_reply("FastAPI is a web framework"))
+
+    provider = make_provider(handler)
+    answer = await provider.answer_question("What is FastAPI?")
+
+    assert answer == "FastAPI is a web framework"
+    assert len(calls) == 3
+    assert "key=" not in str(calls[0].url)
+    assert calls[0].headers["x-goog-api-key"] == provider.api_key
+
+
+@pytest.mark.asyncio
+async def test_gemini_gives_up_after_max_retries():
+    """Persistent 5xx responses surface as AIProviderError."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    provider = make_provider(handler)
+    provider.max_retries = 2
+
+    with pytest.raises(AIProviderError):
+        await provider.answer_question("Anyone there?")
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_gemini_fails_fast_when_retry_after_exceeds_the_budget():
+    """A Retry-After longer than the time budget is not slept through."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+
+    provider = make_provider(handler)
+    provider.retry_budget = 5
+
+    with pytest.raises(AIProviderError, match="time budget"):
+        await asyncio.wait_for(provider.answer_question("Busy?"), timeout=2)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_gemini_does_not_retry_client_errors():
+    """4xx errors other than 429 fail immediately."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400, json={"error": "bad request"})
+
+    provider = make_provider(handler)
+
+    with pytest.raises(AIProviderError):
+        await provider.generate_tasks("Demo", "desc")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_provider_is_async():
+    """The mock provider exposes the same awaitable interface."""
+    result = await MockAIProvider().answer_question("ping")
+    assert result == {"answer": "This is a mock answer for: ping"}
+
+
+@pytest.mark.asyncio
+async def test_gemini_streams_sse_chunks():
+    """Streaming calls hit the SSE endpoint and yield each text delta."""
+    body = "".join(
+        f"data: {json.dumps(gemini_reply(part))}\r\n\r\n"
+        for part in ["Fast", "API is ", "async"]
+    )
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(
+            200, text=body, headers={"content-type": "text/event-stream"}
+        )
+
+    provider = make_provider(handler)
+    chunks = [chunk async for chunk in provider.stream_answer("What is FastAPI?")]
+
+    assert chunks == ["Fast", "API is ", "async"]
+    assert seen[0].url.path.endswith(":streamGenerateContent")
+    assert seen[0].url.params["alt"] == "sse"
+
+
+@pytest.mark.asyncio
+async def test_mock_provider_streams_deterministically():
+    """Mock streams reassemble into the non-streaming answer."""
+    provider = MockAIProvider()
+    chunks = [chunk async for chunk in provider.stream_answer("ping")]
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == (await provider.answer_question("ping"))["answer"]
+
+
+def test_cache_key_ignores_case_whitespace_and_synonyms():
+    """Near-identical prompts map to the same cache entry."""
+    from app.services.ai_cache import make_cache_key
+
+    a = make_cache_key(
+        "gemini",
+        "flash",
+        "project_idea",
+        {"goal": "Learn FastAPI", "skill_level": "Beginner"},
+    )
+    b = make_cache_key(
+        "gemini",
+        "flash",
+        "project_idea",
+        {"goal": "  learn   fastapi. ", "skill_level": "novice"},
+    )
+    assert a == b
+
+
+def test_cache_key_separates_provider_model_and_params():
+    """Different models or parameters never share an entry."""
+    from app.services.ai_cache import make_cache_key
+
+    params = {"title": "API", "goal": "ship", "duration_weeks": 4, "skill_level": None}
+    base = make_cache_key("gemini", "flash", "roadmap", params)
+
+    assert base != make_cache_key("gemini", "pro", "roadmap", params)
+    assert base != make_cache_key("mock", "flash", "roadmap", params)
+    assert base != make_cache_key(
+        "gemini", "flash", "roadmap", {**params, "duration_weeks": 6}
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_uses_async_redis_and_keeps_streams_apart(live_redis):
+    """Parsed replies and streamed text are cached under separate keys."""
+    import uuid
+
+    from app.core.redis_async import close_async_redis
+    from app.services.ai_cache import (
+        INDEX_KEY,
+        STREAM_PREFIX,
+        CachedAIProvider,
+        make_cache_key,
+    )
+
+    class CountingProvider(MockAIProvider):
+        model = f"test-{uuid.uuid4().hex}"  # isolates this test's entries
+        calls = 0
+        streams = 0
+
+        async def answer_question(self, question):
+            CountingProvider.calls += 1
+            return await super().answer_question(question)
+
+        async def stream_answer(self, question):
+            CountingProvider.streams += 1
+            async for chunk in super().stream_answer(question):
+                yield chunk
+
+    cached = CachedAIProvider(CountingProvider(), ttl=60)
+    try:
+        reply = await cached.answer_question("What is ASGI?")
+        assert await cached.answer_question("what is asgi") == reply
+        assert CountingProvider.calls == 1
+
+        # A parsed-reply hit must not be replayed as stream text
+        streamed = [c async for c in cached.stream_answer("What is ASGI?")]
+        assert CountingProvider.streams == 1 and len(streamed) > 1
+        replay = [c async for c in cached.stream_answer("What is ASGI?")]
+        assert replay == ["".join(streamed)]
+        assert CountingProvider.streams == 1
+
+        stream_key = make_cache_key(
+            "mock",
+            CountingProvider.model,
+            "answer",
+            {"question": "What is ASGI?"},
+            prefix=STREAM_PREFIX,
+        )
+        assert live_redis.exists(stream_key)
+    finally:
+        params = {"question": "What is ASGI?"}
+        keys = [
+            make_cache_key("mock", CountingProvider.model, "answer", params),
+            make_cache_key(
+                "mock", CountingProvider.model, "answer", params, prefix=STREAM_PREFIX
+            ),
+        ]
+        live_redis.delete(*keys)
+        live_redis.zrem(INDEX_KEY, *keys)
+        await close_async_redis()
+
+
+@pytest.mark.asyncio
+async def test_prompt_bundle_splits_structured_reply():
+    """One structured request answers every ask; each part lands on its key."""
+    from app.services.ai_bundle import BundleAsk, run_prompt_bundle
+
+    asks = [
+        BundleAsk("reflection", "Reflect", fallback="r-fallback"),
+        BundleAsk("next_concept", "Suggest", fallback="n-fallback"),
+    ]
+    result = await run_prompt_bundle(MockAIProvider(), "context", asks)
+
+    assert result.values == {
+        "reflection": "Mock reflection.",
+        "next_concept": "Mock next concept.",
+    }
+    assert not result.degraded
+
+
+@pytest.mark.asyncio
+async def test_prompt_bundle_partial_failure_retries_only_bad_parts():
+    """Invalid parts get retried alone; if that fails too they fall back."""
+    from app.services.ai_bundle import BundleAsk, run_prompt_bundle
+
+    prompts = []
+
+    class FlakyProvider(MockAIProvider):
+        async def generate_json(self, prompt, schema):
+            prompts.append(sorted(schema["properties"]))
+            return {"reflection": "Good work", "next_concept": "  "}
+
+    asks = [
+        BundleAsk("reflection", "Reflect", fallback="r-fallback"),
+        BundleAsk("next_concept", "Suggest", fallback="n-fallback"),
+    ]
+    result = await run_prompt_bundle(FlakyProvider(), "context", asks)
+
+    assert result.values == {"reflection": "Good work", "next_concept": "n-fallback"}
+    assert list(result.errors) == ["next_concept"]
+    assert prompts == [["next_concept", "reflection"], ["next_concept"]]
+
+
+@pytest.mark.asyncio
+async def test_prompt_bundle_request_failure_degrades_all_parts():
+    """A failed bundled request falls back without extra provider calls."""
+    from app.services.ai_bundle import BundleAsk, run_prompt_bundle
+
+    calls = []
+
+    class DownProvider(MockAIProvider):
+        async def generate_json(self, prompt, schema):
+            calls.append(prompt)
+            raise AIProviderError("down")
+
+    asks = [BundleAsk("summary", "Summarize", fallback="s-fallback")]
+    result = await run_prompt_bundle(DownProvider(), "context", asks)
+
+    assert result.values == {"summary": "s-fallback"}
+    assert result.degraded
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_learning_loop_can_defer_insights_to_a_push(monkeypatch):
+    """With defer_ai the progress answer comes first; insights are pushed."""
+    from contextlib import nullcontext
+
+    from fastapi import BackgroundTasks
+
+    from app.services import learning_loop
+
+    progress = {"progress": 0.4, "xp_gained": 25, "streak": 3}
+    monkeypatch.setattr(
+        learning_loop, "record_study_session", lambda *args: (progress, [])
+    )
+    monkeypatch.setattr(learning_loop, "ai", MockAIProvider())
+    saved, published = [], []
+    monkeypatch.setattr(
+        learning_loop, "save_loop_insights", lambda db, uid, ins: saved.append(ins)
+    )
+    monkeypatch.setattr(learning_loop, "SessionLocal", nullcontext)
+
+    async def publish(*args):
+        published.append(args)
+
+    monkeypatch.setattr(learning_loop, "publish_event_async", publish)
+
+    tasks = BackgroundTasks()
+    response = await learning_loop.run_learning_loop(
+        None, "u1", "c1", 30, 0.8, defer_ai=True, background_tasks=tasks
+    )
+    assert response == {
+        **progress,
+        "reflection": None,
+        "next_suggestion": None,
+        "ai_status": "pending",
+    }
+    assert not saved and not published
+
+    await tasks()
+    insights = {
+        "reflection": "Mock reflection.",
+        "next_suggestion": "Mock next concept.",
+        "ai_status": "ready",
+    }
+    assert saved == [insights]
+    assert published == [("user:u1", "learning.insights", insights)]
+
+
+def test_ai_job_params_are_validated_per_kind():
+    """Job submissions reuse the synchronous endpoints' request schemas."""
+    from pydantic import ValidationError
+
+    from app.services.ai_jobs import validate_job_params
+
+    params = validate_job_params("answer", {"question": "What is Celery?"})
+    assert params == {"question": "What is Celery?"}
+    assert validate_job_params("recommend", {"ignored": 1}) == {}
+
+    with pytest.raises(ValidationError):
+        validate_job_params("roadmap", {"project_title": "API"})
+    with pytest.raises(ValueError):
+        validate_job_params("poem", {})
+
+
+@pytest.mark.asyncio
+async def test_budget_queues_until_token_then_rejects_past_deadline(monkeypatch):
+    """Callers wait for budget up to their deadline, then get AIBudgetExceeded."""
+    from app.services import ai_budget as budget_module
+    from app.services.ai_budget import AIBudget, AIBudgetExceeded
+
+    outcomes = []
+
+    async def record(user, outcome):
+        outcomes.append(outcome)
+
+    def answering(*answers):
+        answers = iter(answers)
+
+        async def try_acquire(user_id):
+            return next(answers)
+
+        return try_acquire
+
+    monkeypatch.setattr(budget_module, "record_usage", record)
+    budget = AIBudget(max_wait=0.5)
+
+    monkeypatch.setattr(
+        budget, "try_acquire", answering((None, 0.01, "user"), ("lease-1", 0.0, "ok"))
+    )
+    assert await budget.acquire("u1") == "lease-1"
+
+    monkeypatch.setattr(budget, "try_acquire", answering((None, 5.0, "global")))
+    with pytest.raises(AIBudgetExceeded) as exc:
+        await budget.acquire("u1")
+
+    assert exc.value.reason == "global"
+    assert outcomes == ["throttled", "rejected"]
+
+
+@pytest.mark.asyncio
+async def test_budget_spends_tokens_and_leases_in_async_redis(live_redis):
+    """The bucket script, leases and usage counters run on the asyncio client."""
+    import uuid
+
+    from app.core.redis_async import close_async_redis
+    from app.services.ai_budget import BUDGET_PREFIX, AIBudget, get_usage
+
+    user_id = f"test-{uuid.uuid4().hex}"
+    budget = AIBudget(per_user_per_min=1, global_per_min=1000, max_wait=0)
+    try:
+        async with budget.slot(user_id):
+            assert live_redis.zcard(f"{BUDGET_PREFIX}:leases:{user_id}") == 1
+        assert live_redis.zcard(f"{BUDGET_PREFIX}:leases:{user_id}") == 0
+
+        lease_id, wait, reason = await budget.try_acquire(user_id)
+        assert lease_id is None and reason == "user" and wait > 1
+
+        usage = get_usage(user_id, hours=1)
+        assert usage["user_today"]["granted"] == 1
+    finally:
+        live_redis.delete(f"{BUDGET_PREFIX}:user:{user_id}")
+        live_redis.delete(*live_redis.keys(f"ai:usage:user:{user_id}:*"))
+        await close_async_redis()
+
+
+@pytest.mark.asyncio
+async def test_recommend_job_stores_a_json_result(pg_session, monkeypatch):
+    """A recommend job's view (with its generated_at datetime) is persisted."""
+    from app.services import ai_jobs
+    from app.services.ai_recommendation import store_recommendations
+
+    events = []
+
+    async def publish(*args):
+        events.append(args)
+
+    monkeypatch.setattr(ai_jobs, "publish_event_async", publish)
+    user = pg_session.make_user()
+    suggestions = [{"concept": "SQL joins", "reason": "next", "confidence": 0.8}]
+    store_recommendations(pg_session, user.id, suggestions, 0.8)
+    job = ai_jobs.create_job(pg_session, user.id, "recommend", {})
+
+    await ai_jobs.execute_job(str(job.id))
+
+    pg_session.refresh(job)
+    view = ai_jobs.job_view(job)
+    assert view["status"] == "succeeded", view["error"]
+    assert view["result"]["recommendations"] == suggestions
+    assert view["result"]["source"] == "precomputed"
+    assert isinstance(view["result"]["generated_at"], str)
+    assert events[-1][1] == "ai_job.succeeded"
+
+
+def test_gemini_sdk_is_not_imported_until_used():
+    """Importing AI services must not pull in google.generativeai."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "import app.services.ai_recommendation, app.services.ai_service\n"
+        "assert 'google.generativeai' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+    assert result.returncode == 0, result.stderr.decode()
+
+
+def test_learning_context_is_deduplicated_and_bounded():
+    """Repeated concepts collapse and large histories fit the token budget."""
+    from types import SimpleNamespace
+
+    from app.services.learning_context import (
+        compact_context,
+        estimate_tokens,
+        truncate_to_budget,
+    )
+
+    def row(roadmap, title, percent=None, completed=False):
+        return SimpleNamespace(
+            roadmap_id=roadmap,
+            roadmap_title=f"Roadmap {roadmap}",
+            title=title,
+            step_completed=False,
+            percent=percent,
+            completed=completed,
+        )
+
+    rows = [row(1, "SQL", 40), row(1, "sql", 40), row(1, "Indexes")]
+    rows += [
+        row(r, f"Concept {r}-{i}", completed=True) for r in (1, 2) for i in range(40)
+    ]
+
+    context = compact_context(rows)
+    first = context["roadmaps"][0]
+    assert first["in_progress"] == ["SQL (40%)"]
+    assert first["next"] == ["Indexes"]
+
+    bounded = truncate_to_budget(context, token_budget=60)
+    assert estimate_tokens(bounded) <= 60
+    assert bounded["omitted"] > 0
+    assert bounded["roadmaps"][0]["in_progress"] == ["SQL (40%)"]
+
+
+@pytest.mark.asyncio
+async def test_recommendation_reply_is_validated_with_confidence():
+    """Structured suggestions are cleaned, clamped and averaged."""
+    from app.services.ai_recommendation import RECOMMENDATION_SCHEMA, parse_suggestions
+
+    data = await MockAIProvider().generate_json("prompt", RECOMMENDATION_SCHEMA)
+    suggestions, confidence = parse_suggestions(data)
+    assert suggestions[0]["title"] == "Mock title."
+    assert confidence == 1.0
+
+    suggestions, confidence = parse_suggestions(
+        {
+            "suggestions": [
+                {"title": " Joins ", "reason": "next", "confidence": 3},
+                {"title": "", "reason": "dropped"},
+                {"title": "Indexes", "reason": "after joins", "confidence": "n/a"},
+            ]
+        }
+    )
+    assert [s["title"] for s in suggestions] == ["Joins", "Indexes"]
+    assert confidence == 0.75
+
+    with pytest.raises(ValueError):
+        parse_suggestions({"suggestions": []})
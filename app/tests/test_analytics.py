@@ -48,3 +48,143 @@ async def test_analytics_data_structure():
         )
         == analytics_data["total_tasks"]
     )
+
+
+def test_streak_progression():
+    """Same-day sessions keep the streak, next-day ones extend it, gaps reset it."""
+    from app.services.progress_engine import next_streak
+
+    now = datetime(2026, 3, 10, 20, 0)
+    assert next_streak(0, None, now) == 1
+    assert next_streak(3, now - timedelta(hours=2), now) == 3
+    assert next_streak(3, now - timedelta(hours=22), now) == 4
+    assert next_streak(3, now - timedelta(days=3), now) == 1
+
+
+def test_batch_fold_ignores_streak_of_late_arrivals():
+    """Replayed sessions older than the last one only add XP."""
+    from app.services.progress_engine import fold_session_stats
+
+    day = datetime(2026, 3, 10, 9, 0)
+    start = {
+        "total_xp": 100.0,
+        "current_streak": 2,
+        "longest_streak": 5,
+        "last_session_at": day,
+    }
+    sessions = [
+        {"xp": 10.0, "at": day - timedelta(days=4)},
+        {"xp": 20.0, "at": day + timedelta(days=1)},
+        {"xp": 30.0, "at": day + timedelta(days=2)},
+    ]
+
+    stats = fold_session_stats(start, sessions)
+
+    assert stats["total_xp"] == 160.0
+    assert stats["current_streak"] == 4
+    assert stats["longest_streak"] == 5
+    assert stats["last_session_at"] == day + timedelta(days=2)
+
+
+@pytest.fixture
+def study_setup(pg_session):
+    """A user, a roadmap and concepts usable for both progress and sessions."""
+    import uuid
+
+    from app.models import Concept, LearningConcept, Roadmap
+
+    user = pg_session.make_user()
+    roadmap = Roadmap(title="Databases", owner_id=user.id)
+    pg_session.add(roadmap)
+    concept_ids = []
+
+    def make_concept():
+        # Progress rows point at concepts, study sessions at learning concepts
+        concept_id = uuid.uuid4()
+        title = f"test-{concept_id.hex[:10]}"
+        pg_session.add(Concept(id=concept_id, title=title))
+        pg_session.add(LearningConcept(id=concept_id, name=title, created_by=user.id))
+        pg_session.commit()
+        concept_ids.append(concept_id)
+        return concept_id
+
+    yield pg_session, user, roadmap, make_concept
+
+    pg_session.rollback()
+    pg_session.query(Concept).filter(Concept.id.in_(concept_ids)).delete(
+        synchronize_session=False
+    )
+    pg_session.commit()
+
+
+def test_progress_update_without_a_row_records_nothing(study_setup):
+    """No progress row and no roadmap: no session, no XP, nothing committed."""
+    from app.models import StudySession, UserStats
+    from app.services.progress_engine import ProgressNotFound, update_user_progress
+
+    db, user, _, make_concept = study_setup
+    concept_id = make_concept()
+
+    with pytest.raises(ProgressNotFound):
+        update_user_progress(db, user.id, concept_id, 30, 0.5)
+
+    assert db.query(StudySession).filter_by(user_id=user.id).count() == 0
+    assert db.query(UserStats).filter_by(user_id=user.id).count() == 0
+
+
+def test_progress_upserts_under_a_roadmap_then_updates_in_place(study_setup):
+    """roadmap_id inserts then bumps one row; without it the row is updated."""
+    from app.models import StudySession, UserProgress
+    from app.services.progress_engine import update_user_progress
+
+    db, user, roadmap, make_concept = study_setup
+    concept_id = make_concept()
+
+    first = update_user_progress(db, user.id, concept_id, 30, 0.5, roadmap.id)
+    again = update_user_progress(db, user.id, concept_id, 30, 0.5, roadmap.id)
+    in_place = update_user_progress(db, user.id, concept_id, 10, 1.0)
+
+    assert [first["progress_percent"], again["progress_percent"]] == [15.0, 30.0]
+    assert in_place["progress_percent"] == 60.0
+    assert db.query(UserProgress).filter_by(user_id=user.id).count() == 1
+    assert db.query(StudySession).filter_by(user_id=user.id).count() == 3
+    assert in_place["total_xp"] == first["xp_gained"] * 2 + in_place["xp_gained"]
+    assert in_place["streak"] == 1
+
+
+def test_batch_rejects_sessions_on_untracked_concepts(study_setup):
+    """Sessions without a progress row are neither stored nor counted."""
+    from app.schemas.progress import StudySessionBatchItem
+    from app.services.progress_engine import (
+        calculate_xp,
+        ingest_study_sessions,
+        update_user_progress,
+    )
+
+    db, user, roadmap, make_concept = study_setup
+    tracked, untracked = make_concept(), make_concept()
+    update_user_progress(db, user.id, tracked, 0, 0.0, roadmap.id)
+
+    items = [
+        StudySessionBatchItem(
+            client_id="a",
+            concept_id=tracked,
+            duration_minutes=20,
+            understanding_score=1,
+        ),
+        StudySessionBatchItem(
+            client_id="b",
+            concept_id=untracked,
+            duration_minutes=20,
+            understanding_score=1,
+        ),
+    ]
+    result = ingest_study_sessions(db, user.id, items)
+
+    assert result["accepted"] == ["a"]
+    assert result["rejected"] == ["b"]
+    assert result["xp_gained"] == calculate_xp(20, 1)
+    assert [p.progress_percent for p in result["progress"]] == [30.0]
+
+    again = ingest_study_sessions(db, user.id, items[:1])
+    assert again["duplicates"] == ["a"] and again["xp_gained"] == 0
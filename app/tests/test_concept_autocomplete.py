@@ -0,0 +1,49 @@
+"""Tests for the in-memory concept/tag typeahead index."""
+
+from app.services.concept_autocomplete import AutocompleteIndex
+
+
+def labels(index, q, limit=10):
+    return [(s["type"], s["label"], s["popularity"]) for s in index.suggest(q, limit)]
+
+
+def test_prefix_matches_any_word_ranked_by_popularity():
+    index = AutocompleteIndex()
+    index.build(
+        {
+            ("concept", "1"): ("SQL Basics", ("databases", "sql")),
+            ("concept", "2"): ("Advanced SQL", ("Databases",)),
+            ("learning_concept", "3"): ("Sqlalchemy ORM", ("python", "databases")),
+        },
+        {("concept", "1"): 5, ("concept", "2"): 9, ("learning_concept", "3"): 1},
+    )
+
+    assert labels(index, "sq") == [
+        ("concept", "Advanced SQL", 9),
+        ("concept", "SQL Basics", 5),
+        ("tag", "sql", 1),  # ties break alphabetically
+        ("learning_concept", "Sqlalchemy ORM", 1),
+    ]
+    assert labels(index, "DATA") == [("tag", "databases", 3)]
+    assert labels(index, "sql b", limit=1) == [("concept", "SQL Basics", 5)]
+    assert index.keys == sorted(index.keys)
+
+
+def test_incremental_updates_keep_keys_and_tag_counts_in_sync():
+    index = AutocompleteIndex()
+    index.build({("concept", "1"): ("Docker", ("devops",))}, {("concept", "1"): 2})
+    assert labels(index, "d") == [("concept", "Docker", 2), ("tag", "devops", 1)]
+
+    index.upsert("concept", "2", "Kubernetes", "devops, containers")
+    index.upsert("concept", "1", "Docker Compose", "containers")
+    assert labels(index, "d") == [
+        ("concept", "Docker Compose", 2),
+        ("tag", "devops", 1),
+    ]
+    assert labels(index, "compose") == [("concept", "Docker Compose", 2)]
+    assert labels(index, "cont") == [("tag", "containers", 2)]
+
+    index.remove("concept", "2")
+    assert labels(index, "devops") == []
+    assert labels(index, "k") == []
+    assert labels(index, "cont") == [("tag", "containers", 1)]
@@ -0,0 +1,48 @@
+"""Tests for the in-memory prerequisite graph used by fast recommendations."""
+
+from app.services.concept_graph import ConceptGraph, ConceptNode
+
+
+def node(cid, name, prereqs=(), difficulty=1.0):
+    return ConceptNode(cid, name, "backend", difficulty, tuple(prereqs))
+
+
+def make_graph(*nodes) -> ConceptGraph:
+    graph = ConceptGraph()
+    for n in nodes:
+        graph.upsert(n)
+    return graph
+
+
+def test_only_unlocked_concepts_are_ranked():
+    """Prerequisites (by id or name) must be mastered before a concept shows up."""
+    graph = make_graph(
+        node("py", "Python"),
+        node("http", "HTTP"),
+        node("api", "FastAPI", ["py", "http"], difficulty=2),
+        node("orm", "SQLAlchemy", ["python"], difficulty=2),
+        node("async", "Async IO", ["FastAPI"], difficulty=3),
+    )
+
+    ranked = graph.rank({"py": 0.9, "http": 0.3})
+    titles = [c["title"] for c in ranked]
+
+    assert titles[0] == "HTTP"  # started, so momentum wins
+    assert set(titles) == {"HTTP", "SQLAlchemy"}
+
+    ranked = graph.rank({"py": 0.9, "http": 0.8})
+    assert "FastAPI" in [c["title"] for c in ranked]
+    assert "Async IO" not in [c["title"] for c in ranked]
+
+
+def test_incremental_updates_and_cycles():
+    """Upserts/removals rewire edges; cyclic prerequisites never block forever."""
+    graph = make_graph(node("a", "A", ["b"]), node("b", "B", ["a"]))
+    assert {c["title"] for c in graph.rank({})} == {"A", "B"}
+
+    graph.upsert(node("c", "C", ["a"]))
+    assert "C" not in [c["title"] for c in graph.rank({})]
+    assert "C" in [c["title"] for c in graph.rank({"a": 1.0})]
+
+    graph.remove("a")
+    assert "C" in [c["title"] for c in graph.rank({})]
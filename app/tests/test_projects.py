@@ -64,3 +64,79 @@ async def test_project_member_count():
     member_count = len(project_members)
     assert member_count == 5
     assert member_count > 0
+
+
+def test_tags_normalize_case_insensitively():
+    """Tags are deduplicated case-insensitively and stored comma-separated."""
+    from app.schemas.project import ProjectResponse
+    from app.services.tags import normalize_tags
+
+    assert normalize_tags("SQL, big  data,sql,") == ["sql", "big data"]
+    assert normalize_tags(["Python", " python ", "Web"]) == ["python", "web"]
+    stored = ProjectResponse._split_tags("sql,big data")
+    assert stored == ["sql", "big data"]
+
+
+def test_tag_filter_requires_every_tag(pg_session):
+    """GET /projects?tag=a&tag=b lists only projects carrying both tags."""
+    import uuid
+
+    from fastapi.testclient import TestClient
+
+    from app.core.database import get_db
+    from app.main import app
+    from app.models import Project
+    from app.services.tags import set_tags
+    from app.utils.auth import get_current_user
+
+    user = pg_session.make_user()
+    a, b = f"a-{uuid.uuid4().hex[:8]}", f"b-{uuid.uuid4().hex[:8]}"
+    for name, tags in (("Both", [a, b]), ("Only A", [a]), ("Neither", [])):
+        project = Project(name=name, owner_id=user.id)
+        pg_session.add(project)
+        set_tags(pg_session, project, tags)
+    pg_session.commit()
+
+    app.dependency_overrides[get_db] = lambda: pg_session
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        client = TestClient(app)
+        both = client.get("/projects/", params={"tag": [a, b.upper()]})
+        only_a = client.get("/projects/", params={"tag": a})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert both.status_code == 200, both.text
+    assert [p["name"] for p in both.json()] == ["Both"]
+    assert sorted(p["name"] for p in only_a.json()) == ["Both", "Only A"]
+
+
+def test_tag_rows_load_only_when_asked_for(pg_session):
+    """Plain project loads skip the tag join table; tag updates preload it."""
+    from sqlalchemy import inspect
+    from sqlalchemy.orm import selectinload
+
+    from app.models import Project
+    from app.services.tags import set_tags
+
+    user = pg_session.make_user()
+    project = Project(name="Tagged", owner_id=user.id)
+    pg_session.add(project)
+    set_tags(pg_session, project, "SQL, Web")
+    pg_session.commit()
+    project_id = project.id
+    pg_session.expunge_all()
+
+    plain = pg_session.get(Project, project_id)
+    assert "normalized_tags" in inspect(plain).unloaded
+    assert plain.tags == "sql,web"
+    pg_session.expunge_all()
+
+    for_update = (
+        pg_session.query(Project)
+        .options(selectinload(Project.normalized_tags))
+        .filter(Project.id == project_id)
+        .one()
+    )
+    assert "normalized_tags" not in inspect(for_update).unloaded
+    assert sorted(t.name for t in for_update.normalized_tags) == ["sql", "web"]
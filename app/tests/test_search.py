@@ -0,0 +1,116 @@
+"""Tests for full-text search."""
+
+import pytest
+
+
+def test_tsquery_requires_every_word_and_prefix_matches_the_last():
+    """Free text becomes a safe AND query with a prefix on the last word."""
+    from app.services.search import build_tsquery
+
+    assert build_tsquery("Deploy prod") == "deploy & prod:*"
+    # tsquery operators in user input are dropped, not interpreted
+    assert build_tsquery("a | b & !c:*") == "a & b & c:*"
+    assert build_tsquery(" !&| ") is None
+
+
+@pytest.fixture
+def searchable(pg_session):
+    """Rows sharing one unique search word, owned by two users."""
+    import uuid
+
+    from app.models import Concept, Project, ProjectMember, Roadmap, Task
+
+    db = pg_session
+    word = f"zebu{uuid.uuid4().hex[:8]}"
+    me, stranger = db.make_user(), db.make_user()
+    concept_ids = []
+
+    def project(name, owner, member_status=None):
+        row = Project(name=f"{name} {word}", owner_id=owner.id)
+        db.add(row)
+        db.flush()
+        if member_status:
+            db.add(
+                ProjectMember(project_id=row.id, user_id=me.id, status=member_status)
+            )
+        return row
+
+    def task(title, in_project, description=None):
+        row = Task(
+            project_id=in_project.id,
+            title=title,
+            description=description,
+            task_key=f"T-{uuid.uuid4().hex[:6]}",
+        )
+        db.add(row)
+        return row
+
+    mine = project("Mine", me)
+    task(f"Title {word}", mine)
+    task("Described", mine, description=f"mentions {word}")
+    task(f"Secret {word}", project("Private", stranger))
+    task(f"Shared {word}", project("Shared", stranger, "active"))
+    task(f"Pending {word}", project("Invited", stranger, "pending"))
+    db.add_all(
+        [
+            Roadmap(title=f"My plan {word}", owner_id=me.id),
+            Roadmap(title=f"Public plan {word}", owner_id=stranger.id, is_public=True),
+            Roadmap(title=f"Hidden plan {word}", owner_id=stranger.id),
+        ]
+    )
+    for title, active in ((f"Live {word}", True), (f"Retired {word}", False)):
+        concept = Concept(title=title, is_active=active)
+        db.add(concept)
+        db.flush()
+        concept_ids.append(concept.id)
+    db.commit()
+
+    yield db, me, word
+
+    db.rollback()
+    db.query(Concept).filter(Concept.id.in_(concept_ids)).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def test_search_only_returns_what_the_user_may_see(searchable):
+    """Owner, active membership, public roadmaps and active concepts only."""
+    from app.services.search import search_all
+
+    db, me, word = searchable
+
+    found = {
+        (r["type"], r["title"].replace(f" {word}", ""))
+        for r in search_all(db, me.id, word, limit=50)
+    }
+
+    assert found == {
+        ("project", "Mine"),
+        ("project", "Shared"),
+        ("task", "Title"),
+        ("task", "Described"),
+        ("task", "Shared"),
+        ("roadmap", "My plan"),
+        ("roadmap", "Public plan"),
+        ("concept", "Live"),
+    }
+
+
+def test_search_ranks_titles_first_and_follows_edits(searchable):
+    """Title hits outrank description hits; triggers reindex renamed rows."""
+    from app.models import Task
+    from app.services.search import search_all
+
+    db, me, word = searchable
+
+    tasks = search_all(db, me.id, word, types=["task"], limit=50)
+    assert tasks[-1]["title"] == "Described"
+
+    renamed = db.query(Task).filter(Task.title == "Described").one()
+    renamed.title = f"Renamed {word}"
+    renamed.description = None
+    db.commit()
+
+    titles = [r["title"] for r in search_all(db, me.id, word, types=["task"])]
+    assert "Described" not in titles and f"Renamed {word}" in titles
@@ -0,0 +1,71 @@
+"""Concurrency stress test for per-project task key allocation (needs Postgres)."""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import SessionLocal, engine
+from app.models import Project, User
+from app.utils.crud_helpers import allocate_task_keys, generate_task_key
+
+WORKERS = 16
+CREATES_PER_WORKER = 25
+
+
+@pytest.fixture
+def project():
+    try:
+        with engine.connect() as conn:
+            columns = {c["name"] for c in inspect(conn).get_columns("projects")}
+    except OperationalError:
+        pytest.skip("PostgreSQL is not reachable")
+    if "task_seq" not in columns:
+        pytest.skip("Database is not migrated to the task_seq revision")
+
+    with SessionLocal() as db:
+        user = User(
+            username=f"keys-{uuid.uuid4().hex[:8]}",
+            email=f"keys-{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password="x",
+        )
+        db.add(user)
+        db.flush()
+        proj = Project(name="Keys stress", owner_id=user.id)
+        db.add(proj)
+        db.commit()
+        project_id, user_id = proj.id, user.id
+
+    yield project_id
+
+    with SessionLocal() as db:
+        db.query(User).filter(User.id == user_id).delete()
+        db.commit()
+
+
+def test_parallel_creates_never_share_a_key(project):
+    """Keys from concurrent transactions are unique and gap-free."""
+
+    def worker(_):
+        keys = []
+        for _ in range(CREATES_PER_WORKER):
+            with SessionLocal() as db:
+                proj = db.get(Project, project)
+                keys.append(generate_task_key(db, proj))
+                db.commit()
+        return keys
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        keys = [k for batch in pool.map(worker, range(WORKERS)) for k in batch]
+
+    with SessionLocal() as db:
+        proj = db.get(Project, project)
+        bulk = allocate_task_keys(db, proj, 10)
+        db.commit()
+
+    total = WORKERS * CREATES_PER_WORKER
+    assert len(set(keys)) == total
+    assert sorted(int(k.rsplit("-", 1)[1]) for k in keys) == list(range(1, total + 1))
+    assert bulk == [f"KEYS-{n:03d}" for n in range(total + 1, total + 11)]
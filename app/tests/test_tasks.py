@@ -88,3 +88,319 @@ async def test_task_dependency():
     assert "depends_on" in task_with_dependency
     assert isinstance(task_with_dependency["depends_on"], list)
     assert len(task_with_dependency["depends_on"]) > 0
+
+
+def test_title_index_matches_token_sort_ratio_and_updates_incrementally():
+    """The in-memory index scores like token_sort_ratio and tracks edits."""
+    from app.services.task_title_index import ProjectTitleIndex, normalize_title
+
+    index = ProjectTitleIndex(
+        [
+            ("1", "PROJ-001", normalize_title("Fix login bug"), "Fix login bug"),
+            ("2", "PROJ-002", normalize_title("Write docs"), "Write docs"),
+        ]
+    )
+
+    matches = index.search("login bug: fix", threshold=80)
+    assert [(row[1], score) for row, score in matches] == [("PROJ-001", 100.0)]
+
+    index.upsert("2", "PROJ-002", "Fix the login bug")
+    index.remove("1")
+    assert [row[1] for row, _ in index.search("fix login bug")] == ["PROJ-002"]
+    assert index.titles == sorted(index.titles) and len(index) == 1
+
+
+def test_keyset_cursor_round_trip():
+    """Cursors are opaque, URL-safe and decode back to (created_at, id)."""
+    import uuid
+
+    from fastapi import HTTPException
+
+    from app.utils.pagination import decode_cursor, encode_cursor
+
+    created_at, row_id = datetime(2026, 5, 1, 12, 30), uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+
+    assert "=" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor")
+
+
+def test_import_rows_parse_incrementally_and_report_per_line_errors():
+    """CSV and NDJSON imports validate row by row, keeping line numbers."""
+    import io
+
+    from app.services.task_import import iter_import_rows, validate_chunk
+
+    csv_body = io.StringIO(
+        "Title,Status,Priority\nWrite docs,,2\n,pending,1\nShip it,bogus,1\n"
+    )
+    valid, errors = validate_chunk(iter_import_rows(csv_body, "csv"))
+    assert [(r.title, r.status, r.priority) for r in valid] == [
+        ("Write docs", "pending", 2)
+    ]
+    assert [line for line, _ in errors] == [3, 4]
+
+    ndjson_body = io.StringIO('{"title": "A"}\n\nnot json\n[1]\n')
+    valid, errors = validate_chunk(iter_import_rows(ndjson_body, "ndjson"))
+    assert [r.title for r in valid] == ["A"]
+    assert [line for line, _ in errors] == [3, 4]
+
+
+@pytest.fixture
+def owned_project(pg_session):
+    """A user and a project they own, on the test Postgres database."""
+    from app.models import Project, Task
+    from app.utils.crud_helpers import generate_task_key
+
+    user = pg_session.make_user()
+    project = Project(name="Board", owner_id=user.id)
+    pg_session.add(project)
+    pg_session.commit()
+
+    def make_task(title):
+        task = Task(
+            project_id=project.id,
+            title=title,
+            task_key=generate_task_key(pg_session, project),
+        )
+        pg_session.add(task)
+        pg_session.commit()
+        return task
+
+    pg_session.make_task = make_task
+    return pg_session, user, project
+
+
+def test_duplicate_scan_stores_suggestions_once_and_pushes_them(
+    owned_project, monkeypatch
+):
+    """Background scans record suggested links idempotently and notify."""
+    from app.core.events import project_topic
+    from app.services import task_duplicates
+
+    db, _, project = owned_project
+    original = db.make_task("Fix login bug")
+    new = db.make_task("Fix the login bug")
+    match = {
+        "id": str(original.id),
+        "task_key": original.task_key,
+        "title": original.title,
+        "similarity": 92.0,
+    }
+    monkeypatch.setattr(
+        task_duplicates, "detect_possible_duplicates", lambda *a, **kw: [match]
+    )
+    events = []
+    monkeypatch.setattr(
+        task_duplicates, "publish_event", lambda *args: events.append(args)
+    )
+
+    task_duplicates.scan_task_duplicates(str(new.id))
+    task_duplicates.scan_task_duplicates(str(new.id))
+
+    stored = task_duplicates.list_possible_duplicates(db, new.id)
+    assert [(d["task_id"], d["status"], d["similarity"]) for d in stored] == [
+        (original.id, "suggested", 92.0)
+    ]
+    assert events[0] == (
+        project_topic(project.id),
+        "task.duplicates_suggested",
+        {"id": str(new.id), "task_key": new.task_key, "possible_duplicates": [match]},
+    )
+    assert task_duplicates.store_duplicate_suggestions(db, new.id, [match]) == 0
+
+
+def test_create_task_can_defer_the_duplicate_scan(owned_project, monkeypatch):
+    """With async_duplicates the scan is queued instead of run inline."""
+    from fastapi import BackgroundTasks
+
+    from app.routers import tasks as tasks_router
+    from app.schemas import TaskCreate
+    from app.services.task_duplicates import scan_task_duplicates
+
+    db, user, project = owned_project
+
+    def inline_scan(*args, **kwargs):
+        raise AssertionError("duplicates scored on the request path")
+
+    queued = []
+    monkeypatch.setattr(tasks_router, "detect_possible_duplicates", inline_scan)
+    monkeypatch.setattr(
+        tasks_router, "enqueue", lambda fn, *args, bg=None: queued.append((fn, args))
+    )
+    monkeypatch.setattr(tasks_router, "publish_event", lambda *args: None)
+
+    response = tasks_router.create_task(
+        TaskCreate(project_id=project.id, title="Write docs"),
+        BackgroundTasks(),
+        async_duplicates=True,
+        db=db,
+        current_user=user,
+    )
+
+    assert response["possible_duplicates"] is None
+    assert queued == [(scan_task_duplicates, (str(response["id"]),))]
+
+
+def test_bulk_applies_a_mixed_batch_and_refreshes_the_title_index(
+    owned_project, monkeypatch
+):
+    """Creates, grouped updates and deletes land in one call, item by item."""
+    import uuid
+
+    from app.models import Task
+    from app.schemas import TaskBulkRequest
+    from app.services import task_bulk
+    from app.services.task_title_index import get_title_index
+
+    db, user, project = owned_project
+    a, b, c = (db.make_task(t) for t in ("Write docs", "Fix login", "Old chore"))
+    get_title_index(db, project.id)  # cached before the Core-level writes
+    events = []
+    monkeypatch.setattr(task_bulk, "publish_event", lambda *args: events.append(args))
+
+    payload = TaskBulkRequest.model_validate(
+        {
+            "create": [
+                {"project_id": str(project.id), "title": "Ship release"},
+                {"project_id": str(project.id), "title": "Tag release"},
+            ],
+            "update": [
+                {"id": str(a.id), "status": "completed"},
+                {"id": str(b.id), "title": "Fix signup", "priority": 3},
+                {"id": str(c.id), "status": "bogus"},
+            ],
+            "delete": [str(c.id), str(uuid.uuid4())],
+        }
+    )
+    result = task_bulk.apply_bulk_tasks(db, user.id, payload)
+
+    assert [(r["op"], r["index"], r["status"]) for r in result["results"]] == [
+        ("create", 0, "ok"),
+        ("create", 1, "ok"),
+        ("update", 0, "ok"),
+        ("update", 1, "ok"),
+        ("update", 2, "invalid"),
+        ("delete", 0, "ok"),
+        ("delete", 1, "not_found"),
+    ]
+    assert (result["created"], result["updated"], result["deleted"]) == (2, 2, 1)
+    prefix = a.task_key.rsplit("-", 1)[0]
+    assert [r["task_key"] for r in result["results"][:2]] == [
+        f"{prefix}-004",
+        f"{prefix}-005",
+    ]
+
+    db.expire_all()
+    assert (a.status, a.title) == ("completed", "Write docs")
+    assert (b.status, b.title, b.priority) == ("pending", "Fix signup", 3)
+    assert db.query(Task).filter(Task.id == c.id).count() == 0
+
+    titles = [row[3] for row in get_title_index(db, project.id).rows]
+    assert sorted(titles) == ["Fix signup", "Ship release", "Tag release", "Write docs"]
+    assert [e[1] for e in events] == ["tasks.bulk"]
+
+
+def test_bulk_reports_other_users_projects_and_tasks_as_not_found(owned_project):
+    """Nothing outside the caller's own projects is created, changed or deleted."""
+    from app.models import Project, Task
+    from app.schemas import TaskBulkRequest
+    from app.services.task_bulk import apply_bulk_tasks
+
+    db, user, project = owned_project
+    stranger = db.make_user()
+    theirs = Project(name="Theirs", owner_id=stranger.id)
+    db.add(theirs)
+    db.flush()
+    their_task = Task(project_id=theirs.id, title="Private", task_key="THEIRS-001")
+    db.add(their_task)
+    db.commit()
+
+    payload = TaskBulkRequest.model_validate(
+        {
+            "create": [
+                {"project_id": str(theirs.id), "title": "Sneaky"},
+                {"project_id": str(project.id), "title": "Mine"},
+            ],
+            "update": [{"id": str(their_task.id), "title": "Hijacked"}],
+            "delete": [str(their_task.id)],
+        }
+    )
+    result = apply_bulk_tasks(db, user.id, payload)
+
+    assert [(r["op"], r["status"]) for r in result["results"]] == [
+        ("create", "not_found"),
+        ("create", "ok"),
+        ("update", "not_found"),
+        ("delete", "not_found"),
+    ]
+    assert (result["created"], result["updated"], result["deleted"]) == (1, 0, 0)
+
+    db.expire_all()
+    assert their_task.title == "Private"
+    assert db.query(Task).filter(Task.project_id == theirs.id).count() == 1
+
+
+def test_a_failed_trigram_query_falls_back_only_for_that_call(
+    owned_project, monkeypatch
+):
+    """Transient errors use the in-memory index without disabling pg_trgm."""
+    from sqlalchemy.exc import DBAPIError
+
+    from app.utils import crud_helpers
+
+    db, _, project = owned_project
+    attempts = []
+
+    def trigram_candidates(*args):
+        attempts.append(args)
+        if len(attempts) == 1:
+            raise DBAPIError("SELECT", {}, Exception("connection reset"))
+        return []
+
+    monkeypatch.setattr(crud_helpers, "_trgm_available", True)
+    monkeypatch.setattr(crud_helpers, "_trigram_candidates", trigram_candidates)
+    monkeypatch.setattr(
+        crud_helpers, "find_similar_titles", lambda *args: [{"id": "fallback"}]
+    )
+
+    first = crud_helpers.detect_possible_duplicates(db, project.id, "Write docs")
+    second = crud_helpers.detect_possible_duplicates(db, project.id, "Write docs")
+
+    assert first == [{"id": "fallback"}] and second == []
+    assert len(attempts) == 2 and crud_helpers._trgm_available is True
+
+
+def test_import_reports_unknown_assignees_per_row(owned_project, tmp_path, monkeypatch):
+    """A bad assignee id fails its own row, not the whole chunk."""
+    import json
+    import uuid
+
+    from app.models import Task
+    from app.services import task_import
+
+    db, user, project = owned_project
+    monkeypatch.setattr(task_import, "publish_event", lambda *args: None)
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        "\n".join(
+            json.dumps(row)
+            for row in (
+                {"title": "Mine", "assignee_id": str(user.id)},
+                {"title": "Ghost", "assignee_id": str(uuid.uuid4())},
+                {"title": "Nobody's"},
+            )
+        )
+    )
+
+    job_id = task_import.create_import_job(project.id, user.id, str(path), "ndjson")
+    task_import.run_task_import(job_id)
+    job = task_import.get_import_job(job_id, project.id)
+
+    assert job["status"] == "succeeded", job["error"]
+    assert (job["created"], job["invalid"]) == (2, 1)
+    assert job["errors"] == [{"line": 2, "error": "assignee_id: no such user"}]
+    titles = {t.title for t in db.query(Task).filter(Task.project_id == project.id)}
+    assert titles == {"Mine", "Nobody's"}
@@ -0,0 +1,117 @@
+"""Tests for realtime WebSocket subscriptions."""
+
+import json
+
+import pytest
+
+from app.utils.websocket_manager import WebSocketManager
+
+
+class FakeSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.fail = fail
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(json.loads(data))
+
+
+@pytest.mark.asyncio
+async def test_send_to_topic_only_reaches_subscribers():
+    """Events are delivered to subscribers of the topic and nobody else."""
+    manager = WebSocketManager()
+    watcher, other = FakeSocket(), FakeSocket()
+    await manager.connect(watcher)
+    await manager.connect(other)
+    manager.subscribe(watcher, "project:1")
+
+    await manager.send_to_topic("project:1", {"type": "task.created"})
+
+    assert watcher.sent == [{"type": "task.created"}]
+    assert other.sent == []
+
+
+@pytest.mark.asyncio
+async def test_disconnect_clears_subscriptions():
+    """Dropping a socket removes it from every topic."""
+    manager = WebSocketManager()
+    socket = FakeSocket()
+    await manager.connect(socket)
+    manager.subscribe(socket, "project:1")
+    manager.subscribe(socket, "user:1")
+
+    manager.disconnect(socket)
+
+    assert manager.subscriptions == {}
+    assert manager.active_connections == []
+
+
+@pytest.mark.asyncio
+async def test_failed_send_disconnects_socket():
+    """A socket that errors on send is pruned from the topic."""
+    manager = WebSocketManager()
+    broken = FakeSocket(fail=True)
+    await manager.connect(broken)
+    manager.subscribe(broken, "roadmap:1")
+
+    await manager.send_to_topic("roadmap:1", {"type": "roadmap_step.updated"})
+
+    assert manager.topics_for(broken) == []
+
+
+def test_only_active_members_may_watch_a_project(pg_session):
+    """Pending or removed memberships don't grant project events."""
+    from app.models import Project, ProjectMember
+    from app.routers.websocket import _allowed_topics
+
+    owner, member = pg_session.make_user(), pg_session.make_user()
+    project = Project(name="Realtime", owner_id=owner.id)
+    pg_session.add(project)
+    pg_session.flush()
+    membership = ProjectMember(
+        project_id=project.id, user_id=member.id, status="pending"
+    )
+    pg_session.add(membership)
+    pg_session.commit()
+    topic = f"project:{project.id}"
+
+    assert _allowed_topics(owner.id, [topic]) == {topic: topic}
+    assert _allowed_topics(member.id, [topic]) == {}
+
+    membership.status = "removed"
+    pg_session.commit()
+    assert _allowed_topics(member.id, [topic]) == {}
+
+    membership.status = "active"
+    pg_session.commit()
+    assert _allowed_topics(member.id, [topic]) == {topic: topic}
+
+
+@pytest.mark.asyncio
+async def test_async_publish_reaches_the_events_channel(live_redis):
+    """Async code publishes through the asyncio client, same message shape."""
+    from app.core.events import EVENTS_CHANNEL, publish_event_async
+    from app.core.redis_async import close_async_redis
+
+    pubsub = live_redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(EVENTS_CHANNEL)
+    pubsub.get_message(timeout=1)  # subscription confirmation
+    try:
+        await publish_event_async(
+            "user:u1", "learning.insights", {"ai_status": "ready"}
+        )
+        raw = pubsub.get_message(timeout=2)
+    finally:
+        pubsub.close()
+        await close_async_redis()
+
+    message = json.loads(raw["data"])
+    assert (message["topic"], message["type"]) == ("user:u1", "learning.insights")
+    assert message["payload"] == {"ai_status": "ready"}
@@ -0,0 +1,130 @@
+"""
+Benchmark Task Duplicate Detection
+----------------------------------
+Seeds throwaway projects with N tasks each and times
+`detect_possible_duplicates` with the pg_trgm candidate query against
+the full-scan fallback. Everything it creates is deleted afterwards.
+
+Usage:
+    $ python -m app.utils.bench_duplicates
+    $ python -m app.utils.bench_duplicates --sizes 1000 100000 --runs 20
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert, text
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app import models  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.utils import crud_helpers  # noqa: E402
+
+VERBS = ["Fix", "Add", "Refactor", "Remove", "Document", "Test", "Migrate", "Review"]
+NOUNS = [
+    "login flow",
+    "task board",
+    "roadmap export",
+    "notification email",
+    "search index",
+    "user profile",
+    "billing page",
+    "websocket events",
+    "study session sync",
+    "project settings",
+]
+QUALIFIERS = ["on mobile", "for admins", "in dark mode", "after signup", "v2", ""]
+
+
+def random_title(rng: random.Random) -> str:
+    words = [rng.choice(VERBS), rng.choice(NOUNS), rng.choice(QUALIFIERS)]
+    return " ".join(w for w in words if w) + f" #{rng.randint(1, 10**6)}"
+
+
+def seed_project(db, owner_id, size: int, rng: random.Random) -> uuid.UUID:
+    project = models.Project(name=f"bench-{size}", owner_id=owner_id)
+    db.add(project)
+    db.flush()
+    batch = 5000
+    for start in range(0, size, batch):
+        db.execute(
+            insert(models.Task),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "title": random_title(rng),
+                    "project_id": project.id,
+                    "task_key": f"BENCH-{project.id.hex[:8]}-{i}",
+                }
+                for i in range(start, min(start + batch, size))
+            ],
+        )
+    db.commit()
+    return project.id
+
+
+def time_detection(db, project_id, titles, trigram: bool) -> list:
+    crud_helpers._trgm_available = None if trigram else False
+    timings = []
+    for title in titles:
+        started = time.perf_counter()
+        crud_helpers.detect_possible_duplicates(db, project_id, title)
+        timings.append((time.perf_counter() - started) * 1000)
+        db.rollback()
+    return timings
+
+
+def report(label: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(
+        f"   {label:<10} median {statistics.median(timings):8.1f} ms"
+        f"   p95 {p95:8.1f} ms"
+    )
+
+
+def run(sizes, runs: int, seed: int):
+    rng = random.Random(seed)
+    db = SessionLocal()
+    owner = db.query(models.User).first()
+    if owner is None:
+        print("❌ Need at least one user in the database to own the bench projects.")
+        return
+
+    created = []
+    try:
+        for size in sizes:
+            print(f"\n📦 {size:,} tasks per project")
+            project_id = seed_project(db, owner.id, size, rng)
+            created.append(project_id)
+            db.execute(
+                text("ANALYZE tasks")
+            )  # fresh stats so the planner uses the index
+            db.commit()
+            titles = [random_title(rng) for _ in range(runs)]
+            report("pg_trgm", time_detection(db, project_id, titles, trigram=True))
+            report("full scan", time_detection(db, project_id, titles, trigram=False))
+    finally:
+        crud_helpers._trgm_available = None
+        for project_id in created:
+            db.query(models.Project).filter(models.Project.id == project_id).delete()
+        db.commit()
+        db.close()
+        print("\n🧹 Bench projects removed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.sizes, args.runs, args.seed)
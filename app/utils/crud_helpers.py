@@ -3,9 +3,12 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import func, select, text, update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
 from app import models
+from app.services.task_title_index import find_similar_titles
 from app.utils.cache import cache_set
 
 
@@ -33,11 +36,17 @@ def mark_duplicate(db: Session, original_id: UUID, duplicate_id: UUID):
         .filter_by(original_id=original_id, duplicate_id=duplicate_id)
         .first()
     )
-    if existing:
+    if existing and existing.status == "confirmed":
         raise HTTPException(status_code=400, detail="Already marked duplicate.")
 
-    link = models.TaskDuplicate(original_id=original_id, duplicate_id=duplicate_id)
-    db.add(link)
+    if existing:
+        existing.status = "confirmed"  # accept a background suggestion
+    else:
+        db.add(
+            models.TaskDuplicate(
+                original_id=original_id, duplicate_id=duplicate_id, status="confirmed"
+            )
+        )
     db.commit()
 
     log_activity(
@@ -70,13 +79,13 @@ def log_activity(db: Session, user_id: UUID, task_id: UUID, action: str):
 # ==============================================================
 
 
-def detect_possible_duplicates(
-    db: Session, project_id: UUID, new_title: str, threshold: int = 80
-):
-    """
-    Uses fuzzy string matching to find similar tasks within the same project.
-    Requires: pip install rapidfuzz
-    """
+TRGM_CANDIDATE_THRESHOLD = 0.3  # pg_trgm similarity needed to be a candidate
+TRGM_TOP_K = 50  # candidates rescored with rapidfuzz
+
+_trgm_available = None  # whether pg_trgm is installed; probed once per process
+
+
+def _load_fuzz():
     try:
         from rapidfuzz import fuzz
     except ImportError:
@@ -84,29 +93,121 @@ def detect_possible_duplicates(
             status_code=500,
             detail="RapidFuzz not installed. Run: pip install rapidfuzz",
         )
+    return fuzz
 
-    existing_tasks = (
-        db.query(models.Task).filter(models.Task.project_id == project_id).all()
+
+def _trigram_candidates(
+    db: Session, project_id: UUID, title: str, limit: int, exclude_id=None
+):
+    """Top-`limit` titles by trigram similarity, served by the GIN index."""
+    Task = models.Task
+    # `%` (not similarity() > x) is what the index can answer; its cutoff is
+    # this setting, scoped to the current transaction
+    db.execute(
+        select(
+            func.set_config(
+                "pg_trgm.similarity_threshold", str(TRGM_CANDIDATE_THRESHOLD), True
+            )
+        )
     )
-    if not existing_tasks:
-        return []
+    query = select(Task.id, Task.task_key, Task.title).where(
+        Task.project_id == project_id, Task.title.op("%")(title)
+    )
+    if exclude_id is not None:
+        query = query.where(Task.id != exclude_id)
+    return db.execute(
+        query.order_by(func.similarity(Task.title, title).desc()).limit(limit)
+    ).all()
+
+
+def _trgm_installed(db: Session) -> bool:
+    """Look pg_trgm up in the catalog once; a failed lookup is retried later."""
+    global _trgm_available
+    if _trgm_available is None:
+        try:
+            with db.begin_nested():
+                _trgm_available = bool(
+                    db.scalar(
+                        text(
+                            "SELECT EXISTS (SELECT 1 FROM pg_extension "
+                            "WHERE extname = 'pg_trgm')"
+                        )
+                    )
+                )
+        except DBAPIError as e:
+            print(f"[Duplicates] pg_trgm probe failed, using in-memory index: {e}")
+            return False
+    return _trgm_available
+
+
+def detect_possible_duplicates(
+    db: Session, project_id: UUID, new_title: str, threshold: int = 80, exclude_id=None
+):
+    """
+    Find similar tasks within the same project. Postgres (pg_trgm) picks the
+    closest candidates and RapidFuzz rescores only those; without pg_trgm a
+    cached in-memory title index is searched instead.
+    Requires: pip install rapidfuzz
+    """
+    fuzz = _load_fuzz()
+
+    candidates = None
+    if _trgm_installed(db):
+        try:
+            with db.begin_nested():
+                candidates = _trigram_candidates(
+                    db, project_id, new_title, TRGM_TOP_K, exclude_id
+                )
+        except DBAPIError as e:
+            # Only this call falls back; the next one tries Postgres again
+            print(f"[Duplicates] Trigram query failed, using in-memory index: {e}")
+
+    if candidates is None:
+        return [
+            match
+            for match in find_similar_titles(db, project_id, new_title, threshold)
+            if exclude_id is None or match["id"] != str(exclude_id)
+        ]
 
     results = []
-    for t in existing_tasks:
+    for t in candidates:
         similarity = fuzz.token_sort_ratio(t.title, new_title)
         if similarity >= threshold:
             results.append(
                 {
+                    "id": str(t.id),
                     "task_key": t.task_key,
                     "title": t.title,
                     "similarity": similarity,
                 }
             )
+    results.sort(key=lambda r: -r["similarity"])
     return results
 
 
+def task_key_prefix(project: models.Project) -> str:
+    return project.name[:4].upper()
+
+
+def allocate_task_keys(db: Session, project: models.Project, count: int = 1) -> list:
+    """
+    Reserve `count` consecutive task keys for a project (e.g. PROJ-042..PROJ-050)
+    with one UPDATE ... RETURNING. The row lock it takes serializes concurrent
+    creators in the same project until their transaction ends.
+    """
+    if count < 1:
+        return []
+    end = db.execute(
+        update(models.Project)
+        .where(models.Project.id == project.id)
+        .values(task_seq=models.Project.task_seq + count)
+        .returning(models.Project.task_seq)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    prefix = task_key_prefix(project)
+    return [f"{prefix}-{n:03d}" for n in range(end - count + 1, end + 1)]
+
+
 def generate_task_key(db: Session, project: models.Project) -> str:
     """Generate sequential task key for a project (e.g. PROJ-001)."""
-    prefix = project.name[:4].upper()
-    count = db.query(models.Task).filter(models.Task.project_id == project.id).count()
-    return f"{prefix}-{count + 1:03d}"
+    return allocate_task_keys(db, project)[0]
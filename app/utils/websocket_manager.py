@@ -1,7 +1,7 @@
 # app/utils/websocket_manager.py
 import json
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 
 from fastapi import WebSocket
 
@@ -9,11 +9,13 @@ from fastapi import WebSocket
 class WebSocketManager:
     """
     Centralized WebSocket connection manager.
-    Handles connect, disconnect, and event broadcasts for the entire app.
+    Handles connect, disconnect, topic subscriptions and event broadcasts.
     """
 
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        # topic → sockets subscribed to it (e.g. "project:<id>", "user:<id>")
+        self.subscriptions: Dict[str, Set[WebSocket]] = {}
 
     async def connect(self, websocket: WebSocket):
         """Accept a new client WebSocket connection."""
@@ -22,11 +24,53 @@ class WebSocketManager:
         print(f"[WS CONNECTED] {len(self.active_connections)} active")
 
     def disconnect(self, websocket: WebSocket):
-        """Remove a client WebSocket connection."""
+        """Remove a client WebSocket connection and all of its subscriptions."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
             print(f"[WS DISCONNECTED] {len(self.active_connections)} remaining")
+        for topic in list(self.subscriptions):
+            self.unsubscribe(websocket, topic)
 
+    # -----------------------------------------------------------
+    # 📡 Topic Subscriptions
+    # -----------------------------------------------------------
+    def subscribe(self, websocket: WebSocket, topic: str):
+        """Register a socket for events published on the given topic."""
+        self.subscriptions.setdefault(topic, set()).add(websocket)
+
+    def unsubscribe(self, websocket: WebSocket, topic: str):
+        """Stop delivering events for a topic to the given socket."""
+        subscribers = self.subscriptions.get(topic)
+        if not subscribers:
+            return
+        subscribers.discard(websocket)
+        if not subscribers:
+            del self.subscriptions[topic]
+
+    def topics_for(self, websocket: WebSocket) -> List[str]:
+        """Return the topics a socket is currently subscribed to."""
+        return sorted(t for t, subs in self.subscriptions.items() if websocket in subs)
+
+    async def send_to_topic(self, topic: str, message: Dict[str, Any]):
+        """Deliver a pre-built event message to every subscriber of a topic."""
+        subscribers = list(self.subscriptions.get(topic, ()))
+        if not subscribers:
+            return
+
+        data = json.dumps(message)
+        disconnected = []
+        for connection in subscribers:
+            try:
+                await connection.send_text(data)
+            except Exception:
+                disconnected.append(connection)
+
+        for conn in disconnected:
+            self.disconnect(conn)
+
+    # -----------------------------------------------------------
+    # 📢 Global Broadcasts
+    # -----------------------------------------------------------
     async def broadcast(self, message: str):
         """Broadcast a plain string message to all connected clients."""
         disconnected = []
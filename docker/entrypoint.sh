@@ -44,7 +44,15 @@ elif [ "$CMD" = "web" ]; then
 
 elif [ "$CMD" = "worker" ]; then
   echo "🔧 Starting Celery worker..."
-  exec celery -A app.core.celery_app.celery_app worker --loglevel=info -n skillstack_worker@%h
+  exec celery -A app.core.celery_app.celery_app worker -Q celery,ai --loglevel=info -n skillstack_worker@%h
+
+elif [ "$CMD" = "ai-worker" ]; then
+  echo "🤖 Starting Celery AI worker..."
+  exec celery -A app.core.celery_app.celery_app worker -Q ai --loglevel=info -n skillstack_ai@%h
+
+elif [ "$CMD" = "beat" ]; then
+  echo "⏰ Starting Celery beat scheduler..."
+  exec celery -A app.core.celery_app.celery_app beat --loglevel=info
 
 elif [ "$CMD" = "flower" ]; then
   echo "🌸 Starting Flower monitoring dashboard..."
@@ -52,6 +60,6 @@ elif [ "$CMD" = "flower" ]; then
 
 else
   echo "❌ Unknown command: $CMD"
-  echo "Available commands: migrate, web, worker, flower"
+  echo "Available commands: migrate, web, worker, ai-worker, beat, flower"
   exit 1
 fi
\ No newline at end of file